@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+PDF Signature Benchmark
+
+Times the PyMuPDF and pypdf signing engines across document sizes, page
+selection densities and save modes.
+
+Usage:
+    python benchmark_signature.py
+    python benchmark_signature.py --pages 100 1000 5000 --repeat 3
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from PIL import Image
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+import pdf_signature
+from pdf_signature import PDFSignature
+
+
+def selections(page_count):
+    """Page selections from a single page up to every page."""
+    return [
+        ('first', 'first'),
+        ('last', 'last'),
+        ('10%', f"1-{max(1, page_count // 10)}"),
+        ('50%', 'odd'),
+        ('all', 'all'),
+    ]
+
+
+def create_signature(path):
+    image = Image.new('RGBA', (400, 150), (255, 255, 255, 0))
+    for x in range(40, 360):
+        for y in range(60, 90):
+            image.putpixel((x, y), (0, 0, 160, 220))
+    image.save(path, 'PNG')
+
+
+def create_document(path, page_count):
+    c = canvas.Canvas(path, pagesize=letter)
+    for page in range(page_count):
+        for line in range(40):
+            c.drawString(72, 740 - line * 16, f"Page {page + 1} line {line + 1}: quarterly invoice detail")
+        c.showPage()
+    c.save()
+
+
+def run_case(signature_path, source_path, output_path, pages, save_mode, repeat):
+    best = None
+    for _ in range(repeat):
+        signer = PDFSignature(signature_path, pages=pages, save_mode=save_mode)
+        started = time.perf_counter()
+        result = signer.add_signature_to_pdf(source_path, output_path)
+        elapsed = time.perf_counter() - started
+        if not result['success']:
+            raise RuntimeError(result['error'])
+        best = elapsed if best is None else min(best, elapsed)
+    return best, os.path.getsize(output_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PDF signing engines.")
+    parser.add_argument('--pages', type=int, nargs='+', default=[50, 500, 2000],
+                        help="Document sizes to test (default: 50 500 2000)")
+    parser.add_argument('--modes', nargs='+', default=PDFSignature.VALID_SAVE_MODES,
+                        choices=PDFSignature.VALID_SAVE_MODES, help="Save modes to test")
+    parser.add_argument('--repeat', type=int, default=1, help="Runs per case; the fastest is reported")
+    args = parser.parse_args(argv)
+
+    engines = [('pypdf', None)]
+    if pdf_signature.fitz is not None:
+        engines.insert(0, ('pymupdf', pdf_signature.fitz))
+    else:
+        print("PyMuPDF not installed - benchmarking pypdf only")
+
+    work_dir = tempfile.mkdtemp(prefix='signature_benchmark_')
+    original_fitz = pdf_signature.fitz
+    try:
+        signature_path = os.path.join(work_dir, 'signature.png')
+        create_signature(signature_path)
+
+        print(f"{'engine':<8} {'pages':>6} {'selection':>9} {'mode':<11} {'seconds':>8} {'size KB':>9}")
+        print("-" * 56)
+        for page_count in args.pages:
+            source_path = os.path.join(work_dir, f'doc_{page_count}.pdf')
+            create_document(source_path, page_count)
+            output_path = os.path.join(work_dir, 'signed.pdf')
+
+            for engine, module in engines:
+                pdf_signature.fitz = module
+                for label, pages in selections(page_count):
+                    for save_mode in args.modes:
+                        seconds, size = run_case(signature_path, source_path, output_path,
+                                                 pages, save_mode, args.repeat)
+                        print(f"{engine:<8} {page_count:>6} {label:>9} {save_mode:<11} "
+                              f"{seconds:>8.3f} {size / 1024:>9.0f}")
+            print()
+    finally:
+        pdf_signature.fitz = original_fitz
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+"""
+Shared conversion framework for the Markdown converters.
+
+`pdf_to_epub.py` and `pptx_to_epub.py` each provide a format handler: a
+converter object with `suffixes`, `label`, `output_suffix`, `settings`,
+`build_outputs()`, `report()`, `stats()` and `merge_stats()`. Worker
+processes return `stats()` for each file so the parent handler can fold
+them in with `merge_stats()`. `ConversionScheduler` walks the input
+once, dispatches every file to the handler for its suffix, and runs them
+serially or in a process pool with a manifest for incremental runs,
+per-file retries and failure isolation. The same Tk GUI serves every
+handler combination.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from queue import Empty, Queue
+
+from rag_chunks import DEFAULT_CHUNK_OVERLAP, DEFAULT_CHUNK_TOKENS
+
+
+OUTPUT_FORMATS = ("markdown", "jsonl", "both")
+MANIFEST_NAME = ".markdown_conversion_manifest.json"
+
+
+@dataclass
+class ConversionIssue:
+    source: Path
+    error: str
+
+
+def clean_text(value: str) -> str:
+    return " ".join((value or "").replace("\u00a0", " ").split())
+
+
+def escape_cell(value) -> str:
+    return clean_text(str(value or "")).replace("|", "\\|")
+
+
+def render_table(rows: list[list[str]]) -> list[str]:
+    width = max(len(row) for row in rows)
+    padded_rows = [row + [""] * (width - len(row)) for row in rows]
+    lines = [
+        "| " + " | ".join(padded_rows[0]) + " |",
+        "| " + " | ".join(["---"] * width) + " |",
+    ]
+    for row in padded_rows[1:]:
+        lines.append("| " + " | ".join(row) + " |")
+    return lines
+
+
+def source_signature(path: Path) -> dict:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def load_manifest(output_dir: Path) -> dict:
+    try:
+        with open(output_dir / MANIFEST_NAME, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir: Path, manifest: dict) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / MANIFEST_NAME
+    temp_path = path.with_suffix(".tmp")
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def run_conversion(handler_class, settings: dict, source: Path, output_path: Path) -> tuple[Path, str | None, object]:
+    """Build one file in a worker process from a handler's picklable settings."""
+    handler = handler_class(**settings)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.touch(exist_ok=True)
+    return handler.build_outputs(source, output_path), handler.report(), handler.stats()
+
+
+class ConversionScheduler:
+    """Convert a file or directory with one or more format handlers.
+
+    Progress is reported through `progress_callback(current, total,
+    source_path, output_path, info_message)`, the signature both converter
+    GUIs already consume. Failed files are retried `retries` times and then
+    listed in `failures`; with `incremental`, files whose manifest entry
+    (size, mtime and handler settings) still matches existing outputs are
+    listed in `unchanged` and skipped. The manifest is saved after every
+    converted file, so an interrupted run resumes where it stopped.
+    """
+
+    def __init__(self, handlers, workers: int = 1, incremental: bool = False, retries: int = 0):
+        if workers < 1:
+            raise ValueError("Workers must be at least 1")
+        if retries < 0:
+            raise ValueError("Retries cannot be negative")
+        self.handlers = {suffix: handler for handler in handlers for suffix in handler.suffixes}
+        self.workers = workers
+        self.incremental = incremental
+        self.retries = retries
+        self.failures: list[ConversionIssue] = []
+        self.unchanged: list[Path] = []
+
+    @property
+    def label(self) -> str:
+        labels = list(dict.fromkeys(handler.label for handler in self.handlers.values()))
+        return " or ".join(labels)
+
+    def collect_inputs(self, input_path: Path) -> list[Path]:
+        suffixes = list(self.handlers)
+        if input_path.is_file():
+            if input_path.suffix.lower() not in self.handlers:
+                raise ValueError(f"Only {' or '.join(suffixes)} files are supported.")
+            return [input_path]
+
+        if input_path.is_dir():
+            # A single walk covers every registered format.
+            files = sorted(
+                (path for path in input_path.rglob("*") if path.suffix.lower() in self.handlers and path.is_file()),
+                key=lambda path: (path.stat().st_size, str(path).lower()),
+            )
+            if not files:
+                raise ValueError(f"No {' or '.join(suffixes)} files found in {input_path}")
+            return files
+
+        raise ValueError(f"Input path not found: {input_path}")
+
+    def handler_for(self, source: Path):
+        return self.handlers[source.suffix.lower()]
+
+    def output_path_for(self, source: Path, input_path: Path, output_dir: Path) -> Path:
+        suffix = self.handler_for(source).output_suffix
+        if input_path.is_dir():
+            return output_dir / source.relative_to(input_path).with_suffix(suffix)
+        return output_dir / f"{source.stem}{suffix}"
+
+    def plan_outputs(self, files: list[Path], input_path: Path, output_dir: Path) -> dict[Path, Path]:
+        """Output path per source; sources that would share one keep their suffix (report.pdf.md, report.pptx.md)."""
+        outputs = {source: self.output_path_for(source, input_path, output_dir) for source in files}
+        claimed: dict[Path, list[Path]] = {}
+        for source, output in outputs.items():
+            claimed.setdefault(output, []).append(source)
+        for output, sources in claimed.items():
+            if len(sources) > 1:
+                for source in sources:
+                    outputs[source] = output.with_name(f"{output.stem}{source.suffix.lower()}{output.suffix}")
+        return outputs
+
+    def expected_outputs(self, source: Path, output: Path) -> list[Path]:
+        """Every file one conversion writes; `both` puts the JSONL chunks beside the Markdown."""
+        if self.handler_for(source).settings.get("output_format") == "both":
+            return [output, output.with_suffix(".jsonl")]
+        return [output]
+
+    def manifest_entry(self, source: Path) -> dict:
+        return dict(source_signature(source), settings=self.handler_for(source).settings)
+
+    def convert(self, input_path: Path, output_dir: Path, progress_callback=None) -> list[Path]:
+        files = self.collect_inputs(input_path)
+        outputs = self.plan_outputs(files, input_path, output_dir)
+        total = len(files)
+        self.failures = []
+        self.unchanged = []
+
+        def notify(source, output, message):
+            if progress_callback:
+                progress_callback(len(done), total, source, output, message)
+
+        done: dict[Path, Path] = {}
+        notify(None, None, f"Found {total} {self.label} file(s). Processing smaller files first.")
+
+        manifest = load_manifest(output_dir) if self.incremental else {}
+        pending: list[Path] = []
+        for source in files:
+            key = outputs[source].relative_to(output_dir).as_posix()
+            if (
+                self.incremental
+                and manifest.get(key) == self.manifest_entry(source)
+                and all(path.exists() for path in self.expected_outputs(source, outputs[source]))
+            ):
+                done[source] = outputs[source]
+                self.unchanged.append(source)
+            else:
+                pending.append(source)
+
+        if self.unchanged:
+            notify(None, None, f"Skipping {len(self.unchanged)} unchanged file(s).")
+
+        def record(source: Path, result: Path | None, report: str | None, error: Exception | None):
+            key = outputs[source].relative_to(output_dir).as_posix()
+            if error is not None:
+                self.failures.append(ConversionIssue(source=source, error=str(error)))
+                if self.incremental and manifest.pop(key, None) is not None:
+                    save_manifest(output_dir, manifest)
+                notify(source, outputs[source], f"Skipped {source.name}: {error}")
+                return
+
+            done[source] = result
+            if self.incremental:
+                manifest[key] = self.manifest_entry(source)
+                save_manifest(output_dir, manifest)
+            if report:
+                notify(source, result, report)
+            notify(source, result, None)
+
+        if self.workers > 1 and len(pending) > 1:
+            self._convert_parallel(pending, outputs, record, notify)
+        else:
+            for index, source in enumerate(pending, start=1):
+                size_mb = source.stat().st_size / (1024 * 1024)
+                notify(source, outputs[source], f"Processing {index}/{len(pending)}: {source.name} ({size_mb:.1f} MB)")
+                for attempt in range(self.retries + 1):
+                    handler = self.handler_for(source)
+                    try:
+                        outputs[source].parent.mkdir(parents=True, exist_ok=True)
+                        outputs[source].touch(exist_ok=True)
+                        result = handler.build_outputs(source, outputs[source])
+                    except Exception as exc:
+                        if attempt < self.retries:
+                            notify(source, outputs[source], f"Retrying {source.name}: {exc}")
+                            continue
+                        record(source, None, None, exc)
+                    else:
+                        record(source, result, handler.report(), None)
+                    break
+
+        if self.failures:
+            notify(None, None, f"Completed with {len(self.failures)} skipped file(s). Check the log for details.")
+
+        return [done[path] for path in files if path in done]
+
+    def _convert_parallel(self, pending: list[Path], outputs: dict[Path, Path], record, notify):
+        charged = {source: 0 for source in pending}
+        queue = deque(pending)
+        # A worker that dies breaks the whole pool and fails everything in flight with it.
+        # Those files are rerun one at a time, so only the one that crashes again is charged.
+        suspects = deque()
+
+        def charge(source: Path, exc: Exception):
+            charged[source] += 1
+            if charged[source] <= self.retries:
+                notify(source, outputs[source], f"Retrying {source.name}: {exc}")
+                queue.append(source)
+            else:
+                record(source, None, None, exc)
+
+        while queue or suspects:
+            waiting = suspects if suspects else queue
+            limit = 1 if suspects else min(self.workers, len(queue))
+            crashed = {}
+            with ProcessPoolExecutor(max_workers=limit) as pool:
+                running = {}
+                while waiting or running:
+                    # Never queue more than the pool can run, so a crash only takes in-flight files with it
+                    while waiting and not crashed and len(running) < limit:
+                        source = waiting.popleft()
+                        handler = self.handler_for(source)
+                        try:
+                            future = pool.submit(run_conversion, type(handler), handler.settings, source, outputs[source])
+                        except BrokenProcessPool:
+                            waiting.appendleft(source)
+                            break
+                        running[future] = source
+                    if not running:
+                        break
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        source = running.pop(future)
+                        try:
+                            result, report, stats = future.result()
+                        except BrokenProcessPool as exc:
+                            crashed[source] = exc
+                        except Exception as exc:
+                            charge(source, exc)
+                        else:
+                            self.handler_for(source).merge_stats(source, stats)
+                            record(source, result, report, None)
+
+            if len(crashed) == 1:
+                charge(*next(iter(crashed.items())))
+            else:
+                suspects.extend(crashed)
+
+
+def launch_gui(title: str, description: str, label: str, filetypes: list[tuple[str, str]], converter_factory):
+    """Tk front end shared by every converter; `converter_factory()` returns an object with `convert()`."""
+    import tkinter as tk
+    from tkinter import filedialog, messagebox, scrolledtext, ttk
+
+    class App:
+        def __init__(self, root):
+            self.root = root
+            self.root.title(title)
+            self.root.geometry("860x620")
+
+            self.mode = tk.StringVar(value="file")
+            self.input_path = tk.StringVar()
+            self.output_dir = tk.StringVar()
+            self.status = tk.StringVar(value="Ready")
+            self.progress = tk.DoubleVar(value=0.0)
+            self.queue = Queue()
+            self.worker = None
+
+            self._build()
+            self.root.after(100, self._drain_queue)
+
+        def _build(self):
+            pad = dict(padx=8, pady=4)
+
+            main = ttk.Frame(self.root, padding=10)
+            main.grid(row=0, column=0, sticky="nsew")
+            self.root.columnconfigure(0, weight=1)
+            self.root.rowconfigure(0, weight=1)
+            main.columnconfigure(1, weight=1)
+            main.rowconfigure(5, weight=1)
+
+            ttk.Label(main, text=title, font=("Segoe UI", 16, "bold")).grid(
+                row=0, column=0, columnspan=3, sticky="w", **pad
+            )
+            ttk.Label(
+                main,
+                text=description,
+                foreground="#555",
+            ).grid(row=1, column=0, columnspan=3, sticky="w", **pad)
+
+            mode_frame = ttk.LabelFrame(main, text="Input Type", padding=8)
+            mode_frame.grid(row=2, column=0, columnspan=3, sticky="ew", **pad)
+            ttk.Radiobutton(
+                mode_frame,
+                text=f"Single {label} file",
+                variable=self.mode,
+                value="file",
+                command=self._sync_defaults,
+            ).grid(row=0, column=0, sticky="w", padx=4, pady=2)
+            ttk.Radiobutton(
+                mode_frame,
+                text=f"Whole directory of {label} files",
+                variable=self.mode,
+                value="directory",
+                command=self._sync_defaults,
+            ).grid(row=0, column=1, sticky="w", padx=12, pady=2)
+
+            paths = ttk.LabelFrame(main, text="Paths", padding=8)
+            paths.grid(row=3, column=0, columnspan=3, sticky="ew", **pad)
+            paths.columnconfigure(1, weight=1)
+
+            self._file_row(paths, 0, f"{label} file or folder:", self.input_path, self._browse_input)
+            self._file_row(paths, 1, "Output directory:", self.output_dir, self._browse_output)
+
+            actions = ttk.Frame(main)
+            actions.grid(row=4, column=0, columnspan=3, sticky="ew", **pad)
+            self.convert_btn = ttk.Button(actions, text="Convert to Markdown", command=self._start)
+            self.convert_btn.pack(side="left", padx=4)
+            ttk.Button(actions, text="Clear Log", command=self._clear_log).pack(side="left", padx=4)
+
+            ttk.Label(main, textvariable=self.status).grid(row=5, column=0, columnspan=3, sticky="w", **pad)
+            ttk.Progressbar(main, maximum=100, variable=self.progress).grid(
+                row=6, column=0, columnspan=3, sticky="ew", **pad
+            )
+
+            log_frame = ttk.LabelFrame(main, text="Activity Log", padding=8)
+            log_frame.grid(row=7, column=0, columnspan=3, sticky="nsew", **pad)
+            log_frame.columnconfigure(0, weight=1)
+            log_frame.rowconfigure(0, weight=1)
+            self.log = scrolledtext.ScrolledText(log_frame, height=20, font=("Consolas", 9))
+            self.log.grid(row=0, column=0, sticky="nsew")
+
+        def _file_row(self, parent, row, text, variable, command):
+            ttk.Label(parent, text=text).grid(row=row, column=0, sticky="w", pady=2)
+            ttk.Entry(parent, textvariable=variable).grid(row=row, column=1, sticky="ew", padx=4, pady=2)
+            ttk.Button(parent, text="Browse", command=command).grid(row=row, column=2, padx=4, pady=2)
+
+        def _browse_input(self):
+            if self.mode.get() == "directory":
+                selected = filedialog.askdirectory(title=f"Select {label} Directory")
+            else:
+                selected = filedialog.askopenfilename(
+                    title=f"Select {label} File",
+                    filetypes=filetypes,
+                )
+            if selected:
+                self.input_path.set(selected)
+                self._sync_defaults()
+
+        def _browse_output(self):
+            selected = filedialog.askdirectory(title="Select Output Directory")
+            if selected:
+                self.output_dir.set(selected)
+
+        def _sync_defaults(self):
+            input_path = self.input_path.get().strip()
+            if not input_path:
+                return
+
+            source = Path(input_path)
+            if self.mode.get() == "directory":
+                self.output_dir.set(str(source.parent / f"{source.name}_markdown"))
+            else:
+                self.output_dir.set(str(source.parent / "markdown"))
+
+        def _append_log(self, message):
+            self.log.insert("end", message + "\n")
+            self.log.see("end")
+
+        def _clear_log(self):
+            self.log.delete("1.0", "end")
+
+        def _start(self):
+            input_value = self.input_path.get().strip()
+            output_value = self.output_dir.get().strip()
+
+            if not input_value:
+                messagebox.showerror("Missing", f"Please select a {label} file or directory.")
+                return
+            if not output_value:
+                messagebox.showerror("Missing", "Please select an output directory.")
+                return
+            if self.worker and self.worker.is_alive():
+                return
+
+            input_path = Path(input_value)
+            output_dir = Path(output_value)
+
+            self._clear_log()
+            self.progress.set(0)
+            self.status.set("Starting conversion...")
+            self._append_log(f"Input: {input_path}")
+            self._append_log(f"Output: {output_dir}")
+            self.convert_btn.state(["disabled"])
+
+            self.worker = threading.Thread(
+                target=self._run_worker,
+                args=(input_path, output_dir),
+                daemon=True,
+            )
+            self.worker.start()
+
+        def _run_worker(self, input_path: Path, output_dir: Path):
+            def progress_callback(current, total, source_path, output_path, info_message):
+                if info_message:
+                    self.queue.put(("info", info_message))
+                    return
+                self.queue.put(
+                    (
+                        "progress",
+                        (
+                            current,
+                            total,
+                            f"Converted {source_path.name} -> {output_path.name}",
+                        ),
+                    )
+                )
+
+            try:
+                converter = converter_factory()
+                results = converter.convert(input_path, output_dir, progress_callback=progress_callback)
+                self.queue.put(("done", results))
+            except Exception as exc:
+                self.queue.put(("error", str(exc)))
+
+        def _drain_queue(self):
+            try:
+                while True:
+                    kind, payload = self.queue.get_nowait()
+                    if kind == "info":
+                        self._append_log(payload)
+                        self.status.set(payload)
+                    elif kind == "progress":
+                        current, total, message = payload
+                        percent = 0 if total <= 0 else (current / total) * 100
+                        self.progress.set(percent)
+                        self.status.set(message)
+                        self._append_log(message)
+                    elif kind == "done":
+                        self.progress.set(100)
+                        message = f"Finished. Created {len(payload)} Markdown file(s)."
+                        self.status.set(message)
+                        self._append_log(message)
+                        self.convert_btn.state(["!disabled"])
+                        messagebox.showinfo("Conversion Complete", message)
+                    elif kind == "error":
+                        self.status.set("Conversion failed.")
+                        self._append_log(f"ERROR: {payload}")
+                        self.convert_btn.state(["!disabled"])
+                        messagebox.showerror("Conversion Failed", payload)
+            except Empty:
+                pass
+            finally:
+                self.root.after(100, self._drain_queue)
+
+    root = tk.Tk()
+    App(root)
+    root.mainloop()
+
+
+def add_batch_arguments(parser) -> None:
+    """Output and scheduling options shared by every converter CLI."""
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="markdown",
+        help="Write Markdown, heading-aware JSONL chunks for RAG ingestion, or both.",
+    )
+    parser.add_argument("--chunk-tokens", type=int, default=DEFAULT_CHUNK_TOKENS, help="Target tokens per JSONL chunk.")
+    parser.add_argument("--chunk-overlap", type=int, default=DEFAULT_CHUNK_OVERLAP, help="Tokens repeated between chunks.")
+    parser.add_argument("--workers", type=int, default=1, help="Convert this many files in parallel.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip files that are unchanged since the last run (tracked in a manifest in the output directory).",
+    )
+    parser.add_argument("--retries", type=int, default=0, help="Retry a failed file this many times.")
+
+
+def progress_printer(current, total, source_path, output_path, info_message):
+    """CLI progress callback shared by the converter entry points."""
+    if info_message:
+        print(info_message)
+        return
+    print(f"[{current}/{total}] {source_path} -> {output_path}")
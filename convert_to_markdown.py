@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Convert PDFs and PowerPoint decks to Markdown in one pass.
+
+Mixed directories are walked once and every file is dispatched to the
+PDF or PowerPoint converter by suffix, sharing one worker pool, manifest
+and progress stream.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from conversion_engine import ConversionScheduler, add_batch_arguments, launch_gui, progress_printer
+from pdf_to_epub import DEFAULT_ENGINE as DEFAULT_PDF_ENGINE
+from pdf_to_epub import EXTRACTION_BACKENDS, PdfToMarkdownConverter
+from pptx_to_epub import DEFAULT_ENGINE as DEFAULT_PPTX_ENGINE
+from pptx_to_epub import EXTRACTION_ENGINES, PowerPointToMarkdownConverter
+
+
+def build_scheduler(args=None) -> ConversionScheduler:
+    if args is None:
+        return ConversionScheduler([PdfToMarkdownConverter(), PowerPointToMarkdownConverter()])
+
+    output = dict(output_format=args.format, chunk_tokens=args.chunk_tokens, chunk_overlap=args.chunk_overlap)
+    handlers = [
+        PdfToMarkdownConverter(engine=args.pdf_engine, tables=args.tables, ocr=args.ocr, **output),
+        PowerPointToMarkdownConverter(
+            engine=args.pptx_engine,
+            include_notes=args.notes,
+            include_alt_text=args.alt_text,
+            **output,
+        ),
+    ]
+    return ConversionScheduler(handlers, workers=args.workers, incremental=args.incremental, retries=args.retries)
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        description="Convert PDF and PowerPoint files into structured Markdown files in one pass."
+    )
+    parser.add_argument("--gui", action="store_true", help="Launch the converter GUI.")
+    parser.add_argument("--input", help="Path to a .pdf/.pptx file or a directory containing them.")
+    parser.add_argument("--output-dir", help="Directory where Markdown files will be written.")
+    add_batch_arguments(parser)
+
+    pdf = parser.add_argument_group("PDF options")
+    pdf.add_argument("--pdf-engine", choices=sorted(EXTRACTION_BACKENDS), default=DEFAULT_PDF_ENGINE)
+    pdf.add_argument("--tables", action="store_true", help="Render ruled PDF tables as Markdown tables.")
+    pdf.add_argument("--ocr", action="store_true", help="OCR PDF pages that have no text layer.")
+
+    pptx = parser.add_argument_group("PowerPoint options")
+    pptx.add_argument("--pptx-engine", choices=sorted(EXTRACTION_ENGINES), default=DEFAULT_PPTX_ENGINE)
+    pptx.add_argument("--notes", action="store_true", help="Include speaker notes after each slide.")
+    pptx.add_argument("--alt-text", action="store_true", help="Include image alt text where the image appears.")
+    return parser
+
+
+def run_cli(args) -> int:
+    if not args.input:
+        raise SystemExit("--input is required in CLI mode")
+    if not args.output_dir:
+        raise SystemExit("--output-dir is required in CLI mode")
+
+    try:
+        scheduler = build_scheduler(args)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    input_path = Path(args.input).expanduser()
+    output_dir = Path(args.output_dir).expanduser()
+
+    results = scheduler.convert(input_path, output_dir, progress_callback=progress_printer)
+    kind = "Markdown" if args.format == "markdown" else "output"
+    print(f"Created {len(results)} {kind} file(s) in {output_dir}")
+    for issue in scheduler.failures:
+        print(f"FAILED {issue.source}: {issue.error}")
+    return 1 if scheduler.failures else 0
+
+
+def main(argv=None) -> int:
+    parser = build_arg_parser()
+    argv = sys.argv[1:] if argv is None else argv
+
+    if not argv or "--gui" in argv:
+        launch_gui(
+            "Documents to Markdown",
+            "Convert PDFs and PowerPoint decks into readable Markdown in one pass.",
+            "PDF or PowerPoint",
+            [("Documents", "*.pdf *.pptx"), ("PDF files", "*.pdf"), ("PowerPoint files", "*.pptx")],
+            build_scheduler,
+        )
+        return 0
+
+    args = parser.parse_args(argv)
+    return run_cli(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
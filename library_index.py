@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+In-memory index of the organized PDF library.
+
+The library is scanned once with os.scandir, and every folder records its
+own PDFs and subfolders plus aggregate counts for its whole subtree,
+computed in a single bottom-up pass. Later refreshes stat each indexed
+folder and relist only those whose mtime changed (a file or subfolder was
+added, removed or renamed), so browsing a large library costs one stat per
+folder instead of a full walk. Size changes of files edited in place do
+not touch the folder mtime and show up on the next forced refresh.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+REFRESH_INTERVAL_SECONDS = 2.0
+DEFAULT_PAGE_SIZE = 200
+MAX_CACHED_INDEXES = 8
+
+# Folders changed this close to a scan may change again within the same mtime tick
+RACY_MTIME_NS = 2_000_000_000
+
+
+@dataclass
+class FolderNode:
+    path: str  # relative POSIX path, "" for the library root
+    name: str
+    mtime_ns: int = 0
+    racy: bool = False
+    folders: list[str] = field(default_factory=list)
+    files: dict[str, int] = field(default_factory=dict)  # PDF name -> size
+    pdf_count: int = 0  # PDFs in this folder and below
+    folder_count: int = 0  # folders below this one
+
+
+def _join(parent: str, name: str) -> str:
+    return f"{parent}/{name}" if parent else name
+
+
+class LibraryIndex:
+    """Folder tree of one library root with aggregated PDF counts."""
+
+    def __init__(self, root: Path | str, refresh_interval: float = REFRESH_INTERVAL_SECONDS):
+        self.root = Path(root)
+        self.refresh_interval = refresh_interval
+        self.nodes: dict[str, FolderNode] = {}
+        self.lock = threading.RLock()
+        self._checked = 0.0
+        with self.lock:
+            self._scan_tree("")
+            self._aggregate()
+            self._checked = time.monotonic()
+
+    def refresh(self, force: bool = False) -> bool:
+        """Bring the index up to date; returns True if anything changed."""
+        with self.lock:
+            if not force and time.monotonic() - self._checked < self.refresh_interval:
+                return False
+            changed = False
+            for path in list(self.nodes):
+                node = self.nodes.get(path)
+                if node is None:  # dropped along with a removed parent
+                    continue
+                try:
+                    mtime_ns = os.stat(self.root / path).st_mtime_ns
+                except (FileNotFoundError, NotADirectoryError):
+                    if path:
+                        self._drop(path)
+                        changed = True
+                    continue
+                if force or node.racy or mtime_ns != node.mtime_ns:
+                    folder_changed, added = self._scan_folder(path)
+                    for child in added:
+                        self._scan_tree(child)
+                    changed = changed or folder_changed
+            if changed:
+                self._aggregate()
+            self._checked = time.monotonic()
+            return changed
+
+    def folder(self, path: str = "") -> FolderNode | None:
+        return self.nodes.get(path.strip("/"))
+
+    def stats(self) -> dict:
+        root = self.nodes[""]
+        return {"total_pdfs": root.pdf_count, "total_folders": root.folder_count}
+
+    def children(self, path: str = "", offset: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> dict | None:
+        """One page of a folder's entries, folders and PDFs interleaved by name."""
+        with self.lock:
+            node = self.folder(path)
+            if node is None:
+                return None
+            entries = sorted(
+                [(name, True) for name in node.folders] + [(name, False) for name in node.files]
+            )
+            items = []
+            for name, is_folder in entries[offset:offset + limit]:
+                item_path = _join(node.path, name)
+                if is_folder:
+                    child = self.nodes.get(item_path)
+                    if child is None:  # listed by its parent but not indexed yet
+                        continue
+                    items.append({
+                        'name': name,
+                        'type': 'folder',
+                        'path': item_path,
+                        'pdf_count': child.pdf_count,
+                        'has_children': bool(child.folders or child.files),
+                    })
+                else:
+                    items.append({
+                        'name': name,
+                        'type': 'file',
+                        'path': item_path,
+                        'size': node.files[name],
+                    })
+            return {
+                'path': node.path,
+                'pdf_count': node.pdf_count,
+                'items': items,
+                'offset': offset,
+                'limit': limit,
+                'total_items': len(entries),
+            }
+
+    def _scan_tree(self, path: str) -> None:
+        pending = [path]
+        while pending:
+            pending.extend(self._scan_folder(pending.pop())[1])
+
+    def _scan_folder(self, path: str) -> tuple[bool, list[str]]:
+        """Relist one folder; returns whether it changed and the subfolders not yet indexed."""
+        directory = self.root / path
+        scan_started = time.time_ns()
+        folders, files = [], {}
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            folders.append(entry.name)
+                        elif entry.name.lower().endswith('.pdf') and entry.is_file():
+                            files[entry.name] = entry.stat().st_size
+                    except OSError:
+                        continue
+        except PermissionError:
+            mtime_ns = 0
+        except (FileNotFoundError, NotADirectoryError):
+            if path:
+                self._drop(path)
+            return True, []
+        folders.sort()
+
+        node = self.nodes.get(path)
+        if node is None:
+            node = self.nodes[path] = FolderNode(path=path, name=Path(path).name if path else self.root.name)
+            old_folders = set()
+            changed = True
+        else:
+            old_folders = set(node.folders)
+            changed = node.folders != folders or node.files != files
+
+        node.mtime_ns = mtime_ns
+        node.racy = mtime_ns >= scan_started - RACY_MTIME_NS
+        node.folders = folders
+        node.files = files
+
+        for name in old_folders - set(folders):
+            self._drop(_join(path, name))
+        return changed, [_join(path, name) for name in folders if _join(path, name) not in self.nodes]
+
+    def _drop(self, path: str) -> None:
+        prefix = path + "/"
+        for key in [key for key in self.nodes if key == path or key.startswith(prefix)]:
+            del self.nodes[key]
+        parent = self.nodes.get(path.rpartition("/")[0])
+        if parent is not None and Path(path).name in parent.folders:
+            parent.folders.remove(Path(path).name)
+
+    def _aggregate(self) -> None:
+        # Deepest folders first, so each parent sums finished children
+        for path in sorted(self.nodes, key=lambda key: key.count("/") + bool(key), reverse=True):
+            node = self.nodes[path]
+            children = [self.nodes[_join(path, name)] for name in node.folders if _join(path, name) in self.nodes]
+            node.pdf_count = len(node.files) + sum(child.pdf_count for child in children)
+            node.folder_count = len(children) + sum(child.folder_count for child in children)
+
+
+_indexes: OrderedDict[str, LibraryIndex] = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_library_index(root: Path | str) -> LibraryIndex:
+    """Shared, refreshed index for a library root."""
+    key = os.path.realpath(root)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+    if index is None:
+        index = LibraryIndex(key)
+        with _indexes_lock:
+            index = _indexes.setdefault(key, index)
+            while len(_indexes) > MAX_CACHED_INDEXES:
+                _indexes.popitem(last=False)
+    else:
+        index.refresh()
+    return index
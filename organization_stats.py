@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Running statistics for the organization log.
+
+`organization_log.json` keeps every organized file, so summarizing it means
+reading the whole history. The organizer instead updates these aggregates
+as it moves each file and saves them next to the log as
+`organization_stats.json`: totals per category, provider and confidence,
+plus the same breakdown per day for date-range queries. Reading them costs
+the same however long the history is.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from pathlib import Path
+
+STATS_FILE_NAME = "organization_stats.json"
+LOG_FILE_NAME = "organization_log.json"
+
+
+def _count(counter: dict, key: str, amount: int = 1) -> None:
+    counter[key] = counter.get(key, 0) + amount
+
+
+def _merge(target: dict, source: dict) -> None:
+    for key, amount in source.items():
+        _count(target, key, amount)
+
+
+def _day_bucket() -> dict:
+    return {"total": 0, "categories": {}, "providers": {}, "confidence": {}}
+
+
+@dataclass
+class OrganizationStats:
+    total: int = 0
+    undated: int = 0  # entries logged before timestamps were recorded
+    last_run: str | None = None
+    categories: dict = field(default_factory=dict)
+    providers: dict = field(default_factory=dict)
+    confidence: dict = field(default_factory=dict)
+    days: dict = field(default_factory=dict)  # "YYYY-MM-DD" -> day bucket
+
+    def record(self, entry: dict) -> None:
+        """Count one organized-file log entry."""
+        category = entry.get("category") or "Uncategorized"
+        provider = entry.get("provider") or "unknown"
+        confidence = entry.get("confidence") or "unknown"
+
+        self.total += 1
+        _count(self.categories, category)
+        _count(self.providers, provider)
+        _count(self.confidence, confidence)
+
+        day = (entry.get("organized_at") or "")[:10]
+        if not day:
+            self.undated += 1
+            return
+        bucket = self.days.setdefault(day, _day_bucket())
+        bucket["total"] += 1
+        _count(bucket["categories"], category)
+        _count(bucket["providers"], provider)
+        _count(bucket["confidence"], confidence)
+
+    def query(self, since: str | None = None, until: str | None = None) -> dict:
+        """Totals for all time, or for the inclusive ISO date range given."""
+        since = date.fromisoformat(since).isoformat() if since else None
+        until = date.fromisoformat(until).isoformat() if until else None
+        days = {
+            day: bucket for day, bucket in self.days.items()
+            if (since is None or day >= since) and (until is None or day <= until)
+        }
+
+        if since is None and until is None:
+            summary = {
+                "total_organized": self.total,
+                "categories": dict(self.categories),
+                "providers": dict(self.providers),
+                "confidence": dict(self.confidence),
+            }
+        else:
+            summary = {"total_organized": 0, "categories": {}, "providers": {}, "confidence": {}}
+            for bucket in days.values():
+                summary["total_organized"] += bucket["total"]
+                _merge(summary["categories"], bucket["categories"])
+                _merge(summary["providers"], bucket["providers"])
+                _merge(summary["confidence"], bucket["confidence"])
+
+        summary.update(
+            last_run=self.last_run,
+            since=since,
+            until=until,
+            days={day: days[day]["total"] for day in sorted(days)},
+        )
+        return summary
+
+    @classmethod
+    def from_log(cls, log: dict) -> OrganizationStats:
+        stats = cls(last_run=log.get("last_run"))
+        for entry in log.get("organized_files", []):
+            stats.record(entry)
+        return stats
+
+    @classmethod
+    def load(cls, path: Path | str) -> OrganizationStats | None:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                return cls(**json.load(handle))
+        except (FileNotFoundError, TypeError, ValueError):
+            return None
+
+    def save(self, path: Path | str) -> None:
+        path = Path(path)
+        staging = path.with_name(f".{path.name}.{os.getpid()}")
+        with open(staging, "w", encoding="utf-8") as handle:
+            json.dump(asdict(self), handle, ensure_ascii=False)
+        os.replace(staging, path)
+
+
+_cache: dict[str, tuple[int, OrganizationStats]] = {}
+
+
+def load_stats(ebooks_folder: Path | str) -> OrganizationStats:
+    """Stats for a library, building them once from the log for libraries organized before they existed."""
+    folder = Path(ebooks_folder)
+    stats_path = folder / STATS_FILE_NAME
+    try:
+        mtime_ns = stats_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = None
+
+    if mtime_ns is not None:
+        cached = _cache.get(str(stats_path))
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        stats = OrganizationStats.load(stats_path)
+        if stats is not None:
+            _cache[str(stats_path)] = (mtime_ns, stats)
+            return stats
+
+    log_path = folder / LOG_FILE_NAME
+    if not log_path.exists():
+        return OrganizationStats()
+    with open(log_path, "r", encoding="utf-8") as handle:
+        stats = OrganizationStats.from_log(json.load(handle))
+    stats.save(stats_path)
+    _cache[str(stats_path)] = (stats_path.stat().st_mtime_ns, stats)
+    return stats
@@ -28,7 +28,9 @@ from anthropic import Anthropic
 from openai import OpenAI
 from pypdf import PdfReader
 
+from organization_stats import LOG_FILE_NAME, STATS_FILE_NAME, OrganizationStats
 from pdf_content_analyzer import PDFContentAnalyzer
+from pdf_ocr import PdfOcr
 
 
 LogCallback = Callable[[str], None]
@@ -50,6 +52,7 @@ class BatchPDFOrganizer:
         provider="gemini",
         model_name=None,
         use_content_analysis=True,
+        use_ocr=False,
         require_api_key=True,
         logger: LogCallback | None = None,
         progress_callback: ProgressCallback | None = None,
@@ -73,7 +76,15 @@ class BatchPDFOrganizer:
 
         default_template = Path(__file__).resolve().parent / "category_template.json"
         self.category_template_path = Path(category_template) if category_template else default_template
-        self.content_analyzer = PDFContentAnalyzer() if use_content_analysis else None
+        self.content_analyzer = None
+        if use_content_analysis:
+            ocr = None
+            if use_ocr:
+                try:
+                    ocr = PdfOcr()
+                except ValueError as exc:
+                    self._emit(f"OCR disabled: {exc}")
+            self.content_analyzer = PDFContentAnalyzer(ocr=ocr)
 
         if self.provider == "gemini":
             self.model_name = model_name or "gemini-1.5-flash"
@@ -99,7 +110,8 @@ class BatchPDFOrganizer:
                     base_url="https://api.deepseek.com",
                 )
 
-        self.log_file = self.ebooks_folder / "organization_log.json"
+        self.log_file = self.ebooks_folder / LOG_FILE_NAME
+        self.stats_file = self.ebooks_folder / STATS_FILE_NAME
         self.summary = {}
         self.load_log()
 
@@ -140,11 +152,18 @@ class BatchPDFOrganizer:
                 "last_run": None,
             }
 
+        # Rebuild the aggregates if they are missing or fell out of step with the log
+        self.stats = OrganizationStats.load(self.stats_file)
+        if self.stats is None or self.stats.total != len(self.log["organized_files"]):
+            self.stats = OrganizationStats.from_log(self.log)
+
     def save_log(self):
         self.log["last_run"] = datetime.now().isoformat()
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
         with open(self.log_file, "w", encoding="utf-8") as handle:
             json.dump(self.log, handle, indent=2, ensure_ascii=False)
+        self.stats.last_run = self.log["last_run"]
+        self.stats.save(self.stats_file)
 
     def analyze_existing_structure(self):
         self._emit("Analyzing existing ebooks folder structure...")
@@ -426,6 +445,16 @@ Return ONLY the JSON array."""
         shutil.move(str(source), str(destination))
         self._emit(f"Moved: {source.name} -> {destination}")
 
+        entry = dict(
+            result,
+            destination=str(destination),
+            provider=self.provider,
+            organized_at=datetime.now().isoformat(),
+        )
+        self.log["organized_files"].append(entry)
+        self.stats.record(entry)
+        return destination
+
     def organize_pdfs(self):
         self._emit(f"Scanning {self.downloads_folder} for PDFs...")
         pdf_files = self.find_pdfs()
@@ -498,7 +527,6 @@ Return ONLY the JSON array."""
                 self._progress(index, len(results), f"Moving {Path(result['source']).name}")
                 self.move_pdf(result)
                 moved_count += 1
-            self.log["organized_files"].extend(results)
             self.save_log()
             self._emit(f"Organized {moved_count} PDFs")
 
@@ -787,6 +815,7 @@ def run_cli(args):
         dry_run=args.dry_run,
         category_template=args.category_template,
         use_content_analysis=not args.no_content_analysis,
+        use_ocr=args.ocr,
     ) as organizer:
         results = organizer.organize_pdfs()
         return 0 if results or organizer.summary.get("total_files", 0) == 0 else 1
@@ -802,6 +831,7 @@ def build_arg_parser():
     parser.add_argument("--dry-run", action="store_true", help="Preview only; do not move files")
     parser.add_argument("--category-template", help="Optional category template JSON file")
     parser.add_argument("--no-content-analysis", action="store_true", help="Disable PDF text analysis")
+    parser.add_argument("--ocr", action="store_true", help="OCR image-only pages during content analysis (needs Tesseract)")
     return parser
 
 
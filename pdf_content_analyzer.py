@@ -10,16 +10,18 @@ from pathlib import Path
 class PDFContentAnalyzer:
     """Analyzes PDF content for better categorization and naming"""
 
-    def __init__(self, max_pages=3, max_chars=2000):
+    def __init__(self, max_pages=3, max_chars=2000, ocr=None):
         """
         Initialize content analyzer
 
         Args:
             max_pages: Maximum pages to extract text from (default: 3)
             max_chars: Maximum characters to extract (default: 2000)
+            ocr: Optional PdfOcr used for pages without a text layer
         """
         self.max_pages = max_pages
         self.max_chars = max_chars
+        self.ocr = ocr
 
     def extract_text_content(self, pdf_path):
         """
@@ -41,21 +43,31 @@ class PDFContentAnalyzer:
             }
 
             # Extract text from first few pages
-            extracted_text = []
+            extracted_text = {}
+            blank_pages = []
             pages_to_read = min(self.max_pages, len(reader.pages))
 
             for i in range(pages_to_read):
                 try:
                     page = reader.pages[i]
                     text = page.extract_text()
-                    if text:
-                        extracted_text.append(text)
+                    if text and text.strip():
+                        extracted_text[i + 1] = text
+                    else:
+                        blank_pages.append(i + 1)
                 except Exception as e:
                     # Skip pages that fail to extract
                     continue
 
+            # Image-only pages are OCRed only when an OCR engine was provided
+            if self.ocr is not None and blank_pages:
+                try:
+                    extracted_text.update(self.ocr.page_texts(Path(pdf_path), blank_pages))
+                except Exception:
+                    pass
+
             # Combine and limit text
-            full_text = "\n".join(extracted_text)
+            full_text = "\n".join(extracted_text[number] for number in sorted(extracted_text))
             if len(full_text) > self.max_chars:
                 full_text = full_text[:self.max_chars] + "..."
 
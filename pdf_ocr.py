@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Optional OCR fallback for image-only PDF pages.
+
+Pages without a text layer are rendered with pdfplumber and read with a
+local Tesseract install through `pytesseract`. Pages run in a process pool,
+and results are cached on disk keyed by a hash of the page content, so
+re-running a conversion or an organizer preview never OCRs the same page
+twice. Both `pdf_to_epub.py` and `pdf_content_analyzer.py` use this module.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pdfplumber
+from pypdf import PdfReader
+
+try:
+    import pytesseract  # optional: pip install pytesseract (plus the Tesseract binary)
+except ImportError:
+    pytesseract = None
+
+
+DEFAULT_CACHE_DIR = Path.home() / ".pdf_organizer_ocr_cache"
+DEFAULT_RESOLUTION = 300
+OCR_FONT_NAME = "OCR"
+
+
+def tesseract_available() -> bool:
+    if pytesseract is None:
+        return False
+    try:
+        pytesseract.get_tesseract_version()
+    except Exception:
+        return False
+    return True
+
+
+def _hash_xobjects(digest, resources, parents: frozenset = frozenset()) -> None:
+    """Feed every XObject in `resources` to `digest`, descending into Form XObjects."""
+    if resources is None:
+        return
+    xobjects = resources.get_object().get("/XObject")
+    if xobjects is None:
+        return
+    xobjects = xobjects.get_object()
+    for name in sorted(xobjects):
+        reference = xobjects[name]
+        xobject = reference.get_object()
+        digest.update(str(name).encode("utf-8"))
+        digest.update(xobject.get_data())
+        if xobject.get("/Subtype") == "/Form":
+            identity = getattr(reference, "idnum", None) or id(xobject)
+            if identity not in parents:  # a form that draws itself
+                _hash_xobjects(digest, xobject.get("/Resources"), parents | {identity})
+
+
+def page_content_hash(page, salt: str = "") -> str | None:
+    """Hash a pypdf page's content stream and image data without rendering it.
+
+    Returns None when the page cannot be read, so the caller skips the cache
+    rather than giving unrelated pages the same key.
+    """
+    digest = hashlib.sha256(salt.encode("utf-8"))
+    try:
+        contents = page.get_contents()
+        if contents is not None:
+            digest.update(contents.get_data())
+        _hash_xobjects(digest, page.get("/Resources"))
+    except Exception:
+        return None
+    return digest.hexdigest()
+
+
+def ocr_page_words(pdf_path: str, page_number: int, resolution: int, language: str) -> list[dict]:
+    """Render one page and return Tesseract words as converter word records.
+
+    Runs inside worker processes, so it opens the PDF itself and only
+    returns plain data. Coordinates are converted from pixels to points.
+    """
+    scale = 72 / resolution
+    with pdfplumber.open(pdf_path) as pdf:
+        image = pdf.pages[page_number - 1].to_image(resolution=resolution).original
+
+    data = pytesseract.image_to_data(image, lang=language, output_type=pytesseract.Output.DICT)
+    words: list[dict] = []
+    for index, text in enumerate(data["text"]):
+        text = (text or "").strip()
+        if not text or float(data["conf"][index]) < 0:
+            continue
+        left = data["left"][index] * scale
+        top = data["top"][index] * scale
+        height = data["height"][index] * scale
+        words.append(
+            {
+                "text": text,
+                "x0": left,
+                "x1": left + data["width"][index] * scale,
+                "top": top,
+                "bottom": top + height,
+                "size": round(height, 1),
+                "fontname": OCR_FONT_NAME,
+                "line_key": (data["block_num"][index], data["par_num"][index], data["line_num"][index]),
+            }
+        )
+    return words
+
+
+def words_to_text(words: list[dict]) -> str:
+    lines: dict[tuple, list[str]] = {}
+    for word in words:
+        lines.setdefault(tuple(word.get("line_key", (0, 0, 0))), []).append(word["text"])
+    return "\n".join(" ".join(parts) for parts in lines.values())
+
+
+class PdfOcr:
+    """OCR engine for pages that have no extractable text."""
+
+    def __init__(
+        self,
+        language: str = "eng",
+        resolution: int = DEFAULT_RESOLUTION,
+        workers: int | None = None,
+        cache_dir: Path | None = DEFAULT_CACHE_DIR,
+    ):
+        if not tesseract_available():
+            raise ValueError(
+                "OCR requires Tesseract and pytesseract. Install Tesseract, then run: pip install pytesseract"
+            )
+        self.language = language
+        self.resolution = resolution
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _cache_path(self, key: str | None) -> Path | None:
+        return self.cache_dir / f"{key}.json" if self.cache_dir and key else None
+
+    def _load_cached(self, key: str | None) -> list[dict] | None:
+        path = self._cache_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except Exception:
+            return None
+
+    def _store_cached(self, key: str | None, words: list[dict]) -> None:
+        path = self._cache_path(key)
+        if path is None:
+            return
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(words, handle)
+        os.replace(temp_path, path)
+
+    def page_words(self, pdf_path: Path, page_numbers: list[int]) -> dict[int, list[dict]]:
+        """OCR the given 1-based pages, serving repeats from the cache."""
+        if not page_numbers:
+            return {}
+
+        reader = PdfReader(str(pdf_path))
+        salt = f"{self.language}:{self.resolution}"
+        keys = {number: page_content_hash(reader.pages[number - 1], salt) for number in page_numbers}
+
+        results: dict[int, list[dict]] = {}
+        missing: list[int] = []
+        for number, key in keys.items():
+            cached = self._load_cached(key)
+            if cached is None:
+                missing.append(number)
+            else:
+                results[number] = cached
+
+        if len(missing) == 1 or self.workers == 1:
+            for number in missing:
+                results[number] = ocr_page_words(str(pdf_path), number, self.resolution, self.language)
+                self._store_cached(keys[number], results[number])
+        elif missing:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(missing))) as pool:
+                futures = {
+                    number: pool.submit(ocr_page_words, str(pdf_path), number, self.resolution, self.language)
+                    for number in missing
+                }
+                for number, future in futures.items():
+                    results[number] = future.result()
+                    self._store_cached(keys[number], results[number])
+
+        return results
+
+    def page_texts(self, pdf_path: Path, page_numbers: list[int]) -> dict[int, str]:
+        return {
+            number: words_to_text(words)
+            for number, words in self.page_words(pdf_path, page_numbers).items()
+        }
@@ -17,7 +17,14 @@ Features:
 
 import os
 import json
+import hashlib
+import shutil
+import time
+import multiprocessing
+from bisect import bisect_right
+from collections import deque
 from datetime import datetime
+from multiprocessing.connection import wait
 from pathlib import Path
 from io import BytesIO
 import re
@@ -29,10 +36,20 @@ except ImportError:
     raise
 
 try:
-    import fitz
+    import fitz  # optional: pip install pymupdf
 except ImportError:
     fitz = None
 
+try:
+    import fcntl  # POSIX
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt  # Windows
+except ImportError:
+    msvcrt = None
+
 try:
     from reportlab.pdfgen import canvas
     from reportlab.lib.utils import ImageReader
@@ -42,21 +59,300 @@ except ImportError:
 
 try:
     from pypdf import PdfReader, PdfWriter
+    from pypdf.generic import (ArrayObject, ContentStream, DictionaryObject, IndirectObject,
+                               NameObject, NumberObject, StreamObject)
 except ImportError:
     print("ERROR: pypdf not installed. Run: pip install pypdf")
     raise
 
 
+class PageSelection:
+    """
+    Page selection compiled once into sorted page intervals.
+
+    Accepts a keyword ('all', 'first', 'last', 'odd', 'even') or
+    comma-separated parts: '5', '1-5', open ranges like '10-' (to the end),
+    and negative indexes counted from the end ('-1' is the last page,
+    '-3--1' the last three). Malformed parts raise ValueError here rather
+    than while a file is being signed. Lookups bisect the intervals resolved
+    for a document's page count, so '1-100000' costs the same as '1'.
+    """
+
+    KEYWORDS = ('all', 'first', 'last', 'odd', 'even')
+    PART_RE = re.compile(r'^(-?\d+)(?:\s*(-)\s*(-?\d+)?)?$')
+
+    def __init__(self, spec):
+        self.spec = (spec or '').strip()
+        self.keyword = self.spec if self.spec in self.KEYWORDS else None
+        self._ranges = [] if self.keyword else self._compile(self.spec)
+        self._resolved = {}
+
+    def __bool__(self):
+        return bool(self.keyword or self._ranges)
+
+    @classmethod
+    def _compile(cls, spec):
+        ranges = []
+        for part in spec.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            match = cls.PART_RE.match(part)
+            if not match:
+                raise ValueError(f"Invalid page range '{part}'. Use forms like 5, 1-5, 10- or -3--1")
+
+            start = int(match.group(1))
+            if not match.group(2):
+                end = start
+            else:
+                end = int(match.group(3)) if match.group(3) is not None else None
+            if start == 0 or end == 0:
+                raise ValueError(f"Invalid page range '{part}'. Page numbers start at 1")
+            if end is not None and (start > 0) == (end > 0) and start > end:
+                raise ValueError(f"Invalid page range '{part}'. Start is after end")
+            ranges.append((start, end))
+        return ranges
+
+    def _intervals(self, total_pages):
+        """Resolve negative and open ranges for a page count, then merge them."""
+        cached = self._resolved.get(total_pages)
+        if cached is not None:
+            return cached
+
+        intervals = []
+        for start, end in self._ranges:
+            first = start if start > 0 else total_pages + start + 1
+            if end is None:
+                last = total_pages
+            else:
+                last = end if end > 0 else total_pages + end + 1
+            first, last = max(first, 1), min(last, total_pages)
+            if first <= last:
+                intervals.append((first, last))
+
+        merged = []
+        for first, last in sorted(intervals):
+            if merged and first <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+            else:
+                merged.append((first, last))
+
+        cached = ([first for first, _ in merged], [last for _, last in merged])
+        self._resolved[total_pages] = cached
+        return cached
+
+    def contains(self, page_num, total_pages):
+        if self.keyword == 'all':
+            return True
+        if self.keyword == 'first':
+            return page_num == 1
+        if self.keyword == 'last':
+            return page_num == total_pages
+        if self.keyword == 'odd':
+            return page_num % 2 == 1
+        if self.keyword == 'even':
+            return page_num % 2 == 0
+
+        starts, ends = self._intervals(total_pages)
+        index = bisect_right(starts, page_num) - 1
+        return index >= 0 and page_num <= ends[index]
+
+    def pages(self, total_pages):
+        """Yield the selected page numbers in order without testing every page."""
+        if self.keyword == 'all':
+            yield from range(1, total_pages + 1)
+        elif self.keyword == 'first':
+            yield from range(1, min(total_pages, 1) + 1)
+        elif self.keyword == 'last':
+            yield from range(total_pages, total_pages + 1) if total_pages else ()
+        elif self.keyword == 'odd':
+            yield from range(1, total_pages + 1, 2)
+        elif self.keyword == 'even':
+            yield from range(2, total_pages + 1, 2)
+        else:
+            for first, last in zip(*self._intervals(total_pages)):
+                yield from range(first, last + 1)
+
+
+AUDIT_LOG_NAME = 'signature_log.jsonl'
+# Whole-file JSON log written by older versions; its entries are moved into the audit log once
+LEGACY_LOG_NAME = 'signature_log.json'
+
+
+def file_sha256(path):
+    """Hex SHA-256 of a file, or None if it cannot be read"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def append_audit_entry(log_path, entry):
+    """
+    Append one JSON line to an audit log.
+
+    The file is locked for the write (flock on POSIX, msvcrt.locking on
+    Windows), so concurrent batch runs and worker processes can share a log
+    without interleaving lines or rewriting it.
+    """
+    _append_audit_lines(log_path, [entry])
+
+
+def _append_audit_lines(log_path, entries):
+    data = ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries).encode('utf-8')
+    os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+    fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            # Lock the first byte; O_APPEND still sends the write to the end
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        if fcntl is None and msvcrt is not None:
+            try:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            except OSError:
+                pass
+        os.close(fd)  # also releases the flock
+
+
+def migrate_legacy_log(output_directory):
+    """
+    Move the entries of an old signature_log.json into the audit log.
+
+    The legacy file is renamed to signature_log.json.migrated before it is
+    read, so only one run copies it even when several start at once.
+    Returns the number of entries moved.
+    """
+    legacy_path = os.path.join(output_directory, LEGACY_LOG_NAME)
+    migrated_path = legacy_path + '.migrated'
+    try:
+        os.rename(legacy_path, migrated_path)
+    except OSError:
+        return 0  # nothing to migrate, or another run already claimed it
+
+    try:
+        with open(migrated_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f).get('signed_files', [])
+    except (OSError, ValueError, AttributeError):
+        return 0  # unreadable; left in place as .migrated for manual review
+    if entries:
+        _append_audit_lines(os.path.join(output_directory, AUDIT_LOG_NAME), entries)
+    return len(entries)
+
+
+def query_audit_log(log_path, input_path=None, output_path=None, sha256=None,
+                    success=None, since=None):
+    """
+    Yield audit log entries matching every given filter.
+
+    Args:
+        log_path: Path to a signature_log.jsonl file
+        input_path: Only entries for this input PDF
+        output_path: Only entries that wrote this output PDF
+        sha256: Only entries whose input or output file has this hash
+        success: Only successful (True) or failed (False) entries
+        since: Only entries at or after this datetime or ISO timestamp
+    """
+    if not os.path.exists(log_path):
+        return
+    if isinstance(since, str):
+        since = datetime.fromisoformat(since)
+    input_path = os.path.abspath(input_path) if input_path else None
+    output_path = os.path.abspath(output_path) if output_path else None
+
+    with open(log_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # Torn line from an interrupted write
+            if input_path and entry.get('input_path') != input_path:
+                continue
+            if output_path and entry.get('output_path') != output_path:
+                continue
+            if sha256 and sha256 not in (entry.get('input_sha256'), entry.get('output_sha256')):
+                continue
+            if success is not None and entry.get('success') != success:
+                continue
+            if since and datetime.fromisoformat(entry['timestamp']) < since:
+                continue
+            yield entry
+
+
+# Parallel batches never start more workers than this unless asked to
+DEFAULT_BATCH_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+
+
+def _batch_worker_loop(signer, connection):
+    """Sign (index, input, output, log_path) tasks from the batch until it sends None."""
+    while True:
+        task = connection.recv()
+        if task is None:
+            return
+        index, input_pdf_path, output_pdf_path, log_path = task
+        try:
+            result = signer.add_signature_to_pdf(input_pdf_path, output_pdf_path)
+            if log_path:
+                signer.log_result(log_path, result)
+            connection.send((index, result, None))
+        except Exception as e:
+            connection.send((index, None, str(e)))
+
+
+# Batches are started from threads of the web server; a forked child could
+# inherit locks held by other threads, so workers always start from scratch
+_SPAWN = multiprocessing.get_context('spawn')
+
+
+class _BatchWorker:
+    """A signing process owned by one batch, so a stuck file can be terminated"""
+
+    def __init__(self, signer):
+        # The signer is pickled over once; its caches are rebuilt in the process
+        self.connection, child = _SPAWN.Pipe()
+        self.process = _SPAWN.Process(target=_batch_worker_loop, args=(signer, child), daemon=True)
+        self.process.start()
+        child.close()
+        self.task = None  # (job index, start time) while a file is in flight
+
+    def start(self, index, input_pdf_path, output_pdf_path, log_path):
+        self.connection.send((index, input_pdf_path, output_pdf_path, log_path))
+        self.task = (index, time.monotonic())
+
+    def stop(self, terminate=False):
+        if terminate or self.task is not None:
+            self.process.terminate()
+        else:
+            try:
+                self.connection.send(None)
+            except OSError:
+                pass
+        self.process.join()
+        self.connection.close()
+
+
 class PDFSignature:
     """Core signature placement engine"""
 
     VALID_POSITIONS = ['bottom-right', 'bottom-left', 'top-right', 'top-left']
     VALID_PAGE_OPTIONS = ['all', 'first', 'last', 'odd', 'even']
+    VALID_SAVE_MODES = ['full', 'incremental', 'compact']
     A4_PORTRAIT_WIDTH_POINTS = 595.2755905511812  # 210 mm at 72 PDF points/inch
 
     def __init__(self, signature_image_path, position='bottom-left',
                  scale=0.3, x_offset=0.5, y_offset=0.5, opacity=1.0,
-                 rotation=0, pages='all', skip_pages=''):
+                 rotation=0, pages='all', skip_pages='', save_mode='full',
+                 overlay_cache_dir=None):
         """
         Initialize PDF signature configuration.
 
@@ -68,8 +364,14 @@ class PDFSignature:
             y_offset: Vertical margin from edge in inches (0.1-2.0)
             opacity: Transparency level (0.1-1.0, where 1.0 is opaque)
             rotation: Rotation angle in degrees (0-360)
-            pages: Page selection - 'all', 'first', 'last', 'odd', 'even', or range like '1-5,10,15-20'
-            skip_pages: Pages to never sign even if selected, e.g. '3' or '1,5,10-12'
+            pages: Page selection - 'all', 'first', 'last', 'odd', 'even', or ranges like
+                '1-5,10,15-20', open ranges like '10-', and negative indexes like '-1'
+            skip_pages: Pages to never sign even if selected, e.g. '3', '1,5,10-12' or '-1'
+            save_mode: 'full' rewrites the document, 'incremental' appends the
+                stamp as an incremental update to a copy of the original, and
+                'compact' rewrites with unused objects removed and streams compressed
+            overlay_cache_dir: Optional directory where overlay PDFs are kept
+                between runs, keyed by the signature image, settings and page shapes
         """
         # Validate signature image
         if not os.path.exists(signature_image_path):
@@ -112,36 +414,34 @@ class PDFSignature:
             raise ValueError("Rotation must be between 0 and 360 degrees")
         self.rotation = rotation
 
-        # Validate and parse pages
+        # Compile page selection and skip pages once; bad ranges fail here
         self.pages = pages
-        self._validate_pages_format()
-
-        # Parse skip_pages into a set
-        self._skip_set = self._parse_page_range(skip_pages.strip()) if skip_pages and skip_pages.strip() else set()
-
-    def _validate_pages_format(self):
-        """Validate the pages parameter format"""
-        if self.pages in self.VALID_PAGE_OPTIONS:
-            return
-
-        # Check if it's a valid range format (e.g., "1-5,10,15-20")
-        if not re.match(r'^[\d\s,\-]+$', self.pages):
-            raise ValueError(f"Invalid pages format. Use 'all', 'first', 'last', 'odd', 'even', or ranges like '1-5,10,15-20'")
-
-    @staticmethod
-    def _parse_page_range(range_str):
-        """Parse a range string like '1,3,5-10' into a set of page numbers."""
-        pages = set()
-        for part in range_str.split(','):
-            part = part.strip()
-            if not part:
-                continue
-            if '-' in part:
-                start, end = part.split('-', 1)
-                pages.update(range(int(start), int(end) + 1))
-            else:
-                pages.add(int(part))
-        return pages
+        self.skip_pages = skip_pages
+        self._selection = PageSelection(pages)
+        if not self._selection:
+            raise ValueError("Invalid pages format. Use 'all', 'first', 'last', 'odd', 'even', "
+                             "or ranges like '1-5,10,15-20'")
+        self._skip = PageSelection(skip_pages)
+
+        # Validate save mode
+        if save_mode not in self.VALID_SAVE_MODES:
+            raise ValueError(f"Save mode must be one of: {self.VALID_SAVE_MODES}")
+        self.save_mode = save_mode
+
+        # Overlay PDFs keyed by the tuple of page geometries they cover
+        self._overlay_cache = {}
+        self._image_reader = None
+        self._processed_signature = None
+        self.overlay_cache_dir = overlay_cache_dir
+        self._overlay_fingerprint = None
+
+    def __getstate__(self):
+        # Batch workers receive the signer once; caches are rebuilt per process
+        state = self.__dict__.copy()
+        state['_overlay_cache'] = {}
+        state['_image_reader'] = None
+        state['_processed_signature'] = None
+        return state
 
     def _should_sign_page(self, page_num, total_pages):
         """
@@ -155,22 +455,15 @@ class PDFSignature:
             bool: True if page should be signed
         """
         # Skip pages are never signed regardless of other settings
-        if page_num in self._skip_set:
+        if self._skip.contains(page_num, total_pages):
             return False
+        return self._selection.contains(page_num, total_pages)
 
-
-        if self.pages == 'all':
-            return True
-        elif self.pages == 'first':
-            return page_num == 1
-        elif self.pages == 'last':
-            return page_num == total_pages
-        elif self.pages == 'odd':
-            return page_num % 2 == 1
-        elif self.pages == 'even':
-            return page_num % 2 == 0
-        else:
-            return page_num in self._parse_page_range(self.pages)
+    def _selected_pages(self, total_pages):
+        """Yield the 1-indexed pages to sign, in order."""
+        for page_num in self._selection.pages(total_pages):
+            if not self._skip.contains(page_num, total_pages):
+                yield page_num
 
     def _calculate_position(self, page_width, page_height, sig_width, sig_height):
         """
@@ -228,6 +521,70 @@ class PDFSignature:
 
         Returns:
             BytesIO: PDF overlay as bytes
+        """
+        geometry = (page_width, page_height, mediabox_left, mediabox_bottom, page_rotation)
+        return BytesIO(self._get_overlay_pdf((geometry,)))
+
+    def _get_overlay_pdf(self, geometries):
+        """
+        Return one overlay PDF with a page per distinct page geometry.
+
+        Each geometry is (page_width, page_height, mediabox_left,
+        mediabox_bottom, page_rotation). All pages are drawn on a single
+        canvas, so ReportLab embeds the signature image once and every
+        overlay page references that one image XObject. Results are memoized
+        on the signer, so repeat documents with the same page shapes skip
+        ReportLab entirely.
+        """
+        geometries = tuple(geometries)
+        cached = self._overlay_cache.get(geometries)
+        if cached is not None:
+            return cached
+
+        disk_path = self._overlay_cache_path(geometries)
+        if disk_path and os.path.exists(disk_path):
+            with open(disk_path, 'rb') as f:
+                self._overlay_cache[geometries] = f.read()
+            return self._overlay_cache[geometries]
+
+        if self._image_reader is None:
+            self._image_reader = ImageReader(self.signature_image)
+
+        packet = BytesIO()
+        c = canvas.Canvas(packet)
+        for geometry in geometries:
+            self._draw_signature_page(c, *geometry)
+            c.showPage()
+        c.save()
+
+        self._overlay_cache[geometries] = packet.getvalue()
+        if disk_path:
+            os.makedirs(self.overlay_cache_dir, exist_ok=True)
+            temp_path = f"{disk_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(self._overlay_cache[geometries])
+            os.replace(temp_path, disk_path)
+        return self._overlay_cache[geometries]
+
+    def _overlay_cache_path(self, geometries):
+        """Disk location of an overlay, or None when no cache directory is set"""
+        if not self.overlay_cache_dir:
+            return None
+        if self._overlay_fingerprint is None:
+            # Everything that changes the drawn overlay except page geometry
+            digest = hashlib.sha256(self.signature_image.convert('RGBA').tobytes())
+            digest.update(repr((self.signature_image.size, self.position, self.scale,
+                                self.x_offset, self.y_offset, self.opacity,
+                                self.rotation)).encode('utf-8'))
+            self._overlay_fingerprint = digest.hexdigest()
+        key = hashlib.sha256(f"{self._overlay_fingerprint}{geometries!r}".encode('utf-8'))
+        return os.path.join(self.overlay_cache_dir, f"{key.hexdigest()[:32]}.pdf")
+
+    def _draw_signature_page(self, c, page_width, page_height,
+                             mediabox_left=0, mediabox_bottom=0,
+                             page_rotation=0):
+        """
+        Draw the signature onto the current canvas page.
 
         Note on page_rotation:
             PDF /Rotate specifies clockwise rotation applied by the viewer.
@@ -239,8 +596,6 @@ class PDFSignature:
               180°:    translate(W, H),  rotate(180) → (W-vis_x, H-vis_y)
               270° CW: translate(0, H),  rotate(270) → (vis_y,   H-vis_x)
         """
-        packet = BytesIO()
-
         # Canvas must cover the full PDF coordinate space so the overlay
         # merges correctly even when the mediabox has a non-zero origin.
         canvas_width = mediabox_left + page_width
@@ -254,7 +609,7 @@ class PDFSignature:
             vis_width = page_width
             vis_height = page_height
 
-        c = canvas.Canvas(packet, pagesize=(canvas_width, canvas_height))
+        c.setPageSize((canvas_width, canvas_height))
 
         # Shift origin to the mediabox lower-left corner
         if mediabox_left != 0 or mediabox_bottom != 0:
@@ -295,23 +650,19 @@ class PDFSignature:
             c.translate(center_x, center_y)
             c.rotate(self.rotation)
             c.translate(-sig_width / 2, -sig_height / 2)
-            c.drawImage(ImageReader(self.signature_image),
+            c.drawImage(self._image_reader,
                        0, 0,
                        width=sig_width,
                        height=sig_height,
                        mask='auto')
             c.restoreState()
         else:
-            c.drawImage(ImageReader(self.signature_image),
+            c.drawImage(self._image_reader,
                        x, y,
                        width=sig_width,
                        height=sig_height,
                        mask='auto')
 
-        c.save()
-        packet.seek(0)
-        return packet
-
     @staticmethod
     def _match_overlay_boxes(overlay_page, target_page):
         """
@@ -334,11 +685,15 @@ class PDFSignature:
         page content can remain untouched and the signature behaves like a
         visual overlay instead of inline page content.
         """
-        image = self.signature_image.convert("RGBA").copy()
+        if self._processed_signature is not None:
+            return self._processed_signature
+
+        image = self.signature_image.convert("RGBA")
 
         if self.opacity < 1.0:
+            # A 256-entry lookup table runs in C instead of per-pixel Python
             alpha = image.getchannel("A")
-            alpha = alpha.point(lambda px: int(px * self.opacity))
+            alpha = alpha.point([int(px * self.opacity) for px in range(256)])
             image.putalpha(alpha)
 
         if self.rotation:
@@ -347,7 +702,8 @@ class PDFSignature:
 
         output = BytesIO()
         image.save(output, format="PNG")
-        return output.getvalue(), image.width, image.height
+        self._processed_signature = (output.getvalue(), image.width, image.height)
+        return self._processed_signature
 
     def _add_signature_to_pdf_with_pymupdf(self, input_pdf_path, output_pdf_path):
         """Stamp the signature as an overlay using PyMuPDF + ReportLab.
@@ -358,53 +714,255 @@ class PDFSignature:
         by the pypdf overlay path, so the configured corner, scale, and
         offsets remain exact regardless of page size or rotation.
         """
-        doc = fitz.open(input_pdf_path)
+        os.makedirs(os.path.dirname(os.path.abspath(output_pdf_path)), exist_ok=True)
+
+        # Incremental mode stamps a byte copy of the original and appends only
+        # the changed objects, so cost follows the pages touched, not file size.
+        incremental = self.save_mode == 'incremental'
+        if incremental:
+            if not (os.path.exists(output_pdf_path) and os.path.samefile(input_pdf_path, output_pdf_path)):
+                shutil.copyfile(input_pdf_path, output_pdf_path)
+            doc = fitz.open(output_pdf_path)
+            if not doc.can_save_incrementally():
+                # Damaged files are repaired on open and must be rewritten
+                doc.close()
+                doc = fitz.open(input_pdf_path)
+                incremental = False
+        else:
+            doc = fitz.open(input_pdf_path)
+
         try:
             total_pages = doc.page_count
-            pages_signed = 0
-
-            for page_index in range(total_pages):
-                page_num = page_index + 1
-                if not self._should_sign_page(page_num, total_pages):
-                    continue
-
-                page = doc.load_page(page_index)
-
-                # Build overlay in mediabox coordinates with an inverse-rotation
-                # transform baked in. show_pdf_page places the overlay into
-                # the mediabox; the viewer then applies the page's /Rotate to
-                # the merged content. Pre-applying the inverse rotation keeps
-                # the signature visually upright in the user's chosen corner
-                # regardless of page orientation (portrait vs landscape) or
-                # /Rotate value.
+
+            # First collect the distinct page geometries, then build a
+            # single overlay document with one page per geometry.
+            #
+            # The overlay is drawn in mediabox coordinates with an
+            # inverse-rotation transform baked in. show_pdf_page places the
+            # overlay into the mediabox; the viewer then applies the page's
+            # /Rotate to the merged content. Pre-applying the inverse rotation
+            # keeps the signature visually upright in the user's chosen
+            # corner regardless of page orientation or /Rotate value.
+            # show_pdf_page maps the overlay's full pagesize onto the target
+            # mediabox rect, so geometries use a 0-origin.
+            geometries = {}
+            placements = []
+            for page_num in self._selected_pages(total_pages):
+                page = doc.load_page(page_num - 1)
                 mb = page.mediabox
-                mb_width = float(mb.width)
-                mb_height = float(mb.height)
                 try:
                     page_rotation = int(page.rotation) % 360
                 except (AttributeError, TypeError):
                     page_rotation = 0
 
-                # show_pdf_page maps the overlay's full pagesize onto the
-                # target mediabox rect, so build the canvas at mediabox
-                # dimensions with a 0-origin (no mediabox offset baked in).
-                overlay_pdf = self._create_signature_overlay(
-                    mb_width, mb_height,
-                    0, 0,
-                    page_rotation,
-                )
+                geometry = (float(mb.width), float(mb.height), 0, 0, page_rotation)
+                overlay_index = geometries.setdefault(geometry, len(geometries))
+                placements.append((page, mb, overlay_index))
 
-                overlay_doc = fitz.open("pdf", overlay_pdf.read())
-                page.show_pdf_page(mb, overlay_doc, 0, overlay=True)
-                overlay_doc.close()
-                pages_signed += 1
-
-            os.makedirs(os.path.dirname(os.path.abspath(output_pdf_path)), exist_ok=True)
-            doc.save(output_pdf_path)
+            if placements:
+                # Every stamp comes from the same source document, so PyMuPDF
+                # grafts each overlay page (and the one image) only once and
+                # all signed pages reference the shared XObject.
+                overlay_doc = fitz.open("pdf", self._get_overlay_pdf(geometries))
+                try:
+                    for page, mb, overlay_index in placements:
+                        page.show_pdf_page(mb, overlay_doc, overlay_index, overlay=True)
+                finally:
+                    overlay_doc.close()
+            pages_signed = len(placements)
+
+            # MuPDF would otherwise derive a new /ID from the clock, so the
+            # same file signed twice, or by two workers, would hash differently
+            if incremental:
+                doc.saveIncr()
+            elif self.save_mode == 'compact':
+                doc.save(output_pdf_path, garbage=3, deflate=True, no_new_id=True)
+            else:
+                doc.save(output_pdf_path, no_new_id=True)
             return total_pages, pages_signed
         finally:
             doc.close()
 
+    def _add_signature_to_pdf_with_pypdf(self, input_pdf_path, output_pdf_path):
+        """Stamp the signature as an overlay using pypdf + ReportLab.
+
+        Only the selected pages are materialized and merged. In incremental
+        mode nothing else is parsed: the original bytes are copied and the
+        merged pages are appended as an update. Full and compact modes clone
+        the document, keeping outlines and metadata, and rewrite it.
+        """
+        reader = PdfReader(input_pdf_path)
+        total_pages = len(reader.pages)
+
+        incremental = self.save_mode == 'incremental' and not reader.is_encrypted
+        writer = None if incremental else PdfWriter(clone_from=reader)
+        pages = reader.pages if incremental else writer.pages
+
+        # Collect the distinct geometries of the selected pages
+        geometries = {}
+        placements = []
+        for page_num in self._selected_pages(total_pages):
+            page = pages[page_num - 1]
+
+            # Get page dimensions and position from mediabox
+            mediabox = page.mediabox
+            mediabox_left = float(mediabox.left)
+            mediabox_bottom = float(mediabox.bottom)
+            page_width = float(mediabox.right) - mediabox_left
+            page_height = float(mediabox.top) - mediabox_bottom
+
+            # Read page rotation so positions match what the user sees
+            try:
+                page_rotation = int(page.rotation) % 360
+            except (AttributeError, TypeError):
+                page_rotation = 0
+
+            geometry = (page_width, page_height, mediabox_left, mediabox_bottom, page_rotation)
+            placements.append((page, geometries.setdefault(geometry, len(geometries))))
+
+        if placements:
+            # One overlay reader for the whole file: pages sharing a geometry
+            # merge the same overlay page, and the output holds its image once.
+            overlay_reader = PdfReader(BytesIO(self._get_overlay_pdf(geometries)))
+            for page, overlay_index in placements:
+                overlay_page = overlay_reader.pages[overlay_index]
+                self._match_overlay_boxes(overlay_page, page)
+
+                # Merge as a true overlay without allowing page expansion.
+                page.merge_page(overlay_page, expand=False, over=True)
+                if self.save_mode == 'compact':
+                    page.compress_content_streams()
+
+        # Write output PDF
+        os.makedirs(os.path.dirname(os.path.abspath(output_pdf_path)), exist_ok=True)
+        if incremental:
+            self._write_page_update(reader, input_pdf_path, output_pdf_path,
+                                    [page for page, _ in placements])
+        else:
+            if self.save_mode == 'compact' and hasattr(writer, 'compress_identical_objects'):
+                writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+            with open(output_pdf_path, 'wb') as output_file:
+                writer.write(output_file)
+
+        return total_pages, len(placements)
+
+    @staticmethod
+    def _write_page_update(reader, input_pdf_path, output_pdf_path, pages):
+        """
+        Write the original file followed by an incremental update of `pages`.
+
+        The pages are reader pages modified in place by merge_page. Objects
+        they now pull in from the overlay, and merged content streams held
+        directly, get new object numbers; references into the original file
+        are written unchanged, so untouched pages are never parsed.
+        """
+        next_id = int(reader.trailer['/Size'])
+        objects = {}
+        copied = {}
+
+        def allocate(obj):
+            nonlocal next_id
+            ref = IndirectObject(next_id, 0, reader)
+            next_id += 1
+            objects[ref.idnum] = (0, obj)
+            return ref
+
+        def localize(obj, indirect=False):
+            if isinstance(obj, IndirectObject):
+                if obj.pdf is reader:
+                    return obj
+                key = (id(obj.pdf), obj.idnum, obj.generation)
+                if key not in copied:
+                    copied[key] = allocate(None)
+                    objects[copied[key].idnum] = (0, localize(obj.get_object(), indirect=True))
+                return copied[key]
+            if isinstance(obj, StreamObject) and not indirect:
+                # Streams must be indirect objects
+                if isinstance(obj, ContentStream):
+                    obj = obj.flate_encode()
+                ref = allocate(None)
+                objects[ref.idnum] = (0, localize(obj, indirect=True))
+                return ref
+            if isinstance(obj, DictionaryObject):
+                for key in list(obj.keys()):
+                    obj[NameObject(key)] = localize(obj.raw_get(key))
+            elif isinstance(obj, ArrayObject):
+                for index, value in enumerate(list(obj)):
+                    obj[index] = localize(value)
+            return obj
+
+        for page in pages:
+            ref = page.indirect_reference
+            objects[ref.idnum] = (ref.generation, localize(page, indirect=True))
+
+        # Signing a file onto itself appends the update in place; opening it
+        # for writing first would truncate the original before it is copied
+        same_file = os.path.exists(output_pdf_path) and os.path.samefile(input_pdf_path, output_pdf_path)
+        if not objects:
+            if not same_file:
+                shutil.copyfile(input_pdf_path, output_pdf_path)
+            return
+
+        with open(input_pdf_path, 'rb') as source:
+            source.seek(max(0, os.path.getsize(input_pdf_path) - 1024))
+            tail = source.read()
+        marker = tail.rfind(b'startxref')
+        if marker < 0:
+            raise ValueError("Cannot append an update: startxref not found")
+        previous_xref = int(tail[marker + len(b'startxref'):].split()[0])
+
+        def append_update(output):
+            if not tail.endswith(b'\n'):
+                output.write(b'\n')
+
+            offsets = {}
+            for idnum in sorted(objects):
+                generation, obj = objects[idnum]
+                offsets[idnum] = output.tell()
+                output.write(f"{idnum} {generation} obj\n".encode())
+                obj.write_to_stream(output)
+                output.write(b"\nendobj\n")
+
+            # Cross-reference subsections cover runs of consecutive ids;
+            # the object 0 entry keeps readers from re-indexing the table
+            xref_position = output.tell()
+            output.write(b"xref\n0 1\n0000000000 65535 f\r\n")
+            ids = sorted(offsets)
+            start = 0
+            while start < len(ids):
+                end = start
+                while end + 1 < len(ids) and ids[end + 1] == ids[end] + 1:
+                    end += 1
+                output.write(f"{ids[start]} {end - start + 1}\n".encode())
+                for idnum in ids[start:end + 1]:
+                    output.write(f"{offsets[idnum]:010d} {objects[idnum][0]:05d} n\r\n".encode())
+                start = end + 1
+
+            trailer = DictionaryObject()
+            trailer[NameObject('/Size')] = NumberObject(next_id)
+            trailer[NameObject('/Prev')] = NumberObject(previous_xref)
+            for key in ('/Root', '/Info', '/ID'):
+                if key in reader.trailer:
+                    trailer[NameObject(key)] = reader.trailer.raw_get(key)
+            output.write(b"trailer\n")
+            trailer.write_to_stream(output)
+            output.write(f"\nstartxref\n{xref_position}\n%%EOF\n".encode())
+
+        if same_file:
+            with open(output_pdf_path, 'ab') as output:
+                append_update(output)
+            return
+
+        temp_path = f"{output_pdf_path}.{os.getpid()}.tmp"
+        try:
+            with open(input_pdf_path, 'rb') as source, open(temp_path, 'wb') as output:
+                shutil.copyfileobj(source, output)
+                append_update(output)
+            os.replace(temp_path, output_pdf_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
     def add_signature_to_pdf(self, input_pdf_path, output_pdf_path=None):
         """
         Sign a single PDF with page filtering.
@@ -446,53 +1004,10 @@ class PDFSignature:
                 result['success'] = True
                 return result
 
-            # Read input PDF
-            reader = PdfReader(input_pdf_path)
-            writer = PdfWriter()
-
-            total_pages = len(reader.pages)
+            total_pages, pages_signed = self._add_signature_to_pdf_with_pypdf(
+                input_pdf_path, output_pdf_path
+            )
             result['total_pages'] = total_pages
-            pages_signed = 0
-
-            # Process each page
-            for page_num, page in enumerate(reader.pages, start=1):
-                # Check if this page should be signed
-                if self._should_sign_page(page_num, total_pages):
-                    # Get page dimensions and position from mediabox
-                    mediabox = page.mediabox
-                    mediabox_left = float(mediabox.left)
-                    mediabox_bottom = float(mediabox.bottom)
-                    page_width = float(mediabox.right) - mediabox_left
-                    page_height = float(mediabox.top) - mediabox_bottom
-
-                    # Read page rotation so positions match what the user sees
-                    try:
-                        page_rotation = int(page.rotation) % 360
-                    except (AttributeError, TypeError):
-                        page_rotation = 0
-
-                    # Create signature overlay
-                    overlay_pdf = self._create_signature_overlay(
-                        page_width, page_height,
-                        mediabox_left, mediabox_bottom,
-                        page_rotation
-                    )
-                    overlay_reader = PdfReader(overlay_pdf)
-                    overlay_page = overlay_reader.pages[0]
-                    self._match_overlay_boxes(overlay_page, page)
-
-                    # Merge as a true overlay without allowing page expansion.
-                    page.merge_page(overlay_page, expand=False, over=True)
-                    pages_signed += 1
-
-                # Add page to output (signed or unsigned)
-                writer.add_page(page)
-
-            # Write output PDF
-            os.makedirs(os.path.dirname(os.path.abspath(output_pdf_path)), exist_ok=True)
-            with open(output_pdf_path, 'wb') as output_file:
-                writer.write(output_file)
-
             result['pages_signed'] = pages_signed
             result['success'] = True
 
@@ -501,13 +1016,17 @@ class PDFSignature:
 
         return result
 
-    def batch_sign_pdfs(self, pdf_directory, output_directory=None):
+    def batch_sign_pdfs(self, pdf_directory, output_directory=None,
+                        workers=1, timeout=None, progress_callback=None):
         """
         Sign all PDFs in a directory.
 
         Args:
             pdf_directory: Directory containing PDFs to sign
             output_directory: Output directory (defaults to pdf_directory/signed/)
+            workers: Number of worker processes (1 signs in this process)
+            timeout: Seconds allowed per file before it is reported as failed
+            progress_callback: Called as (completed, total, result) after each file
 
         Returns:
             dict: Batch processing results
@@ -521,84 +1040,174 @@ class PDFSignature:
             output_directory = os.path.join(pdf_directory, 'signed')
 
         os.makedirs(output_directory, exist_ok=True)
+        output_root = os.path.abspath(output_directory)
 
-        # Find all PDFs
+        # Find all PDFs, skipping earlier output nested inside the input
         pdf_files = []
         for root, dirs, files in os.walk(pdf_directory):
+            if os.path.abspath(root) == output_root:
+                dirs[:] = []
+                continue
             for file in files:
                 if file.lower().endswith('.pdf'):
                     pdf_files.append(os.path.join(root, file))
+        pdf_files.sort()
 
-        # Process each PDF
+        # Output paths maintain the relative structure
+        jobs = [
+            (pdf_path, os.path.join(output_directory, os.path.relpath(pdf_path, pdf_directory)))
+            for pdf_path in pdf_files
+        ]
+        # Every file is logged as it finishes, by whichever process signed it
+        log_path = os.path.join(output_directory, AUDIT_LOG_NAME)
+        migrate_legacy_log(output_directory)
+        file_results = self.sign_files(jobs, workers=workers, timeout=timeout,
+                                       progress_callback=progress_callback, log_path=log_path)
+
+        successful = sum(1 for result in file_results if result['success'])
         results = {
             'total_pdfs': len(pdf_files),
-            'successful': 0,
-            'failed': 0,
-            'files': [],
-            'log_path': None
+            'successful': successful,
+            'failed': len(file_results) - successful,
+            'files': file_results,
+            'log_path': log_path
         }
 
-        for pdf_path in pdf_files:
-            # Determine output path (maintain relative structure)
-            rel_path = os.path.relpath(pdf_path, pdf_directory)
-            output_path = os.path.join(output_directory, rel_path)
-
-            # Process PDF
-            result = self.add_signature_to_pdf(pdf_path, output_path)
+        return results
 
-            # Track results
-            if result['success']:
-                results['successful'] += 1
-            else:
-                results['failed'] += 1
+    def sign_files(self, jobs, workers=1, timeout=None, progress_callback=None, log_path=None):
+        """
+        Sign (input_path, output_path) pairs, optionally across worker processes.
 
-            results['files'].append(result)
+        Results come back in the order of `jobs` whatever order files finish
+        in. A file that runs past `timeout` seconds, or whose worker dies, is
+        reported as failed and only that worker is replaced. A timeout
+        always uses a worker process so it can be enforced.
+        With `log_path`, every file is appended to that audit log.
 
-        # Write log file
-        log_path = os.path.join(output_directory, 'signature_log.json')
-        self._write_log(results['files'], log_path)
-        results['log_path'] = log_path
+        Returns:
+            list: One add_signature_to_pdf result dict per job
+        """
+        jobs = list(jobs)
+        results = [None] * len(jobs)
+        completed = 0
+
+        def finish(index, result):
+            nonlocal completed
+            results[index] = result
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, len(jobs), result)
+
+        workers = max(1, int(workers or 1))
+        if (workers == 1 and not timeout) or not jobs:
+            for index, (input_path, output_path) in enumerate(jobs):
+                result = self.add_signature_to_pdf(input_path, output_path)
+                if log_path:
+                    self.log_result(log_path, result)
+                finish(index, result)
+        else:
+            self._sign_parallel(jobs, workers, timeout, finish, log_path)
 
         return results
 
-    def _write_log(self, file_results, log_path):
-        """Write processing log to JSON file"""
-        log_data = {
-            'signed_files': []
+    def _sign_parallel(self, jobs, workers, timeout, finish, log_path=None):
+        queue = deque(range(len(jobs)))
+        pool = [_BatchWorker(self) for _ in range(min(workers, len(queue)))]
+
+        def fail(worker, error):
+            index, _ = worker.task
+            worker.task = None
+            result = self._failed_result(*jobs[index], error)
+            if log_path:
+                self.log_result(log_path, result)
+            finish(index, result)
+
+        try:
+            while True:
+                # Keep one file per worker in flight so start times are real
+                for worker in pool:
+                    if worker.task is None and queue:
+                        index = queue.popleft()
+                        worker.start(index, *jobs[index], log_path)
+                busy = [worker for worker in pool if worker.task is not None]
+                if not busy:
+                    break
+
+                wait_for = None
+                if timeout:
+                    oldest = min(worker.task[1] for worker in busy)
+                    wait_for = max(0.0, oldest + timeout - time.monotonic())
+                wait([worker.connection for worker in busy] + [worker.process.sentinel for worker in busy],
+                     timeout=wait_for)
+
+                now = time.monotonic()
+                for worker in list(pool):
+                    if worker.task is None:
+                        continue
+                    try:
+                        message = worker.connection.recv() if worker.connection.poll() else None
+                    except (EOFError, OSError):
+                        message = None
+                    if message is not None:
+                        index, result, error = message
+                        if error is not None:
+                            fail(worker, error)
+                        else:
+                            worker.task = None
+                            finish(index, result)
+                        continue
+
+                    if not worker.process.is_alive():
+                        fail(worker, f"Worker process died with exit code {worker.process.exitcode}")
+                    elif timeout and now - worker.task[1] >= timeout:
+                        fail(worker, f"Timed out after {timeout:g} seconds")
+                    else:
+                        continue
+                    # A stuck or dead worker cannot take more files: replace it
+                    worker.stop(terminate=True)
+                    pool.remove(worker)
+                    if queue:
+                        pool.append(_BatchWorker(self))
+        finally:
+            for worker in pool:
+                worker.stop()
+
+    @staticmethod
+    def _failed_result(input_pdf_path, output_pdf_path, error):
+        return {
+            'input_path': input_pdf_path,
+            'output_path': output_pdf_path,
+            'success': False,
+            'total_pages': 0,
+            'pages_signed': 0,
+            'error': error
         }
 
-        # Load existing log if it exists
-        if os.path.exists(log_path):
-            try:
-                with open(log_path, 'r', encoding='utf-8') as f:
-                    log_data = json.load(f)
-            except:
-                pass  # Start fresh if log is corrupted
-
-        # Add new entries
-        for result in file_results:
-            if result['success']:
-                log_entry = {
-                    'timestamp': datetime.now().isoformat(),
-                    'input_path': result['input_path'],
-                    'output_path': result['output_path'],
-                    'signature': self.signature_path,
-                    'pages_filter': self.pages,
-                    'position': self.position,
-                    'scale': self.scale,
-                    'x_offset': self.x_offset / 72,  # Convert back to inches
-                    'y_offset': self.y_offset / 72,
-                    'opacity': self.opacity,
-                    'rotation': self.rotation,
-                    'total_pages': result['total_pages'],
-                    'pages_signed': result['pages_signed'],
-                    'success': True
-                }
-                log_data['signed_files'].append(log_entry)
-
-        # Write log
-        with open(log_path, 'w', encoding='utf-8') as f:
-            json.dump(log_data, f, indent=2)
+    def log_result(self, log_path, result):
+        """Append an add_signature_to_pdf result, with file hashes, to an audit log"""
+        success = result['success']
+        append_audit_entry(log_path, {
+            'timestamp': datetime.now().isoformat(),
+            'input_path': os.path.abspath(result['input_path']),
+            'output_path': os.path.abspath(result['output_path']) if result['output_path'] else None,
+            'input_sha256': file_sha256(result['input_path']),
+            'output_sha256': file_sha256(result['output_path']) if success else None,
+            'signature': self.signature_path,
+            'pages_filter': self.pages,
+            'skip_pages': self.skip_pages,
+            'position': self.position,
+            'scale': self.scale,
+            'x_offset': self.x_offset / 72,  # Convert back to inches
+            'y_offset': self.y_offset / 72,
+            'opacity': self.opacity,
+            'rotation': self.rotation,
+            'save_mode': self.save_mode,
+            'total_pages': result['total_pages'],
+            'pages_signed': result['pages_signed'],
+            'success': success,
+            'error': result['error']
+        })
 
 
 def main():
@@ -631,6 +1240,7 @@ def main():
             self.input_path = tk.StringVar()
             self.output_path = tk.StringVar()
             self.batch_mode  = tk.BooleanVar(value=False)
+            self.workers     = tk.IntVar(value=DEFAULT_BATCH_WORKERS)
             self.pages_var   = tk.StringVar(value='all')
             self.range_var   = tk.StringVar(value='1')
             self.skip_var  = tk.StringVar(value='')
@@ -664,6 +1274,9 @@ def main():
                             variable=self.batch_mode,
                             command=self._on_batch_toggle
                             ).grid(row=3, column=0, columnspan=3, sticky='w', pady=2)
+            ttk.Label(f_files, text='Batch workers:').grid(row=4, column=0, sticky='w', pady=2)
+            ttk.Spinbox(f_files, from_=1, to=os.cpu_count() or 1, width=4,
+                        textvariable=self.workers).grid(row=4, column=1, sticky='w', padx=4)
 
             # ── Config ───────────────────────────────────────────
             f_cfg = ttk.LabelFrame(self.root, text=' Configuration ', padding=6)
@@ -922,7 +1535,24 @@ def main():
                     )
                     if self.batch_mode.get():
                         self._log_write(f'Batch signing: {inp} → {out}')
-                        res = signer.batch_sign_pdfs(inp, out)
+                        started = time.monotonic()
+                        last_report = [0.0]
+
+                        def progress(done, total, result):
+                            elapsed = time.monotonic() - started
+                            if done < total and elapsed - last_report[0] < 1.0:
+                                return
+                            last_report[0] = elapsed
+                            rate = done / elapsed if elapsed else 0.0
+                            self.root.after(0, self._log_write,
+                                            f'  {done}/{total} files  ({rate:.1f} files/s)')
+
+                        try:
+                            workers = max(1, min(int(self.workers.get()), os.cpu_count() or 1))
+                        except (tk.TclError, ValueError):
+                            workers = DEFAULT_BATCH_WORKERS
+                        res = signer.batch_sign_pdfs(inp, out, workers=workers,
+                                                     progress_callback=progress)
                         self._log_write(
                             f'Done — {res["successful"]} signed, '
                             f'{res["failed"]} failed  |  log: {res["log_path"]}')
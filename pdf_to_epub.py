@@ -10,20 +10,71 @@ whole-directory processing with both CLI and tkinter GUI entry points.
 from __future__ import annotations
 
 import argparse
+import bisect
+import heapq
+import mmap
 import re
 import statistics
 import sys
-import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import accumulate
 from dataclasses import dataclass
 from pathlib import Path
-from queue import Empty, Queue
 
 import pdfplumber
 from pypdf import PdfReader
 
-
+from conversion_engine import (
+    OUTPUT_FORMATS,
+    ConversionScheduler,
+    add_batch_arguments,
+    clean_text,
+    escape_cell,
+    progress_printer,
+    render_table,
+)
+from conversion_engine import launch_gui as launch_converter_gui
+from pdf_ocr import PdfOcr
+from rag_chunks import (
+    DEFAULT_CHUNK_OVERLAP,
+    DEFAULT_CHUNK_TOKENS,
+    ChunkUnit,
+    chunk_units,
+    write_chunks_jsonl,
+)
+
+try:
+    import fitz  # optional: pip install pymupdf
+except ImportError:
+    fitz = None
+
+
+MONOSPACE_TOKENS = ("courier", "mono", "consolas", "menlo")
+ITALIC_TOKENS = ("italic", "oblique")
 LIST_RE = re.compile(r"^(?P<marker>(?:[-*\u2022o])|(?:\d+[.)]))\s+(?P<text>.+)$")
+LIST_MARKER_RE = re.compile(r"^(?:[-*\u2022o]|\d+[.)])$")
 ROMAN_RE = re.compile(r"^(?=[ivxlcdmIVXLCDM]+$)[IVXLCDMivxlcdm]{1,8}$")
+# Page-number-like tokens: "Page 14", "14 of 200", "14/200", or a number set off
+# at either end of the line by a separator or a wide gap ("Intro | 14", "14   Intro")
+PAGE_NUMBER_RE = re.compile(
+    r"\b(?:page|pg\.?|p\.)\s*\d+(?:\s*(?:of|/)\s*\d+)?\b"
+    r"|\b\d+\s*(?:of|/)\s*\d+\b"
+    r"|^\s*[-\u2013\u2014]?\s*\d+\s*[-\u2013\u2014]?\s*$"
+    r"|^\s*\d+(?=\s*[|\u2022\u00b7\u2013\u2014-]|\s{2,})"
+    r"|(?<=[|\u2022\u00b7\u2013\u2014-]\s)\s*\d+\s*$|(?<=\s{2})\d+\s*$",
+    re.IGNORECASE,
+)
+EDGE_LINES_PER_PAGE = 2
+EDGE_BAND_HEIGHT = 12.0
+COLUMN_BIN_WIDTH = 2.0
+MIN_GUTTER_WIDTH = 12.0
+MIN_COLUMN_ROWS = 4
+MIN_COLUMN_WIDTH = 72.0  # narrower "columns" are list markers or labels in a hanging indent
+MIN_TABLE_RULES = 2
+MIN_GRID_EDGES = 3  # distinct rows and columns of box edges before boxes count as cells
+PAGE_BOX_RATIO = 0.9  # boxes covering this much of the page are backgrounds or frames
 
 
 @dataclass
@@ -36,6 +87,35 @@ class PdfLine:
     page_number: int
     bold: bool
     monospace: bool
+    font_id: int = 0
+
+
+@dataclass
+class FontProfile:
+    name: str
+    family: str
+    bold: bool
+    italic: bool
+    monospace: bool
+
+
+class FontTable:
+    """Per-document font classification, computed once per distinct fontname."""
+
+    def __init__(self):
+        self.profiles: list[FontProfile] = []
+        self._ids: dict[str, int] = {}
+
+    def font_id(self, fontname: str) -> int:
+        font_id = self._ids.get(fontname)
+        if font_id is None:
+            font_id = len(self.profiles)
+            self.profiles.append(classify_font(fontname))
+            self._ids[fontname] = font_id
+        return font_id
+
+    def __getitem__(self, font_id: int) -> FontProfile:
+        return self.profiles[font_id]
 
 
 @dataclass
@@ -44,16 +124,29 @@ class MarkdownBlock:
     text: str = ""
     level: int = 0
     ordered: bool = False
+    rows: list[list[str]] | None = None
+    page_number: int = 0
 
 
 @dataclass
-class ConversionIssue:
-    source: Path
-    error: str
-
-
-def clean_text(value: str) -> str:
-    return " ".join((value or "").replace("\u00a0", " ").split())
+class PdfTable:
+    page_number: int
+    top: float
+    rows: list[list[str]]
+
+
+def classify_font(fontname: str) -> FontProfile:
+    lowered = fontname.lower()
+    # Embedded subsets are prefixed with a tag like "ABCDEF+".
+    base = fontname.split("+", 1)[-1]
+    family = re.split(r"[-,]", base, maxsplit=1)[0].strip() or base
+    return FontProfile(
+        name=fontname,
+        family=family,
+        bold="bold" in lowered,
+        italic=any(token in lowered for token in ITALIC_TOKENS),
+        monospace=any(token in lowered for token in MONOSPACE_TOKENS),
+    )
 
 
 def metadata_title(reader: PdfReader) -> str:
@@ -64,6 +157,45 @@ def metadata_title(reader: PdfReader) -> str:
     return clean_text(raw_title)
 
 
+@contextmanager
+def open_pdf_buffer(pdf_path: Path):
+    """Map a PDF into memory once so every parser reads the same bytes."""
+    with open(pdf_path, "rb") as handle:
+        try:
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files and some network filesystems cannot be mapped.
+            yield handle
+            return
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+
+def document_title(pdf, buffer=None) -> str:
+    """Read the title from the already-open pdfplumber document.
+
+    pdfminer leaves undecodable strings as raw bytes; only then is pypdf
+    consulted, reading from the shared buffer instead of reopening the file.
+    """
+    try:
+        raw_title = (pdf.metadata or {}).get("Title", "")
+    except Exception:
+        raw_title = ""
+
+    if isinstance(raw_title, bytes):
+        if buffer is None:
+            return ""
+        try:
+            buffer.seek(0)
+            return metadata_title(PdfReader(buffer))
+        except Exception:
+            return ""
+
+    return clean_text(str(raw_title or ""))
+
+
 def looks_like_heading(line: PdfLine, body_size: float) -> bool:
     text = line.text
     if not text or len(text) > 100:
@@ -91,16 +223,90 @@ def join_text(parts: list[str], next_text: str) -> None:
         parts[-1] = previous + " " + next_text
 
 
-def group_words_into_lines(page, page_number: int) -> list[PdfLine]:
+def group_words_into_lines(
+    page,
+    page_number: int,
+    fonts: FontTable | None = None,
+    exclude: list[tuple[float, float, float, float]] | None = None,
+) -> list[PdfLine]:
     words = page.extract_words(
         x_tolerance=2,
         y_tolerance=3,
         use_text_flow=True,
         extra_attrs=["size", "fontname"],
     )
-    if not words:
-        return []
-
+    if exclude:
+        words = [word for word in words if not inside_any(word, exclude)]
+    return words_to_lines(words, page_number, fonts)
+
+
+def inside_any(word: dict, boxes: list[tuple[float, float, float, float]]) -> bool:
+    x = (word["x0"] + word["x1"]) / 2
+    y = (word["top"] + word["bottom"]) / 2
+    return any(x0 <= x <= x1 and top <= y <= bottom for x0, top, x1, bottom in boxes)
+
+
+class TableStage:
+    """Optional table detection that only runs on pages with ruling lines.
+
+    Counting horizontal and vertical rules from the page's line and rect
+    objects is cheap, so `find_tables` is skipped on ordinary text pages.
+    Filled or bordered boxes only count when their edges line up in at least
+    MIN_GRID_EDGES rows and columns, so a lone box, a page background or a
+    frame around the text does not look like a table.
+    Time spent per page is kept in `timings` (seconds, keyed by page number).
+    """
+
+    def __init__(self, min_rules: int = MIN_TABLE_RULES):
+        self.min_rules = min_rules
+        self.tables: list[PdfTable] = []
+        self.timings: dict[int, float] = {}
+
+    def page_has_grid(self, page) -> bool:
+        horizontal = vertical = 0
+        for line in page.lines:
+            if abs(line["top"] - line["bottom"]) < 1:
+                horizontal += 1
+            elif abs(line["x0"] - line["x1"]) < 1:
+                vertical += 1
+        edge_rows: set[int] = set()
+        edge_columns: set[int] = set()
+        for rect in page.rects:
+            if rect["height"] < 2:
+                horizontal += 1
+            elif rect["width"] < 2:
+                vertical += 1
+            elif rect["width"] < page.width * PAGE_BOX_RATIO or rect["height"] < page.height * PAGE_BOX_RATIO:
+                edge_rows.update((round(rect["top"]), round(rect["bottom"])))
+                edge_columns.update((round(rect["x0"]), round(rect["x1"])))
+        if len(edge_rows) >= MIN_GRID_EDGES and len(edge_columns) >= MIN_GRID_EDGES:
+            horizontal += len(edge_rows)
+            vertical += len(edge_columns)
+        return horizontal >= self.min_rules and vertical >= self.min_rules
+
+    def process(self, page, page_number: int) -> list[tuple[float, float, float, float]]:
+        """Detect tables on one page and return their bounding boxes."""
+        started = time.perf_counter()
+        boxes: list[tuple[float, float, float, float]] = []
+        try:
+            if not self.page_has_grid(page):
+                return boxes
+            for table in page.find_tables():
+                rows = [
+                    [escape_cell(cell) for cell in row]
+                    for row in table.extract()
+                    if any(clean_text(str(cell or "")) for cell in row)
+                ]
+                if not rows:
+                    continue
+                boxes.append(tuple(table.bbox))
+                self.tables.append(PdfTable(page_number=page_number, top=table.bbox[1], rows=rows))
+            return boxes
+        finally:
+            self.timings[page_number] = time.perf_counter() - started
+
+
+def group_rows(words: list[dict]) -> list[list[dict]]:
     words = sorted(words, key=lambda word: (round(word["top"], 1), word["x0"]))
     grouped: list[list[dict]] = []
 
@@ -117,14 +323,147 @@ def group_words_into_lines(page, page_number: int) -> list[PdfLine]:
         else:
             grouped.append([word])
 
+    return grouped
+
+
+def is_text_column(words: list[dict], start: float, end: float) -> bool:
+    """Whether the words centred between `start` and `end` read as a column of text."""
+    column = [word for word in words if start <= (word["x0"] + word["x1"]) / 2 < end]
+    if not column:
+        return False
+    if max(word["x1"] for word in column) - min(word["x0"] for word in column) < MIN_COLUMN_WIDTH:
+        return False
+    return not all(LIST_MARKER_RE.match(word["text"]) for word in column)
+
+
+def find_column_gutters(words: list[dict]) -> list[float]:
+    """Return x positions of vertical gutters separating text columns.
+
+    Word extents are accumulated into an x-coverage histogram with a
+    difference array, so the cost is one pass over words plus one over bins.
+    A gutter is an interior run of near-empty bins at least MIN_GUTTER_WIDTH
+    wide with a real column on each side: MIN_COLUMN_ROWS deep, at least
+    MIN_COLUMN_WIDTH wide and not made only of list markers, so the gap
+    after the markers of a hanging-indent list is not taken for a gutter.
+    """
+    if len(words) < MIN_COLUMN_ROWS * 2:
+        return []
+
+    left = min(word["x0"] for word in words)
+    right = max(word["x1"] for word in words)
+    bin_count = int((right - left) / COLUMN_BIN_WIDTH) + 1
+    if bin_count * COLUMN_BIN_WIDTH < MIN_GUTTER_WIDTH * 3:
+        return []
+
+    diff = [0] * (bin_count + 1)
+    for word in words:
+        diff[int((word["x0"] - left) / COLUMN_BIN_WIDTH)] += 1
+        diff[int((word["x1"] - left) / COLUMN_BIN_WIDTH) + 1] -= 1
+    coverage = list(accumulate(diff[:bin_count]))
+
+    # Headings that span the gutter add a little coverage; tolerate it.
+    tolerance = max(2, max(coverage) // 10)
+    min_bins = int(MIN_GUTTER_WIDTH / COLUMN_BIN_WIDTH)
+    gutters: list[float] = []
+    column_start = 0
+    column_left = left
+    index = 0
+    while index < bin_count:
+        if coverage[index] > tolerance:
+            index += 1
+            continue
+
+        run_start = index
+        while index < bin_count and coverage[index] <= tolerance:
+            index += 1
+        if run_start == 0 or index == bin_count or index - run_start < min_bins:
+            continue
+        if max(coverage[column_start:run_start]) < MIN_COLUMN_ROWS:
+            continue
+        next_gutter = index
+        while next_gutter < bin_count and coverage[next_gutter] > tolerance:
+            next_gutter += 1
+        if max(coverage[index:next_gutter]) < MIN_COLUMN_ROWS:
+            continue
+
+        cut = left + (run_start + index) / 2 * COLUMN_BIN_WIDTH
+        if not is_text_column(words, column_left, cut) or not is_text_column(
+            words, cut, left + next_gutter * COLUMN_BIN_WIDTH
+        ):
+            continue
+        gutters.append(cut)
+        column_start = index
+        column_left = cut
+
+    return gutters
+
+
+def split_columns(words: list[dict], row_tolerance: float = 3.0) -> list[list[dict]]:
+    """Order a page's words column by column, keeping full-width rows in place.
+
+    Rows with a word crossing a gutter (titles, figure captions) split the
+    page into regions; inside each region the columns are emitted left to
+    right. Single-column pages come back as one segment.
+    """
+    gutters = find_column_gutters(words)
+    if not gutters:
+        return [words]
+
+    crossing_tops = sorted(
+        word["top"] for word in words if any(word["x0"] < cut < word["x1"] for cut in gutters)
+    )
+    row_starts: list[float] = []
+    row_ends: list[float] = []
+    for top in crossing_tops:
+        if row_ends and top - row_ends[-1] <= row_tolerance:
+            row_ends[-1] = top
+        else:
+            row_starts.append(top)
+            row_ends.append(top)
+
+    column_segments: dict[tuple[int, int], list[dict]] = defaultdict(list)
+    spanning_rows: dict[int, list[dict]] = defaultdict(list)
+    for word in words:
+        row = bisect.bisect_right(row_starts, word["top"] + row_tolerance) - 1
+        if row >= 0 and word["top"] <= row_ends[row] + row_tolerance:
+            spanning_rows[row].append(word)
+            continue
+        region = bisect.bisect_right(row_ends, word["top"])
+        column = bisect.bisect_right(gutters, (word["x0"] + word["x1"]) / 2)
+        column_segments[(region, column)].append(word)
+
+    segments: list[list[dict]] = []
+    for region in range(len(row_starts) + 1):
+        for column in range(len(gutters) + 1):
+            if (region, column) in column_segments:
+                segments.append(column_segments[(region, column)])
+        if region in spanning_rows:
+            segments.append(spanning_rows[region])
+    return segments
+
+
+def words_to_lines(words: list[dict], page_number: int, fonts: FontTable | None = None) -> list[PdfLine]:
+    """Group word records (text, x0, top, bottom, size, fontname) into lines."""
+    if not words:
+        return []
+
+    fonts = fonts if fonts is not None else FontTable()
+    for word in words:
+        word["font_id"] = fonts.font_id(str(word.get("fontname", "")))
+
+    grouped: list[list[dict]] = []
+    for segment in split_columns(words):
+        grouped.extend(group_rows(segment))
+
     lines: list[PdfLine] = []
     for group in grouped:
-        text = clean_text(" ".join(item["text"] for item in sorted(group, key=lambda value: value["x0"])))
+        ordered = sorted(group, key=lambda value: value["x0"])
+        text = clean_text(" ".join(item["text"] for item in ordered))
         if not text:
             continue
 
         sizes = [float(item.get("size", 10)) for item in group]
-        fonts = [str(item.get("fontname", "")) for item in group]
+        profiles = [fonts[item["font_id"]] for item in group]
         line = PdfLine(
             text=text,
             size=max(sizes) if sizes else 10.0,
@@ -132,22 +471,149 @@ def group_words_into_lines(page, page_number: int) -> list[PdfLine]:
             top=min(item["top"] for item in group),
             bottom=max(item["bottom"] for item in group),
             page_number=page_number,
-            bold=any("bold" in font.lower() for font in fonts),
-            monospace=all(
-                any(token in font.lower() for token in ("courier", "mono", "consolas", "menlo"))
-                for font in fonts
-            ),
+            bold=any(profile.bold for profile in profiles),
+            monospace=all(profile.monospace for profile in profiles),
+            font_id=ordered[0]["font_id"],
         )
         lines.append(line)
 
     return lines
 
 
-def extract_lines(pdf_path: Path) -> list[PdfLine]:
+def document_lines(pdf, fonts: FontTable | None = None, tables: TableStage | None = None) -> list[PdfLine]:
+    fonts = fonts if fonts is not None else FontTable()
     lines: list[PdfLine] = []
-    with pdfplumber.open(str(pdf_path)) as pdf:
-        for page_number, page in enumerate(pdf.pages, start=1):
-            lines.extend(group_words_into_lines(page, page_number))
+    for page_number, page in enumerate(pdf.pages, start=1):
+        exclude = tables.process(page, page_number) if tables is not None else None
+        lines.extend(group_words_into_lines(page, page_number, fonts, exclude))
+    return lines
+
+
+def pymupdf_page_words(page) -> list[dict]:
+    """Turn PyMuPDF text spans into the word records used by `words_to_lines`."""
+    words: list[dict] = []
+    for block in page.get_text("dict").get("blocks", []):
+        if block.get("type", 0) != 0:
+            continue
+        for line in block.get("lines", []):
+            for span in line.get("spans", []):
+                text = span.get("text", "")
+                if not text.strip():
+                    continue
+                size = float(span.get("size", 10))
+                # Span boxes include the full ascender/descender; rebuild the
+                # size-high box pdfminer reports so paragraph gaps line up.
+                baseline = float(span.get("origin", span["bbox"][2:])[1])
+                bottom = baseline - float(span.get("descender", -0.2)) * size
+                # Indented spans keep their leading spaces; estimate where the
+                # first visible glyph starts (exact for monospace fonts).
+                x0, _, x1, _ = span["bbox"]
+                leading = len(text) - len(text.lstrip())
+                if leading:
+                    x0 += (x1 - x0) * leading / len(text)
+                words.append(
+                    {
+                        "text": text,
+                        "x0": float(x0),
+                        "x1": float(x1),
+                        "top": bottom - size,
+                        "bottom": bottom,
+                        "size": size,
+                        "fontname": str(span.get("font", "")),
+                    }
+                )
+    return words
+
+
+def add_ocr_lines(
+    lines: list[PdfLine],
+    page_count: int,
+    pdf_path: Path,
+    ocr: PdfOcr,
+    fonts: FontTable,
+) -> list[PdfLine]:
+    """OCR only the pages that produced no text and merge them in page order."""
+    text_pages = {line.page_number for line in lines}
+    blank_pages = [number for number in range(1, page_count + 1) if number not in text_pages]
+    if not blank_pages:
+        return lines
+
+    for page_number, words in ocr.page_words(pdf_path, blank_pages).items():
+        lines.extend(words_to_lines(words, page_number, fonts))
+    lines.sort(key=lambda line: line.page_number)
+    return lines
+
+
+class PdfplumberBackend:
+    """Reference extraction backend built on pdfplumber word extraction."""
+
+    name = "pdfplumber"
+    supports_tables = True
+
+    def extract(
+        self,
+        pdf_path: Path,
+        fonts: FontTable | None = None,
+        tables: TableStage | None = None,
+        ocr: PdfOcr | None = None,
+    ) -> tuple[str, list[PdfLine]]:
+        fonts = fonts if fonts is not None else FontTable()
+        with open_pdf_buffer(pdf_path) as buffer, pdfplumber.open(buffer) as pdf:
+            title = document_title(pdf, buffer)
+            lines = document_lines(pdf, fonts, tables)
+            page_count = len(pdf.pages)
+        if ocr is not None:
+            lines = add_ocr_lines(lines, page_count, pdf_path, ocr, fonts)
+        return title, lines
+
+
+class PyMuPDFBackend:
+    """Fast extraction backend reading PyMuPDF text dictionaries."""
+
+    name = "pymupdf"
+    supports_tables = False
+
+    def __init__(self):
+        if fitz is None:
+            raise ValueError("The pymupdf engine requires PyMuPDF. Install with: pip install pymupdf")
+
+    def extract(
+        self,
+        pdf_path: Path,
+        fonts: FontTable | None = None,
+        ocr: PdfOcr | None = None,
+    ) -> tuple[str, list[PdfLine]]:
+        fonts = fonts if fonts is not None else FontTable()
+        lines: list[PdfLine] = []
+        doc = fitz.open(str(pdf_path))
+        try:
+            title = clean_text((doc.metadata or {}).get("title", "") or "")
+            for page_number, page in enumerate(doc, start=1):
+                lines.extend(words_to_lines(pymupdf_page_words(page), page_number, fonts))
+            page_count = doc.page_count
+        finally:
+            doc.close()
+        if ocr is not None:
+            lines = add_ocr_lines(lines, page_count, pdf_path, ocr, fonts)
+        return title, lines
+
+
+EXTRACTION_BACKENDS = {
+    PdfplumberBackend.name: PdfplumberBackend,
+    PyMuPDFBackend.name: PyMuPDFBackend,
+}
+DEFAULT_ENGINE = PdfplumberBackend.name
+
+
+def get_backend(engine: str = DEFAULT_ENGINE):
+    backend_class = EXTRACTION_BACKENDS.get((engine or DEFAULT_ENGINE).strip().lower())
+    if backend_class is None:
+        raise ValueError(f"Unsupported engine: {engine}. Choose from: {', '.join(EXTRACTION_BACKENDS)}")
+    return backend_class()
+
+
+def extract_lines(pdf_path: Path, engine: str = DEFAULT_ENGINE) -> list[PdfLine]:
+    _, lines = get_backend(engine).extract(pdf_path)
     return lines
 
 
@@ -162,6 +628,46 @@ def line_is_noise(line: PdfLine) -> bool:
     return False
 
 
+def running_line_key(line: PdfLine) -> tuple[str, int]:
+    # Page numbers inside headers ("Chapter 2 - Page 14") must not break the match,
+    # but other numbers stay, so recurring "Chapter N" headings are not mistaken for headers.
+    text = PAGE_NUMBER_RE.sub("#", line.text.lower())
+    return " ".join(text.split()), round(line.top / EDGE_BAND_HEIGHT)
+
+
+def strip_running_lines(lines: list[PdfLine], min_ratio: float = 0.5, min_pages: int = 3) -> list[PdfLine]:
+    """Drop headers and footers that repeat in the same vertical band on most pages.
+
+    Only the top and bottom lines of each page are candidates. Each one is
+    hashed by normalized text and band, so the pass stays linear in lines.
+    """
+    by_page: dict[int, list[PdfLine]] = defaultdict(list)
+    for line in lines:
+        by_page[line.page_number].append(line)
+    if len(by_page) < min_pages:
+        return lines
+
+    pages_seen: dict[tuple[str, int], set[int]] = defaultdict(set)
+    candidates: list[tuple[PdfLine, tuple[str, int]]] = []
+    for page_number, page_lines in by_page.items():
+        edges = heapq.nsmallest(EDGE_LINES_PER_PAGE, page_lines, key=lambda line: line.top)
+        edges += heapq.nlargest(EDGE_LINES_PER_PAGE, page_lines, key=lambda line: line.top)
+        for line in {id(line): line for line in edges}.values():
+            key = running_line_key(line)
+            pages_seen[key].add(page_number)
+            candidates.append((line, key))
+
+    threshold = len(by_page) * min_ratio
+    running = {
+        id(line)
+        for line, key in candidates
+        if len(pages_seen[key]) >= min_pages and len(pages_seen[key]) > threshold
+    }
+    if not running:
+        return lines
+    return [line for line in lines if id(line) not in running]
+
+
 def heading_levels(lines: list[PdfLine], body_size: float) -> dict[float, int]:
     sizes = sorted(
         {
@@ -188,10 +694,15 @@ def infer_title(lines: list[PdfLine], fallback: str) -> str:
     return fallback
 
 
-def lines_to_blocks(lines: list[PdfLine]) -> tuple[str, list[MarkdownBlock]]:
-    meaningful = [line for line in lines if not line_is_noise(line)]
+def table_block(table: PdfTable) -> MarkdownBlock:
+    return MarkdownBlock(kind="table", rows=table.rows, page_number=table.page_number)
+
+
+def lines_to_blocks(lines: list[PdfLine], tables: list[PdfTable] | None = None) -> tuple[str, list[MarkdownBlock]]:
+    pending_tables = sorted(tables or [], key=lambda table: (table.page_number, table.top))
+    meaningful = [line for line in strip_running_lines(lines) if not line_is_noise(line)]
     if not meaningful:
-        return "Untitled Document", []
+        return "Untitled Document", [table_block(table) for table in pending_tables]
 
     body_size = statistics.median(line.size for line in meaningful)
     title = infer_title(meaningful, "Untitled Document")
@@ -201,19 +712,29 @@ def lines_to_blocks(lines: list[PdfLine]) -> tuple[str, list[MarkdownBlock]]:
     blocks: list[MarkdownBlock] = []
     paragraph_parts: list[str] = []
     code_lines: list[str] = []
+    start_pages: dict[str, int] = {}
     previous_line: PdfLine | None = None
 
     def flush_paragraph():
         if paragraph_parts:
-            blocks.append(MarkdownBlock(kind="paragraph", text=paragraph_parts[0]))
+            blocks.append(
+                MarkdownBlock(kind="paragraph", text=paragraph_parts[0], page_number=start_pages["paragraph"])
+            )
             paragraph_parts.clear()
 
     def flush_code():
         if code_lines:
-            blocks.append(MarkdownBlock(kind="code", text="\n".join(code_lines)))
+            blocks.append(MarkdownBlock(kind="code", text="\n".join(code_lines), page_number=start_pages["code"]))
             code_lines.clear()
 
     for line in meaningful:
+        if pending_tables and (pending_tables[0].page_number, pending_tables[0].top) < (line.page_number, line.top):
+            flush_paragraph()
+            flush_code()
+            while pending_tables and (pending_tables[0].page_number, pending_tables[0].top) < (line.page_number, line.top):
+                blocks.append(table_block(pending_tables.pop(0)))
+            previous_line = None
+
         if line.text == title and line.page_number == 1:
             previous_line = line
             continue
@@ -229,6 +750,7 @@ def lines_to_blocks(lines: list[PdfLine]) -> tuple[str, list[MarkdownBlock]]:
                     text=list_match.group("text"),
                     level=indent,
                     ordered=list_match.group("marker")[0].isdigit(),
+                    page_number=line.page_number,
                 )
             )
             previous_line = line
@@ -236,6 +758,8 @@ def lines_to_blocks(lines: list[PdfLine]) -> tuple[str, list[MarkdownBlock]]:
 
         if line.monospace and (line.x0 - left_margin) > 8:
             flush_paragraph()
+            if not code_lines:
+                start_pages["code"] = line.page_number
             code_lines.append(line.text)
             previous_line = line
             continue
@@ -245,7 +769,14 @@ def lines_to_blocks(lines: list[PdfLine]) -> tuple[str, list[MarkdownBlock]]:
         rounded_size = round(line.size, 1)
         if rounded_size in level_map and looks_like_heading(line, body_size):
             flush_paragraph()
-            blocks.append(MarkdownBlock(kind="heading", text=line.text, level=level_map[rounded_size]))
+            blocks.append(
+                MarkdownBlock(
+                    kind="heading",
+                    text=line.text,
+                    level=level_map[rounded_size],
+                    page_number=line.page_number,
+                )
+            )
             previous_line = line
             continue
 
@@ -261,6 +792,7 @@ def lines_to_blocks(lines: list[PdfLine]) -> tuple[str, list[MarkdownBlock]]:
 
         if new_paragraph:
             flush_paragraph()
+            start_pages["paragraph"] = line.page_number
             paragraph_parts.append(line.text)
         else:
             join_text(paragraph_parts, line.text)
@@ -269,39 +801,143 @@ def lines_to_blocks(lines: list[PdfLine]) -> tuple[str, list[MarkdownBlock]]:
 
     flush_paragraph()
     flush_code()
+    blocks.extend(table_block(table) for table in pending_tables)
     return title, blocks
 
 
+def render_block(block: MarkdownBlock) -> list[str]:
+    if block.kind == "heading":
+        return [f"{'#' * min(max(block.level, 2), 4)} {block.text}"]
+    if block.kind == "paragraph":
+        return [block.text]
+    if block.kind == "code":
+        return ["```", block.text, "```"]
+    if block.kind == "list":
+        indent = "  " * block.level
+        marker = "1." if block.ordered else "-"
+        return [f"{indent}{marker} {block.text}"]
+    if block.kind == "table" and block.rows:
+        return render_table(block.rows)
+    return []
+
+
 def render_markdown(title: str, blocks: list[MarkdownBlock]) -> str:
     lines = [f"# {title}", ""]
 
     for block in blocks:
-        if block.kind == "heading":
-            lines.extend([f"{'#' * min(max(block.level, 2), 4)} {block.text}", ""])
-        elif block.kind == "paragraph":
-            lines.extend([block.text, ""])
-        elif block.kind == "code":
-            lines.extend(["```", block.text, "```", ""])
-        elif block.kind == "list":
-            indent = "  " * block.level
-            marker = "1." if block.ordered else "-"
-            lines.append(f"{indent}{marker} {block.text}")
+        rendered = render_block(block)
+        if not rendered:
+            continue
+        if block.kind == "list":
+            lines.extend(rendered)
+            continue
+        if block.kind == "table" and lines[-1] != "":
+            lines.append("")
+        lines.extend(rendered)
+        lines.append("")
 
     if lines and lines[-1] != "":
         lines.append("")
     return "\n".join(lines).rstrip() + "\n"
 
 
+def markdown_chunk_units(title: str, blocks: list[MarkdownBlock]):
+    """Yield chunkable units from blocks, tracking the heading path as it goes."""
+    headings: list[tuple[int, str]] = []
+    for block in blocks:
+        if block.kind == "heading":
+            headings = [item for item in headings if item[0] < block.level]
+            headings.append((block.level, block.text))
+            continue
+
+        rendered = render_block(block)
+        if rendered:
+            yield ChunkUnit(
+                text="\n".join(rendered),
+                heading_path=(title, *(text for _, text in headings)),
+                location=block.page_number,
+                kind=block.kind,
+            )
+
+
 class PdfToMarkdownConverter:
+    suffixes = (".pdf",)
+    label = "PDF"
+
+    def __init__(
+        self,
+        engine: str = DEFAULT_ENGINE,
+        tables: bool = False,
+        output_format: str = "markdown",
+        chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+        chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+        ocr: bool = False,
+        workers: int = 1,
+        incremental: bool = False,
+        retries: int = 0,
+    ):
+        self.backend = get_backend(engine)
+        self.ocr = PdfOcr() if ocr else None
+        if tables and not self.backend.supports_tables:
+            raise ValueError(f"Table extraction is not available with the {self.backend.name} engine.")
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Output format must be one of: {', '.join(OUTPUT_FORMATS)}")
+        self.tables = tables
+        # (source path, page number) -> seconds, across every file this converter handled
+        self.table_timings: dict[tuple[str, int], float] = {}
+        self.last_table_timings: dict[int, float] = {}
+        self.output_format = output_format
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap = chunk_overlap
+        self.scheduler = ConversionScheduler([self], workers=workers, incremental=incremental, retries=retries)
+
+    @property
+    def settings(self) -> dict:
+        """Constructor options that change the output; rebuilds the converter in workers."""
+        return {
+            "engine": self.backend.name,
+            "tables": self.tables,
+            "output_format": self.output_format,
+            "chunk_tokens": self.chunk_tokens,
+            "chunk_overlap": self.chunk_overlap,
+            "ocr": self.ocr is not None,
+        }
+
     def extract_blocks(self, pdf_path: Path) -> tuple[str, list[MarkdownBlock]]:
-        reader = PdfReader(str(pdf_path))
-        fallback_title = metadata_title(reader) or pdf_path.stem.replace("_", " ").strip() or pdf_path.stem
-        lines = extract_lines(pdf_path)
-        title, blocks = lines_to_blocks(lines)
+        if self.tables:
+            stage = TableStage()
+            document_title_text, lines = self.backend.extract(pdf_path, tables=stage, ocr=self.ocr)
+            self.last_table_timings = stage.timings
+            self.merge_stats(pdf_path, stage.timings)
+            detected = stage.tables
+        else:
+            document_title_text, lines = self.backend.extract(pdf_path, ocr=self.ocr)
+            detected = []
+        fallback_title = (
+            document_title_text
+            or pdf_path.stem.replace("_", " ").strip()
+            or pdf_path.stem
+        )
+        title, blocks = lines_to_blocks(lines, detected)
         if title == "Untitled Document":
             title = fallback_title
         return title, blocks
 
+    def table_timing_summary(self, timings: dict | None = None) -> str:
+        """Summarize the given per-page timings, or every page converted so far."""
+        timings = self.table_timings if timings is None else timings
+        total_ms = sum(timings.values()) * 1000
+        slowest = max(timings, key=timings.get)
+        if isinstance(slowest, tuple):
+            slowest_page = f"{slowest[1]} of {Path(slowest[0]).name}"
+        else:
+            slowest_page = str(slowest)
+        return (
+            f"Table detection: {total_ms:.1f} ms over {len(timings)} page(s), "
+            f"{total_ms / len(timings):.2f} ms/page, "
+            f"slowest page {slowest_page} ({timings[slowest] * 1000:.1f} ms)"
+        )
+
     def build_markdown(self, pdf_path: Path, output_path: Path) -> Path:
         title, blocks = self.extract_blocks(pdf_path)
         markdown = render_markdown(title, blocks)
@@ -309,290 +945,63 @@ class PdfToMarkdownConverter:
         output_path.write_text(markdown, encoding="utf-8")
         return output_path
 
-    def collect_inputs(self, input_path: Path) -> list[Path]:
-        if input_path.is_file():
-            if input_path.suffix.lower() != ".pdf":
-                raise ValueError("Only .pdf files are supported.")
-            return [input_path]
-
-        if input_path.is_dir():
-            files = sorted(
-                (path for path in input_path.rglob("*.pdf") if path.is_file()),
-                key=lambda path: (path.stat().st_size, str(path).lower()),
-            )
-            if not files:
-                raise ValueError(f"No .pdf files found in {input_path}")
-            return files
+    def build_chunks(self, pdf_path: Path, output_path: Path, title: str, blocks: list[MarkdownBlock]) -> Path:
+        chunks = chunk_units(markdown_chunk_units(title, blocks), self.chunk_tokens, self.chunk_overlap)
+        return write_chunks_jsonl(chunks, output_path, pdf_path, title, location_key="pages")
 
-        raise ValueError(f"Input path not found: {input_path}")
+    def build_outputs(self, pdf_path: Path, output_path: Path) -> Path:
+        """Write Markdown and/or JSONL chunks from a single extraction pass."""
+        if self.output_format == "markdown":
+            return self.build_markdown(pdf_path, output_path)
 
-    def convert(self, input_path: Path, output_dir: Path, progress_callback=None) -> list[Path]:
-        files = self.collect_inputs(input_path)
-        results: list[Path] = []
-        failures: list[ConversionIssue] = []
-        base_dir = input_path if input_path.is_dir() else input_path.parent
-
-        if progress_callback:
-            progress_callback(0, len(files), None, None, f"Found {len(files)} PDF file(s). Processing smaller files first.")
-
-        for index, pdf_path in enumerate(files, start=1):
-            if input_path.is_dir():
-                relative_path = pdf_path.relative_to(base_dir).with_suffix(".md")
-                output_path = output_dir / relative_path
-            else:
-                output_path = output_dir / f"{pdf_path.stem}.md"
-
-            if progress_callback:
-                size_mb = pdf_path.stat().st_size / (1024 * 1024)
-                progress_callback(
-                    index - 1,
-                    len(files),
-                    pdf_path,
-                    output_path,
-                    f"Processing {index}/{len(files)}: {pdf_path.name} ({size_mb:.1f} MB)",
-                )
+        title, blocks = self.extract_blocks(pdf_path)
+        chunks_path = self.build_chunks(pdf_path, output_path.with_suffix(".jsonl"), title, blocks)
+        if self.output_format == "jsonl":
+            return chunks_path
 
-            try:
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                output_path.touch(exist_ok=True)
-                result = self.build_markdown(pdf_path, output_path)
-                results.append(result)
-            except Exception as exc:
-                failures.append(ConversionIssue(source=pdf_path, error=str(exc)))
-                if progress_callback:
-                    progress_callback(
-                        index,
-                        len(files),
-                        pdf_path,
-                        output_path,
-                        f"Skipped {pdf_path.name}: {exc}",
-                    )
-                continue
-
-            if progress_callback:
-                progress_callback(index, len(files), pdf_path, result, None)
-
-        if failures and progress_callback:
-            progress_callback(
-                len(results),
-                len(files),
-                None,
-                None,
-                f"Completed with {len(failures)} skipped file(s). Check the log for details.",
-            )
+        output_path.write_text(render_markdown(title, blocks), encoding="utf-8")
+        return output_path
 
-        return results
+    @property
+    def output_suffix(self) -> str:
+        return ".jsonl" if self.output_format == "jsonl" else ".md"
 
+    def report(self) -> str | None:
+        if self.tables and self.last_table_timings:
+            return self.table_timing_summary(self.last_table_timings)
+        return None
 
-def launch_gui():
-    import tkinter as tk
-    from tkinter import filedialog, messagebox, scrolledtext, ttk
-
-    class App:
-        def __init__(self, root):
-            self.root = root
-            self.root.title("PDF to Markdown")
-            self.root.geometry("860x620")
-
-            self.mode = tk.StringVar(value="file")
-            self.input_path = tk.StringVar()
-            self.output_dir = tk.StringVar()
-            self.status = tk.StringVar(value="Ready")
-            self.progress = tk.DoubleVar(value=0.0)
-            self.queue = Queue()
-            self.worker = None
-
-            self._build()
-            self.root.after(100, self._drain_queue)
-
-        def _build(self):
-            pad = dict(padx=8, pady=4)
-
-            main = ttk.Frame(self.root, padding=10)
-            main.grid(row=0, column=0, sticky="nsew")
-            self.root.columnconfigure(0, weight=1)
-            self.root.rowconfigure(0, weight=1)
-            main.columnconfigure(1, weight=1)
-            main.rowconfigure(5, weight=1)
-
-            ttk.Label(main, text="PDF to Markdown", font=("Segoe UI", 16, "bold")).grid(
-                row=0, column=0, columnspan=3, sticky="w", **pad
-            )
-            ttk.Label(
-                main,
-                text="Extract PDF structure into readable Markdown for AI and documentation workflows.",
-                foreground="#555",
-            ).grid(row=1, column=0, columnspan=3, sticky="w", **pad)
-
-            mode_frame = ttk.LabelFrame(main, text="Input Type", padding=8)
-            mode_frame.grid(row=2, column=0, columnspan=3, sticky="ew", **pad)
-            ttk.Radiobutton(
-                mode_frame,
-                text="Single PDF file",
-                variable=self.mode,
-                value="file",
-                command=self._sync_defaults,
-            ).grid(row=0, column=0, sticky="w", padx=4, pady=2)
-            ttk.Radiobutton(
-                mode_frame,
-                text="Whole directory of PDF files",
-                variable=self.mode,
-                value="directory",
-                command=self._sync_defaults,
-            ).grid(row=0, column=1, sticky="w", padx=12, pady=2)
-
-            paths = ttk.LabelFrame(main, text="Paths", padding=8)
-            paths.grid(row=3, column=0, columnspan=3, sticky="ew", **pad)
-            paths.columnconfigure(1, weight=1)
-
-            self._file_row(paths, 0, "PDF file or folder:", self.input_path, self._browse_input)
-            self._file_row(paths, 1, "Output directory:", self.output_dir, self._browse_output)
-
-            actions = ttk.Frame(main)
-            actions.grid(row=4, column=0, columnspan=3, sticky="ew", **pad)
-            self.convert_btn = ttk.Button(actions, text="Convert to Markdown", command=self._start)
-            self.convert_btn.pack(side="left", padx=4)
-            ttk.Button(actions, text="Clear Log", command=self._clear_log).pack(side="left", padx=4)
-
-            ttk.Label(main, textvariable=self.status).grid(row=5, column=0, columnspan=3, sticky="w", **pad)
-            ttk.Progressbar(main, maximum=100, variable=self.progress).grid(
-                row=6, column=0, columnspan=3, sticky="ew", **pad
-            )
+    def stats(self) -> dict[int, float]:
+        """Table timings of the last file, returned from worker processes."""
+        return self.last_table_timings
 
-            log_frame = ttk.LabelFrame(main, text="Activity Log", padding=8)
-            log_frame.grid(row=7, column=0, columnspan=3, sticky="nsew", **pad)
-            log_frame.columnconfigure(0, weight=1)
-            log_frame.rowconfigure(0, weight=1)
-            self.log = scrolledtext.ScrolledText(log_frame, height=20, font=("Consolas", 9))
-            self.log.grid(row=0, column=0, sticky="nsew")
-
-        def _file_row(self, parent, row, label, variable, command):
-            ttk.Label(parent, text=label).grid(row=row, column=0, sticky="w", pady=2)
-            ttk.Entry(parent, textvariable=variable).grid(row=row, column=1, sticky="ew", padx=4, pady=2)
-            ttk.Button(parent, text="Browse", command=command).grid(row=row, column=2, padx=4, pady=2)
-
-        def _browse_input(self):
-            if self.mode.get() == "directory":
-                selected = filedialog.askdirectory(title="Select PDF Directory")
-            else:
-                selected = filedialog.askopenfilename(
-                    title="Select PDF File",
-                    filetypes=[("PDF files", "*.pdf")],
-                )
-            if selected:
-                self.input_path.set(selected)
-                self._sync_defaults()
-
-        def _browse_output(self):
-            selected = filedialog.askdirectory(title="Select Output Directory")
-            if selected:
-                self.output_dir.set(selected)
-
-        def _sync_defaults(self):
-            input_path = self.input_path.get().strip()
-            if not input_path:
-                return
-
-            source = Path(input_path)
-            if self.mode.get() == "directory":
-                self.output_dir.set(str(source.parent / f"{source.name}_markdown"))
-            else:
-                self.output_dir.set(str(source.parent / "markdown"))
-
-        def _append_log(self, message):
-            self.log.insert("end", message + "\n")
-            self.log.see("end")
-
-        def _clear_log(self):
-            self.log.delete("1.0", "end")
-
-        def _start(self):
-            input_value = self.input_path.get().strip()
-            output_value = self.output_dir.get().strip()
-
-            if not input_value:
-                messagebox.showerror("Missing", "Please select a PDF file or directory.")
-                return
-            if not output_value:
-                messagebox.showerror("Missing", "Please select an output directory.")
-                return
-            if self.worker and self.worker.is_alive():
-                return
-
-            input_path = Path(input_value)
-            output_dir = Path(output_value)
-
-            self._clear_log()
-            self.progress.set(0)
-            self.status.set("Starting conversion...")
-            self._append_log(f"Input: {input_path}")
-            self._append_log(f"Output: {output_dir}")
-            self.convert_btn.state(["disabled"])
-
-            self.worker = threading.Thread(
-                target=self._run_worker,
-                args=(input_path, output_dir),
-                daemon=True,
-            )
-            self.worker.start()
-
-        def _run_worker(self, input_path: Path, output_dir: Path):
-            converter = PdfToMarkdownConverter()
-
-            def progress_callback(current, total, source_path, output_path, info_message):
-                if info_message:
-                    self.queue.put(("info", info_message))
-                    return
-                self.queue.put(
-                    (
-                        "progress",
-                        (
-                            current,
-                            total,
-                            f"Converted {source_path.name} -> {output_path.name}",
-                        ),
-                    )
-                )
+    def merge_stats(self, source: Path, stats: dict[int, float]) -> None:
+        self.table_timings.update(((str(source), page_number), seconds) for page_number, seconds in stats.items())
 
-            try:
-                results = converter.convert(input_path, output_dir, progress_callback=progress_callback)
-                self.queue.put(("done", results))
-            except Exception as exc:
-                self.queue.put(("error", str(exc)))
-
-        def _drain_queue(self):
-            try:
-                while True:
-                    kind, payload = self.queue.get_nowait()
-                    if kind == "info":
-                        self._append_log(payload)
-                        self.status.set(payload)
-                    elif kind == "progress":
-                        current, total, message = payload
-                        percent = 0 if total <= 0 else (current / total) * 100
-                        self.progress.set(percent)
-                        self.status.set(message)
-                        self._append_log(message)
-                    elif kind == "done":
-                        self.progress.set(100)
-                        message = f"Finished. Created {len(payload)} Markdown file(s)."
-                        self.status.set(message)
-                        self._append_log(message)
-                        self.convert_btn.state(["!disabled"])
-                        messagebox.showinfo("Conversion Complete", message)
-                    elif kind == "error":
-                        self.status.set("Conversion failed.")
-                        self._append_log(f"ERROR: {payload}")
-                        self.convert_btn.state(["!disabled"])
-                        messagebox.showerror("Conversion Failed", payload)
-            except Empty:
-                pass
-            finally:
-                self.root.after(100, self._drain_queue)
-
-    root = tk.Tk()
-    App(root)
-    root.mainloop()
+    @property
+    def failures(self):
+        return self.scheduler.failures
+
+    @property
+    def unchanged(self):
+        return self.scheduler.unchanged
+
+    def collect_inputs(self, input_path: Path) -> list[Path]:
+        return self.scheduler.collect_inputs(input_path)
+
+    def convert(self, input_path: Path, output_dir: Path, progress_callback=None) -> list[Path]:
+        """Convert one PDF or a directory; see ConversionScheduler for workers and manifests."""
+        return self.scheduler.convert(input_path, output_dir, progress_callback)
+
+
+def launch_gui():
+    launch_converter_gui(
+        "PDF to Markdown",
+        "Extract PDF structure into readable Markdown for AI and documentation workflows.",
+        "PDF",
+        [("PDF files", "*.pdf")],
+        PdfToMarkdownConverter,
+    )
 
 
 def build_arg_parser():
@@ -602,6 +1011,23 @@ def build_arg_parser():
     parser.add_argument("--gui", action="store_true", help="Launch the converter GUI.")
     parser.add_argument("--input", help="Path to a .pdf file or a directory containing .pdf files.")
     parser.add_argument("--output-dir", help="Directory where Markdown files will be written.")
+    parser.add_argument(
+        "--engine",
+        choices=sorted(EXTRACTION_BACKENDS),
+        default=DEFAULT_ENGINE,
+        help="Text extraction backend. pymupdf is much faster on large books.",
+    )
+    parser.add_argument(
+        "--tables",
+        action="store_true",
+        help="Render ruled tables as Markdown tables and report time spent per page.",
+    )
+    add_batch_arguments(parser)
+    parser.add_argument(
+        "--ocr",
+        action="store_true",
+        help="OCR pages that have no text layer with a local Tesseract install.",
+    )
     return parser
 
 
@@ -611,19 +1037,31 @@ def run_cli(args) -> int:
     if not args.output_dir:
         raise SystemExit("--output-dir is required in CLI mode")
 
-    converter = PdfToMarkdownConverter()
+    try:
+        converter = PdfToMarkdownConverter(
+            engine=args.engine,
+            tables=args.tables,
+            output_format=args.format,
+            chunk_tokens=args.chunk_tokens,
+            chunk_overlap=args.chunk_overlap,
+            ocr=args.ocr,
+            workers=args.workers,
+            incremental=args.incremental,
+            retries=args.retries,
+        )
+    except ValueError as exc:
+        raise SystemExit(str(exc))
     input_path = Path(args.input).expanduser()
     output_dir = Path(args.output_dir).expanduser()
 
-    def progress_callback(current, total, source_path, output_path, info_message):
-        if info_message:
-            print(info_message)
-            return
-        print(f"[{current}/{total}] {source_path} -> {output_path}")
-
-    results = converter.convert(input_path, output_dir, progress_callback=progress_callback)
-    print(f"Created {len(results)} Markdown file(s) in {output_dir}")
-    return 0
+    results = converter.convert(input_path, output_dir, progress_callback=progress_printer)
+    kind = "Markdown" if args.format == "markdown" else "output"
+    print(f"Created {len(results)} {kind} file(s) in {output_dir}")
+    if converter.tables and len({source for source, _ in converter.table_timings}) > 1:
+        print(f"Total {converter.table_timing_summary()}")
+    for issue in converter.failures:
+        print(f"FAILED {issue.source}: {issue.error}")
+    return 1 if converter.failures else 0
 
 
 def main(argv=None) -> int:
@@ -10,15 +10,49 @@ whole-directory processing with both CLI and tkinter GUI entry points.
 from __future__ import annotations
 
 import argparse
+import posixpath
 import statistics
 import sys
-import threading
-from dataclasses import dataclass
+import zipfile
+from dataclasses import dataclass, field
 from pathlib import Path
-from queue import Empty, Queue
+from xml.etree import ElementTree
 
 from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE, PP_PLACEHOLDER
+from pptx.shapes.picture import Picture
+
+from conversion_engine import (
+    OUTPUT_FORMATS,
+    ConversionScheduler,
+    add_batch_arguments,
+    clean_text,
+    escape_cell,
+    progress_printer,
+    render_table,
+)
+from conversion_engine import launch_gui as launch_converter_gui
+from rag_chunks import (
+    DEFAULT_CHUNK_OVERLAP,
+    DEFAULT_CHUNK_TOKENS,
+    ChunkUnit,
+    chunk_units,
+    write_chunks_jsonl,
+)
+
+
+NS_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+NS_P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+NS_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+NS_DC = "{http://purl.org/dc/elements/1.1/}"
+A_P, A_R, A_T, A_BR, A_FLD = (f"{NS_A}{tag}" for tag in ("p", "r", "t", "br", "fld"))
+A_PPR, A_RPR, A_TBL, A_TR, A_TC = (f"{NS_A}{tag}" for tag in ("pPr", "rPr", "tbl", "tr", "tc"))
+P_SP, P_GRAPHIC_FRAME, P_PIC, P_TXBODY = (f"{NS_P}{tag}" for tag in ("sp", "graphicFrame", "pic", "txBody"))
+P_NVPR, P_PH, P_CNVPR = f"{NS_P}nvPr", f"{NS_P}ph", f"{NS_P}cNvPr"
+XML_SHAPE_CONTAINERS = {f"{NS_P}{tag}" for tag in ("sld", "notes", "cSld", "spTree", "grpSp")}
+XML_PLACEHOLDER_ROLES = {"title": "title", "ctrTitle": "title", "subTitle": "subtitle", "body": "body"}
+NOTES_HEADING = "Speaker Notes"
 
 
 @dataclass
@@ -33,14 +67,29 @@ class SlideBlock:
 class SlideContent:
     title: str
     blocks: list[SlideBlock]
+    untitled: bool = False
 
 
-def clean_text(value: str) -> str:
-    return " ".join((value or "").replace("\u00a0", " ").split())
+@dataclass
+class TextParagraph:
+    text: str
+    level: int = 0
+    sizes: list[float] = field(default_factory=list)
+    bold_flags: list[bool] = field(default_factory=list)
 
 
-def escape_cell(value: str) -> str:
-    return clean_text(value).replace("|", "\\|")
+@dataclass
+class ShapeText:
+    """Engine-neutral text of one shape: paragraphs, table rows, or picture alt text."""
+
+    role: str | None = None
+    paragraphs: list[TextParagraph] = field(default_factory=list)
+    rows: list[list[str]] | None = None
+    alt_text: str = ""
+
+    @property
+    def font_sizes(self) -> list[float]:
+        return [size for paragraph in self.paragraphs for size in paragraph.sizes]
 
 
 def iter_text_shapes(shapes):
@@ -49,7 +98,7 @@ def iter_text_shapes(shapes):
             yield from iter_text_shapes(shape.shapes)
             continue
 
-        if getattr(shape, "has_table", False) or getattr(shape, "has_text_frame", False):
+        if isinstance(shape, Picture) or getattr(shape, "has_table", False) or getattr(shape, "has_text_frame", False):
             yield shape
 
 
@@ -63,12 +112,15 @@ def placeholder_type(shape):
         return None
 
 
-def is_title_placeholder(shape) -> bool:
-    return placeholder_type(shape) in {PP_PLACEHOLDER.TITLE, PP_PLACEHOLDER.CENTER_TITLE}
-
-
-def is_subtitle_placeholder(shape) -> bool:
-    return placeholder_type(shape) == PP_PLACEHOLDER.SUBTITLE
+def placeholder_role(shape) -> str | None:
+    kind = placeholder_type(shape)
+    if kind in {PP_PLACEHOLDER.TITLE, PP_PLACEHOLDER.CENTER_TITLE}:
+        return "title"
+    if kind == PP_PLACEHOLDER.SUBTITLE:
+        return "subtitle"
+    if kind == PP_PLACEHOLDER.BODY:
+        return "body"
+    return None
 
 
 def paragraph_text(paragraph) -> str:
@@ -76,47 +128,59 @@ def paragraph_text(paragraph) -> str:
     return clean_text(runs)
 
 
-def paragraph_font_sizes(shape) -> list[float]:
+def pptx_paragraph(paragraph) -> TextParagraph:
     sizes: list[float] = []
-    if not getattr(shape, "has_text_frame", False):
-        return sizes
-
-    for paragraph in shape.text_frame.paragraphs:
-        for run in paragraph.runs:
-            size = getattr(getattr(run, "font", None), "size", None)
-            if size:
-                try:
-                    sizes.append(float(size.pt))
-                except Exception:
-                    pass
-    return sizes
-
-
-def paragraph_is_bold(paragraph) -> bool:
-    bold_flags = [
-        bool(run.font.bold)
-        for run in paragraph.runs
-        if getattr(getattr(run, "font", None), "bold", None) is not None
-    ]
-    return bool(bold_flags) and all(bold_flags)
-
-
-def paragraph_is_heading(text: str, paragraph, base_font_size: float | None, shape) -> bool:
+    bold_flags: list[bool] = []
+    for run in paragraph.runs:
+        font = getattr(run, "font", None)
+        size = getattr(font, "size", None)
+        if size:
+            try:
+                sizes.append(float(size.pt))
+            except Exception:
+                pass
+        if getattr(font, "bold", None) is not None:
+            bold_flags.append(bool(font.bold))
+
+    return TextParagraph(
+        text=paragraph_text(paragraph),
+        level=max(0, int(getattr(paragraph, "level", 0) or 0)),
+        sizes=sizes,
+        bold_flags=bold_flags,
+    )
+
+
+def pptx_shape_text(shape) -> ShapeText:
+    if isinstance(shape, Picture):
+        # python-pptx has no public accessor for the picture description.
+        return ShapeText(alt_text=clean_text(shape._element.nvPicPr.cNvPr.get("descr", "")))
+
+    if getattr(shape, "has_table", False):
+        rows = [[escape_cell(cell.text) for cell in row.cells] for row in shape.table.rows]
+        return ShapeText(rows=rows)
+
+    return ShapeText(
+        role=placeholder_role(shape),
+        paragraphs=[pptx_paragraph(paragraph) for paragraph in shape.text_frame.paragraphs],
+    )
+
+
+def paragraph_is_bold(paragraph: TextParagraph) -> bool:
+    return bool(paragraph.bold_flags) and all(paragraph.bold_flags)
+
+
+def paragraph_is_heading(paragraph: TextParagraph, base_font_size: float | None, role: str | None) -> bool:
+    text = paragraph.text
     if not text or len(text) > 80:
         return False
     if text.endswith((".", "!", "?", ";")):
         return False
-    if getattr(paragraph, "level", 0):
+    if paragraph.level:
         return False
-    if is_subtitle_placeholder(shape):
+    if role == "subtitle":
         return True
 
-    para_sizes = [
-        float(run.font.size.pt)
-        for run in paragraph.runs
-        if getattr(getattr(run, "font", None), "size", None) is not None
-    ]
-    para_size = max(para_sizes) if para_sizes else None
+    para_size = max(paragraph.sizes) if paragraph.sizes else None
     words = [word for word in text.split() if any(ch.isalpha() for ch in word)]
     title_like = words and sum(1 for word in words if word[:1].isupper()) >= max(1, len(words) // 2)
 
@@ -127,88 +191,305 @@ def paragraph_is_heading(text: str, paragraph, base_font_size: float | None, sha
     return False
 
 
-def extract_shape_blocks(shape, base_font_size: float | None) -> list[SlideBlock]:
+def extract_shape_blocks(shape: ShapeText, base_font_size: float | None) -> list[SlideBlock]:
     blocks: list[SlideBlock] = []
 
-    if getattr(shape, "has_table", False):
-        rows: list[list[str]] = []
-        for row in shape.table.rows:
-            values = [escape_cell(cell.text) for cell in row.cells]
-            if any(values):
-                rows.append(values)
+    if shape.rows is not None:
+        rows = [values for values in shape.rows if any(values)]
         if rows:
             blocks.append(SlideBlock(kind="table", rows=rows))
         return blocks
 
-    if not getattr(shape, "has_text_frame", False):
-        return blocks
-
-    for paragraph in shape.text_frame.paragraphs:
-        text = paragraph_text(paragraph)
-        if not text:
+    for paragraph in shape.paragraphs:
+        if not paragraph.text:
             continue
 
-        level = max(0, int(getattr(paragraph, "level", 0) or 0))
-        if paragraph_is_heading(text, paragraph, base_font_size, shape):
-            blocks.append(SlideBlock(kind="heading", text=text, level=3))
-        elif level > 0:
-            blocks.append(SlideBlock(kind="list", text=text, level=level))
+        if paragraph_is_heading(paragraph, base_font_size, shape.role):
+            blocks.append(SlideBlock(kind="heading", text=paragraph.text, level=3))
+        elif paragraph.level > 0:
+            blocks.append(SlideBlock(kind="list", text=paragraph.text, level=paragraph.level))
         else:
-            blocks.append(SlideBlock(kind="paragraph", text=text))
+            blocks.append(SlideBlock(kind="paragraph", text=paragraph.text))
     return blocks
 
 
-def presentation_title(presentation: Presentation, source_path: Path) -> str:
-    core_title = clean_text(getattr(presentation.core_properties, "title", "") or "")
+def presentation_title(core_title: str, slides: list[SlideContent], source_path: Path) -> str:
+    """Pick the deck title from core properties or the already-extracted slides."""
+    core_title = clean_text(core_title or "")
     if core_title:
         return core_title
 
-    for index, slide in enumerate(presentation.slides, start=1):
-        extracted = extract_slide_content(slide, index)
-        if extracted.title and not extracted.title.startswith("Slide "):
-            return extracted.title
+    for slide in slides:
+        if slide.title and not slide.untitled:
+            return slide.title
 
     return source_path.stem.replace("_", " ").strip() or source_path.stem
 
 
-def extract_slide_content(slide, slide_number: int) -> SlideContent:
+def notes_blocks(shapes: list[ShapeText]) -> list[SlideBlock]:
+    """Speaker notes live in the body placeholder of the notes slide."""
+    for shape in shapes:
+        if shape.role == "body":
+            return [SlideBlock(kind="notes", text=paragraph.text) for paragraph in shape.paragraphs if paragraph.text]
+    return []
+
+
+def build_slide_content(
+    shapes: list[ShapeText],
+    slide_number: int,
+    notes: list[SlideBlock] | None = None,
+    include_alt_text: bool = False,
+) -> SlideContent:
     title = ""
     blocks: list[SlideBlock] = []
 
-    all_sizes: list[float] = []
-    for shape in iter_text_shapes(slide.shapes):
-        all_sizes.extend(paragraph_font_sizes(shape))
+    all_sizes = [size for shape in shapes for size in shape.font_sizes]
     base_font_size = statistics.median(all_sizes) if all_sizes else None
 
-    for shape in iter_text_shapes(slide.shapes):
+    for shape in shapes:
+        if shape.alt_text:
+            if include_alt_text:
+                blocks.append(SlideBlock(kind="image", text=shape.alt_text))
+            continue
+
         shape_blocks = extract_shape_blocks(shape, base_font_size)
         if not shape_blocks:
             continue
 
-        if is_title_placeholder(shape) and not title:
+        if shape.role == "title" and not title:
             title = shape_blocks[0].text
             shape_blocks = shape_blocks[1:]
 
         blocks.extend(shape_blocks)
 
+    blocks.extend(notes or [])
+
     if not title:
-        title = f"Slide {slide_number}"
+        return SlideContent(title=f"Slide {slide_number}", blocks=blocks, untitled=True)
 
     return SlideContent(title=title, blocks=blocks)
 
 
-def render_table(rows: list[list[str]]) -> list[str]:
-    width = max(len(row) for row in rows)
-    padded_rows = [row + [""] * (width - len(row)) for row in rows]
-    header = padded_rows[0]
-    separator = ["---"] * width
-    lines = [
-        "| " + " | ".join(header) + " |",
-        "| " + " | ".join(separator) + " |",
-    ]
-    for row in padded_rows[1:]:
-        lines.append("| " + " | ".join(row) + " |")
-    return lines
+def extract_slide_content(
+    slide,
+    slide_number: int,
+    include_notes: bool = False,
+    include_alt_text: bool = False,
+) -> SlideContent:
+    # One walk of the python-pptx shape tree into plain ShapeText records;
+    # alt text is picked up on the same walk, notes from the notes slide.
+    shapes = [pptx_shape_text(shape) for shape in iter_text_shapes(slide.shapes)]
+    notes = None
+    if include_notes and slide.has_notes_slide:
+        notes = notes_blocks([pptx_shape_text(shape) for shape in iter_text_shapes(slide.notes_slide.shapes)])
+    return build_slide_content(shapes, slide_number, notes, include_alt_text)
+
+
+def xml_bool(value: str | None) -> bool | None:
+    if value is None:
+        return None
+    return value in {"1", "true", "on"}
+
+
+def xml_text(element, tags) -> str:
+    """Concatenate a paragraph's children of the given tags, as python-pptx does."""
+    return "".join(
+        "\v" if child.tag == A_BR else "".join(node.text or "" for node in child.iter(A_T))
+        for child in element
+        if child.tag in tags
+    )
+
+
+def xml_paragraph(element) -> TextParagraph:
+    runs = element.findall(A_R)
+    sizes: list[float] = []
+    bold_flags: list[bool] = []
+    for run in runs:
+        properties = run.find(A_RPR)
+        if properties is None:
+            continue
+        if properties.get("sz"):
+            sizes.append(int(properties.get("sz")) / 100)
+        bold = xml_bool(properties.get("b"))
+        if bold is not None:
+            bold_flags.append(bold)
+    text = xml_text(element, {A_R} if runs else {A_BR, A_FLD})
+
+    properties = element.find(A_PPR)
+    level = int(properties.get("lvl", 0)) if properties is not None else 0
+    return TextParagraph(text=clean_text(text), level=max(0, level), sizes=sizes, bold_flags=bold_flags)
+
+
+def xml_shape_text(element) -> ShapeText | None:
+    if element.tag == P_PIC:
+        properties = element.find(f"./*/{P_CNVPR}")
+        return ShapeText(alt_text=clean_text(properties.get("descr", "") if properties is not None else ""))
+
+    if element.tag == P_GRAPHIC_FRAME:
+        table = element.find(f".//{A_TBL}")
+        if table is None:
+            return None
+        rows = []
+        for row in table.iter(A_TR):
+            cells = []
+            for cell in row.iter(A_TC):
+                paragraphs = [xml_text(paragraph, {A_R, A_BR, A_FLD}) for paragraph in cell.iter(A_P)]
+                cells.append(escape_cell(" ".join(paragraphs)))
+            rows.append(cells)
+        return ShapeText(rows=rows)
+
+    placeholder = element.find(f"./*/{P_NVPR}/{P_PH}")
+    role = None
+    if placeholder is not None:
+        role = XML_PLACEHOLDER_ROLES.get(placeholder.get("type"))
+    body = element.find(P_TXBODY)
+    paragraphs = [xml_paragraph(paragraph) for paragraph in body.iter(A_P)] if body is not None else []
+    return ShapeText(role=role, paragraphs=paragraphs)
+
+
+def iter_xml_shapes(stream):
+    """Stream a slide part, yielding ShapeText for each top-level or grouped shape.
+
+    Shapes are yielded in document order and cleared once read, so slide XML
+    is never held as a full tree. Only shapes reachable through the shape
+    tree and group shapes are read, matching what python-pptx exposes.
+    """
+    path: list[str] = []
+    for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            path.append(element.tag)
+            continue
+
+        path.pop()
+        if element.tag in {P_SP, P_GRAPHIC_FRAME, P_PIC} and all(tag in XML_SHAPE_CONTAINERS for tag in path):
+            shape = xml_shape_text(element)
+            element.clear()
+            if shape is not None:
+                yield shape
+
+
+def part_relationships(archive: zipfile.ZipFile, part: str) -> dict[str, tuple[str, str]]:
+    """Map relationship IDs of a package part to (type, resolved part name)."""
+    directory, name = posixpath.split(part)
+    rels_name = posixpath.join(directory, "_rels", f"{name}.rels")
+    try:
+        root = ElementTree.fromstring(archive.read(rels_name))
+    except KeyError:
+        return {}
+
+    relationships = {}
+    for rel in root.iter(f"{NS_PKG_REL}Relationship"):
+        target = rel.get("Target", "")
+        if rel.get("TargetMode") == "External":
+            continue
+        if target.startswith("/"):
+            resolved = target.lstrip("/")
+        else:
+            resolved = posixpath.normpath(posixpath.join(directory, target))
+        relationships[rel.get("Id")] = (rel.get("Type", ""), resolved)
+    return relationships
+
+
+def related_part(archive: zipfile.ZipFile, part: str, rel_type: str) -> str | None:
+    for kind, target in part_relationships(archive, part).values():
+        if kind.endswith(rel_type):
+            return target
+    return None
+
+
+class PythonPptxEngine:
+    """Reference engine built on the full python-pptx object model."""
+
+    name = "python-pptx"
+
+    def __init__(self, include_notes: bool = False, include_alt_text: bool = False):
+        self.include_notes = include_notes
+        self.include_alt_text = include_alt_text
+
+    def extract(self, pptx_path: Path) -> tuple[str, list[SlideContent]]:
+        presentation = Presentation(str(pptx_path))
+        slides = [
+            extract_slide_content(slide, index, self.include_notes, self.include_alt_text)
+            for index, slide in enumerate(presentation.slides, start=1)
+        ]
+        core_title = getattr(presentation.core_properties, "title", "")
+        return presentation_title(core_title, slides, pptx_path), slides
+
+
+class XmlStreamEngine:
+    """Lean engine that streams slide XML straight from the zip archive.
+
+    Only the presentation, relationship, core-properties and slide parts are
+    read; images, media and layouts are never loaded.
+    """
+
+    name = "xml"
+
+    def __init__(self, include_notes: bool = False, include_alt_text: bool = False):
+        self.include_notes = include_notes
+        self.include_alt_text = include_alt_text
+
+    def extract(self, pptx_path: Path) -> tuple[str, list[SlideContent]]:
+        with zipfile.ZipFile(pptx_path) as archive:
+            presentation_part = related_part(archive, "", "/officeDocument") or "ppt/presentation.xml"
+            relationships = part_relationships(archive, presentation_part)
+            with archive.open(presentation_part) as stream:
+                slide_ids = [
+                    element.get(f"{NS_R}id")
+                    for _, element in ElementTree.iterparse(stream)
+                    if element.tag == f"{NS_P}sldId"
+                ]
+
+            slides = []
+            for index, rel_id in enumerate(slide_ids, start=1):
+                slide_part = relationships[rel_id][1]
+                with archive.open(slide_part) as stream:
+                    shapes = list(iter_xml_shapes(stream))
+
+                notes = None
+                notes_part = related_part(archive, slide_part, "/notesSlide") if self.include_notes else None
+                if notes_part:
+                    with archive.open(notes_part) as stream:
+                        notes = notes_blocks(list(iter_xml_shapes(stream)))
+                slides.append(build_slide_content(shapes, index, notes, self.include_alt_text))
+
+            core_title = ""
+            core_part = related_part(archive, "", "/core-properties")
+            if core_part:
+                title = ElementTree.fromstring(archive.read(core_part)).find(f"{NS_DC}title")
+                core_title = title.text if title is not None else ""
+
+        return presentation_title(core_title, slides, pptx_path), slides
+
+
+class AutoEngine:
+    """Use the XML engine and fall back to python-pptx on anything it cannot read."""
+
+    name = "auto"
+
+    def __init__(self, include_notes: bool = False, include_alt_text: bool = False):
+        self.options = {"include_notes": include_notes, "include_alt_text": include_alt_text}
+
+    def extract(self, pptx_path: Path) -> tuple[str, list[SlideContent]]:
+        try:
+            return XmlStreamEngine(**self.options).extract(pptx_path)
+        except Exception:
+            return PythonPptxEngine(**self.options).extract(pptx_path)
+
+
+EXTRACTION_ENGINES = {
+    AutoEngine.name: AutoEngine,
+    XmlStreamEngine.name: XmlStreamEngine,
+    PythonPptxEngine.name: PythonPptxEngine,
+}
+DEFAULT_ENGINE = AutoEngine.name
+
+
+def get_engine(engine: str = DEFAULT_ENGINE, include_notes: bool = False, include_alt_text: bool = False):
+    engine_class = EXTRACTION_ENGINES.get((engine or DEFAULT_ENGINE).strip().lower())
+    if engine_class is None:
+        raise ValueError(f"Unsupported engine: {engine}. Choose from: {', '.join(EXTRACTION_ENGINES)}")
+    return engine_class(include_notes=include_notes, include_alt_text=include_alt_text)
 
 
 def render_slide_markdown(index: int, slide: SlideContent) -> list[str]:
@@ -218,6 +499,7 @@ def render_slide_markdown(index: int, slide: SlideContent) -> list[str]:
         return lines
 
     paragraph_buffer: list[str] = []
+    notes_started = False
 
     def flush_paragraph():
         if paragraph_buffer:
@@ -240,6 +522,15 @@ def render_slide_markdown(index: int, slide: SlideContent) -> list[str]:
         elif block.kind == "table" and block.rows:
             lines.extend(render_table(block.rows))
             lines.append("")
+        elif block.kind == "image":
+            lines.extend([f"_Image: {block.text}_", ""])
+        elif block.kind == "notes":
+            if not notes_started:
+                if lines[-1] != "":
+                    lines.append("")
+                lines.extend([f"### {NOTES_HEADING}", ""])
+                notes_started = True
+            lines.extend([block.text, ""])
 
     flush_paragraph()
     if lines and lines[-1] != "":
@@ -247,18 +538,75 @@ def render_slide_markdown(index: int, slide: SlideContent) -> list[str]:
     return lines
 
 
+def slide_chunk_units(title: str, slides: list[SlideContent]):
+    """Yield chunkable units per slide; slide and in-slide headings form the path."""
+    for index, slide in enumerate(slides, start=1):
+        heading_path: tuple[str, ...] = (title, slide.title)
+        for block in slide.blocks:
+            if block.kind == "heading":
+                heading_path = (title, slide.title, block.text)
+                continue
+            if block.kind == "notes":
+                heading_path = (title, slide.title, NOTES_HEADING)
+
+            if block.kind == "list":
+                text = f"{'  ' * max(0, block.level - 1)}- {block.text}"
+            elif block.kind == "table" and block.rows:
+                text = "\n".join(render_table(block.rows))
+            elif block.kind == "image":
+                text = f"Image: {block.text}"
+            else:
+                text = block.text
+
+            yield ChunkUnit(text=text, heading_path=heading_path, location=index, kind=block.kind)
+
+
 class PowerPointToMarkdownConverter:
+    suffixes = (".pptx",)
+    label = "PowerPoint"
+
+    def __init__(
+        self,
+        output_format: str = "markdown",
+        chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+        chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+        workers: int = 1,
+        incremental: bool = False,
+        engine: str = DEFAULT_ENGINE,
+        include_notes: bool = False,
+        include_alt_text: bool = False,
+        retries: int = 0,
+    ):
+        self.engine = get_engine(engine, include_notes, include_alt_text)
+        self.include_notes = include_notes
+        self.include_alt_text = include_alt_text
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Output format must be one of: {', '.join(OUTPUT_FORMATS)}")
+        self.output_format = output_format
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap = chunk_overlap
+        self.scheduler = ConversionScheduler([self], workers=workers, incremental=incremental, retries=retries)
+
+    @property
+    def settings(self) -> dict:
+        """Constructor options that change the output; rebuilds the converter in workers."""
+        return {
+            "engine": self.engine.name,
+            "output_format": self.output_format,
+            "chunk_tokens": self.chunk_tokens,
+            "chunk_overlap": self.chunk_overlap,
+            "include_notes": self.include_notes,
+            "include_alt_text": self.include_alt_text,
+        }
+
     def extract_slides(self, pptx_path: Path) -> tuple[str, list[SlideContent]]:
-        presentation = Presentation(str(pptx_path))
-        title = presentation_title(presentation, pptx_path)
-        slides = [
-            extract_slide_content(slide, index)
-            for index, slide in enumerate(presentation.slides, start=1)
-        ]
-        return title, slides
+        return self.engine.extract(pptx_path)
 
     def build_markdown(self, pptx_path: Path, output_path: Path) -> Path:
         title, slides = self.extract_slides(pptx_path)
+        return self.write_markdown(title, slides, output_path)
+
+    def write_markdown(self, title: str, slides: list[SlideContent], output_path: Path) -> Path:
         lines = [f"# {title}", ""]
 
         for index, slide in enumerate(slides, start=1):
@@ -268,253 +616,57 @@ class PowerPointToMarkdownConverter:
         output_path.write_text("\n".join(lines).rstrip() + "\n", encoding="utf-8")
         return output_path
 
-    def collect_inputs(self, input_path: Path) -> list[Path]:
-        if input_path.is_file():
-            if input_path.suffix.lower() != ".pptx":
-                raise ValueError("Only .pptx files are supported.")
-            return [input_path]
-
-        if input_path.is_dir():
-            files = sorted(path for path in input_path.rglob("*.pptx") if path.is_file())
-            if not files:
-                raise ValueError(f"No .pptx files found in {input_path}")
-            return files
+    def build_outputs(self, pptx_path: Path, output_path: Path) -> Path:
+        """Write Markdown and/or JSONL chunks from a single extraction pass."""
+        if self.output_format == "markdown":
+            return self.build_markdown(pptx_path, output_path)
 
-        raise ValueError(f"Input path not found: {input_path}")
+        title, slides = self.extract_slides(pptx_path)
+        chunks = chunk_units(slide_chunk_units(title, slides), self.chunk_tokens, self.chunk_overlap)
+        chunks_path = write_chunks_jsonl(
+            chunks, output_path.with_suffix(".jsonl"), pptx_path, title, location_key="slides"
+        )
+        if self.output_format == "jsonl":
+            return chunks_path
+        return self.write_markdown(title, slides, output_path)
+
+    @property
+    def output_suffix(self) -> str:
+        return ".jsonl" if self.output_format == "jsonl" else ".md"
+
+    def report(self) -> str | None:
+        return None
 
-    def convert(self, input_path: Path, output_dir: Path, progress_callback=None) -> list[Path]:
-        files = self.collect_inputs(input_path)
-        results: list[Path] = []
-        base_dir = input_path if input_path.is_dir() else input_path.parent
+    def stats(self):
+        return None
 
-        if progress_callback:
-            progress_callback(0, len(files), None, None, f"Found {len(files)} PowerPoint file(s).")
+    def merge_stats(self, source: Path, stats) -> None:
+        pass
 
-        for index, pptx_path in enumerate(files, start=1):
-            if input_path.is_dir():
-                relative_path = pptx_path.relative_to(base_dir).with_suffix(".md")
-                output_path = output_dir / relative_path
-            else:
-                output_path = output_dir / f"{pptx_path.stem}.md"
+    @property
+    def failures(self):
+        return self.scheduler.failures
 
-            result = self.build_markdown(pptx_path, output_path)
-            results.append(result)
+    @property
+    def unchanged(self):
+        return self.scheduler.unchanged
 
-            if progress_callback:
-                progress_callback(index, len(files), pptx_path, result, None)
+    def collect_inputs(self, input_path: Path) -> list[Path]:
+        return self.scheduler.collect_inputs(input_path)
 
-        return results
+    def convert(self, input_path: Path, output_dir: Path, progress_callback=None) -> list[Path]:
+        """Convert one deck or a directory; see ConversionScheduler for workers and manifests."""
+        return self.scheduler.convert(input_path, output_dir, progress_callback)
 
 
 def launch_gui():
-    import tkinter as tk
-    from tkinter import filedialog, messagebox, scrolledtext, ttk
-
-    class App:
-        def __init__(self, root):
-            self.root = root
-            self.root.title("PowerPoint to Markdown")
-            self.root.geometry("860x620")
-
-            self.mode = tk.StringVar(value="file")
-            self.input_path = tk.StringVar()
-            self.output_dir = tk.StringVar()
-            self.status = tk.StringVar(value="Ready")
-            self.progress = tk.DoubleVar(value=0.0)
-            self.queue = Queue()
-            self.worker = None
-
-            self._build()
-            self.root.after(100, self._drain_queue)
-
-        def _build(self):
-            pad = dict(padx=8, pady=4)
-
-            main = ttk.Frame(self.root, padding=10)
-            main.grid(row=0, column=0, sticky="nsew")
-            self.root.columnconfigure(0, weight=1)
-            self.root.rowconfigure(0, weight=1)
-            main.columnconfigure(1, weight=1)
-            main.rowconfigure(5, weight=1)
-
-            ttk.Label(main, text="PowerPoint to Markdown", font=("Segoe UI", 16, "bold")).grid(
-                row=0, column=0, columnspan=3, sticky="w", **pad
-            )
-            ttk.Label(
-                main,
-                text="Extract slide structure into readable Markdown for AI and documentation workflows.",
-                foreground="#555",
-            ).grid(row=1, column=0, columnspan=3, sticky="w", **pad)
-
-            mode_frame = ttk.LabelFrame(main, text="Input Type", padding=8)
-            mode_frame.grid(row=2, column=0, columnspan=3, sticky="ew", **pad)
-            ttk.Radiobutton(
-                mode_frame,
-                text="Single PowerPoint file",
-                variable=self.mode,
-                value="file",
-                command=self._sync_defaults,
-            ).grid(row=0, column=0, sticky="w", padx=4, pady=2)
-            ttk.Radiobutton(
-                mode_frame,
-                text="Whole directory of PowerPoint files",
-                variable=self.mode,
-                value="directory",
-                command=self._sync_defaults,
-            ).grid(row=0, column=1, sticky="w", padx=12, pady=2)
-
-            files = ttk.LabelFrame(main, text="Paths", padding=8)
-            files.grid(row=3, column=0, columnspan=3, sticky="ew", **pad)
-            files.columnconfigure(1, weight=1)
-
-            self._file_row(files, 0, "PowerPoint file or folder:", self.input_path, self._browse_input)
-            self._file_row(files, 1, "Output directory:", self.output_dir, self._browse_output)
-
-            actions = ttk.Frame(main)
-            actions.grid(row=4, column=0, columnspan=3, sticky="ew", **pad)
-            self.convert_btn = ttk.Button(actions, text="Convert to Markdown", command=self._start)
-            self.convert_btn.pack(side="left", padx=4)
-            ttk.Button(actions, text="Clear Log", command=self._clear_log).pack(side="left", padx=4)
-
-            ttk.Label(main, textvariable=self.status).grid(row=5, column=0, columnspan=3, sticky="w", **pad)
-            ttk.Progressbar(main, maximum=100, variable=self.progress).grid(
-                row=6, column=0, columnspan=3, sticky="ew", **pad
-            )
-
-            log_frame = ttk.LabelFrame(main, text="Activity Log", padding=8)
-            log_frame.grid(row=7, column=0, columnspan=3, sticky="nsew", **pad)
-            log_frame.columnconfigure(0, weight=1)
-            log_frame.rowconfigure(0, weight=1)
-            self.log = scrolledtext.ScrolledText(log_frame, height=20, font=("Consolas", 9))
-            self.log.grid(row=0, column=0, sticky="nsew")
-
-        def _file_row(self, parent, row, label, variable, command):
-            ttk.Label(parent, text=label).grid(row=row, column=0, sticky="w", pady=2)
-            ttk.Entry(parent, textvariable=variable).grid(row=row, column=1, sticky="ew", padx=4, pady=2)
-            ttk.Button(parent, text="Browse", command=command).grid(row=row, column=2, padx=4, pady=2)
-
-        def _browse_input(self):
-            if self.mode.get() == "directory":
-                selected = filedialog.askdirectory(title="Select PowerPoint Directory")
-            else:
-                selected = filedialog.askopenfilename(
-                    title="Select PowerPoint File",
-                    filetypes=[("PowerPoint files", "*.pptx")],
-                )
-            if selected:
-                self.input_path.set(selected)
-                self._sync_defaults()
-
-        def _browse_output(self):
-            selected = filedialog.askdirectory(title="Select Output Directory")
-            if selected:
-                self.output_dir.set(selected)
-
-        def _sync_defaults(self):
-            input_path = self.input_path.get().strip()
-            if not input_path:
-                return
-
-            source = Path(input_path)
-            if self.mode.get() == "directory":
-                self.output_dir.set(str(source.parent / f"{source.name}_markdown"))
-            else:
-                self.output_dir.set(str(source.parent / "markdown"))
-
-        def _append_log(self, message):
-            self.log.insert("end", message + "\n")
-            self.log.see("end")
-
-        def _clear_log(self):
-            self.log.delete("1.0", "end")
-
-        def _start(self):
-            input_value = self.input_path.get().strip()
-            output_value = self.output_dir.get().strip()
-
-            if not input_value:
-                messagebox.showerror("Missing", "Please select a PowerPoint file or directory.")
-                return
-            if not output_value:
-                messagebox.showerror("Missing", "Please select an output directory.")
-                return
-            if self.worker and self.worker.is_alive():
-                return
-
-            input_path = Path(input_value)
-            output_dir = Path(output_value)
-
-            self._clear_log()
-            self.progress.set(0)
-            self.status.set("Starting conversion...")
-            self._append_log(f"Input: {input_path}")
-            self._append_log(f"Output: {output_dir}")
-            self.convert_btn.state(["disabled"])
-
-            self.worker = threading.Thread(
-                target=self._run_worker,
-                args=(input_path, output_dir),
-                daemon=True,
-            )
-            self.worker.start()
-
-        def _run_worker(self, input_path: Path, output_dir: Path):
-            converter = PowerPointToMarkdownConverter()
-
-            def progress_callback(current, total, source_path, output_path, info_message):
-                if info_message:
-                    self.queue.put(("info", info_message))
-                    return
-                self.queue.put(
-                    (
-                        "progress",
-                        (
-                            current,
-                            total,
-                            f"Converted {source_path.name} -> {output_path.name}",
-                        ),
-                    )
-                )
-
-            try:
-                results = converter.convert(input_path, output_dir, progress_callback=progress_callback)
-                self.queue.put(("done", results))
-            except Exception as exc:
-                self.queue.put(("error", str(exc)))
-
-        def _drain_queue(self):
-            try:
-                while True:
-                    kind, payload = self.queue.get_nowait()
-                    if kind == "info":
-                        self._append_log(payload)
-                        self.status.set(payload)
-                    elif kind == "progress":
-                        current, total, message = payload
-                        percent = 0 if total <= 0 else (current / total) * 100
-                        self.progress.set(percent)
-                        self.status.set(message)
-                        self._append_log(message)
-                    elif kind == "done":
-                        self.progress.set(100)
-                        message = f"Finished. Created {len(payload)} Markdown file(s)."
-                        self.status.set(message)
-                        self._append_log(message)
-                        self.convert_btn.state(["!disabled"])
-                        messagebox.showinfo("Conversion Complete", message)
-                    elif kind == "error":
-                        self.status.set("Conversion failed.")
-                        self._append_log(f"ERROR: {payload}")
-                        self.convert_btn.state(["!disabled"])
-                        messagebox.showerror("Conversion Failed", payload)
-            except Empty:
-                pass
-            finally:
-                self.root.after(100, self._drain_queue)
-
-    root = tk.Tk()
-    App(root)
-    root.mainloop()
+    launch_converter_gui(
+        "PowerPoint to Markdown",
+        "Extract slide structure into readable Markdown for AI and documentation workflows.",
+        "PowerPoint",
+        [("PowerPoint files", "*.pptx")],
+        PowerPointToMarkdownConverter,
+    )
 
 
 def build_arg_parser():
@@ -524,6 +676,15 @@ def build_arg_parser():
     parser.add_argument("--gui", action="store_true", help="Launch the converter GUI.")
     parser.add_argument("--input", help="Path to a .pptx file or a directory containing .pptx files.")
     parser.add_argument("--output-dir", help="Directory where Markdown files will be written.")
+    add_batch_arguments(parser)
+    parser.add_argument(
+        "--engine",
+        choices=sorted(EXTRACTION_ENGINES),
+        default=DEFAULT_ENGINE,
+        help="Stream slide XML directly (xml), use python-pptx, or try xml first and fall back (auto).",
+    )
+    parser.add_argument("--notes", action="store_true", help="Include speaker notes after each slide.")
+    parser.add_argument("--alt-text", action="store_true", help="Include image alt text where the image appears.")
     return parser
 
 
@@ -533,19 +694,29 @@ def run_cli(args) -> int:
     if not args.output_dir:
         raise SystemExit("--output-dir is required in CLI mode")
 
-    converter = PowerPointToMarkdownConverter()
+    try:
+        converter = PowerPointToMarkdownConverter(
+            output_format=args.format,
+            chunk_tokens=args.chunk_tokens,
+            chunk_overlap=args.chunk_overlap,
+            workers=args.workers,
+            incremental=args.incremental,
+            engine=args.engine,
+            include_notes=args.notes,
+            include_alt_text=args.alt_text,
+            retries=args.retries,
+        )
+    except ValueError as exc:
+        raise SystemExit(str(exc))
     input_path = Path(args.input).expanduser()
     output_dir = Path(args.output_dir).expanduser()
 
-    def progress_callback(current, total, source_path, output_path, info_message):
-        if info_message:
-            print(info_message)
-            return
-        print(f"[{current}/{total}] {source_path} -> {output_path}")
-
-    results = converter.convert(input_path, output_dir, progress_callback=progress_callback)
-    print(f"Created {len(results)} Markdown file(s) in {output_dir}")
-    return 0
+    results = converter.convert(input_path, output_dir, progress_callback=progress_printer)
+    kind = "Markdown" if args.format == "markdown" else "output"
+    print(f"Created {len(results)} {kind} file(s) in {output_dir}")
+    for issue in converter.failures:
+        print(f"FAILED {issue.source}: {issue.error}")
+    return 1 if converter.failures else 0
 
 
 def main(argv=None) -> int:
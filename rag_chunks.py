@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Heading-aware chunking for RAG ingestion.
+
+The Markdown converters feed their already-structured blocks through
+`chunk_units` while converting, and `write_chunks_jsonl` streams the
+resulting chunks to a `.jsonl` file. Each record carries the heading path
+and the source page or slide numbers, so ingestion pipelines do not need
+to re-split the rendered Markdown.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+DEFAULT_CHUNK_TOKENS = 400
+DEFAULT_CHUNK_OVERLAP = 40
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class ChunkUnit:
+    text: str
+    heading_path: tuple[str, ...]
+    location: int
+    kind: str = "paragraph"
+
+
+@dataclass
+class Chunk:
+    text: str
+    heading_path: tuple[str, ...]
+    locations: list[int] = field(default_factory=list)
+    tokens: int = 0
+
+
+def estimate_tokens(text: str) -> int:
+    # A cheap, tokenizer-free estimate: roughly four characters per token.
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+def split_unit(unit: ChunkUnit, target_tokens: int, overlap_tokens: int) -> list[ChunkUnit]:
+    """Break a single oversized unit into word windows of about target size."""
+    words = unit.text.split()
+    window = max(1, target_tokens * CHARS_PER_TOKEN // 6)
+    step = max(1, window - overlap_tokens * CHARS_PER_TOKEN // 6)
+    pieces: list[ChunkUnit] = []
+    for start in range(0, len(words), step):
+        pieces.append(
+            ChunkUnit(
+                text=" ".join(words[start : start + window]),
+                heading_path=unit.heading_path,
+                location=unit.location,
+                kind=unit.kind,
+            )
+        )
+        if start + window >= len(words):
+            break
+    return pieces
+
+
+def join_units(units: list[ChunkUnit]) -> str:
+    parts: list[str] = []
+    previous_kind = None
+    for unit in units:
+        if parts and unit.kind == "list" and previous_kind == "list":
+            parts.append("\n")
+        elif parts:
+            parts.append("\n\n")
+        parts.append(unit.text)
+        previous_kind = unit.kind
+    return "".join(parts)
+
+
+def build_chunk(units: list[ChunkUnit]) -> Chunk:
+    text = join_units(units)
+    locations = sorted({unit.location for unit in units if unit.location})
+    return Chunk(text=text, heading_path=units[0].heading_path, locations=locations, tokens=estimate_tokens(text))
+
+
+def chunk_units(
+    units: Iterable[ChunkUnit],
+    target_tokens: int = DEFAULT_CHUNK_TOKENS,
+    overlap_tokens: int = DEFAULT_CHUNK_OVERLAP,
+) -> Iterator[Chunk]:
+    """Group units into chunks that never cross a heading boundary.
+
+    A chunk is closed when the heading path changes or when the next unit
+    would push it past `target_tokens`. Chunks split for size start with
+    the trailing units of the previous chunk, up to `overlap_tokens`.
+    """
+    if target_tokens <= 0:
+        raise ValueError("Chunk size must be a positive number of tokens")
+    overlap_tokens = max(0, min(overlap_tokens, target_tokens // 2))
+
+    current: list[ChunkUnit] = []
+    current_tokens = 0
+
+    for unit in units:
+        if not unit.text.strip():
+            continue
+
+        pieces = [unit]
+        if estimate_tokens(unit.text) > target_tokens:
+            pieces = split_unit(unit, target_tokens, overlap_tokens)
+
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece.text)
+
+            if current and piece.heading_path != current[0].heading_path:
+                yield build_chunk(current)
+                current, current_tokens = [], 0
+            elif current and current_tokens + piece_tokens > target_tokens:
+                yield build_chunk(current)
+                carried: list[ChunkUnit] = []
+                carried_tokens = 0
+                for previous in reversed(current):
+                    previous_tokens = estimate_tokens(previous.text)
+                    if carried_tokens + previous_tokens > overlap_tokens:
+                        break
+                    carried.insert(0, previous)
+                    carried_tokens += previous_tokens
+                current, current_tokens = carried, carried_tokens
+
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        yield build_chunk(current)
+
+
+def write_chunks_jsonl(
+    chunks: Iterable[Chunk],
+    output_path: Path,
+    source: Path,
+    title: str,
+    location_key: str = "pages",
+) -> Path:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as handle:
+        for index, chunk in enumerate(chunks):
+            record = {
+                "id": f"{source.stem}-{index:04d}",
+                "source": str(source),
+                "title": title,
+                "chunk_index": index,
+                "heading_path": list(chunk.heading_path),
+                location_key: chunk.locations,
+                "tokens": chunk.tokens,
+                "text": chunk.text,
+            }
+            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return output_path
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Per-session data for the web interface.
+
+Values (analysis results and the like) are JSON documents keyed by a
+namespace and the browser session ID. Every entry expires after a TTL, and
+the store is capped by entry count and total size, evicting the least
+recently written entries first, so memory and disk use stay flat however
+long the server runs.
+
+`SQLiteSessionStore` is the default: it survives restarts, and processes
+that open the same file see the same data. `MemorySessionStore` keeps
+everything in the current process. Other backends subclass `SessionStore`,
+implement its abstract methods and register a URL scheme in `BACKENDS`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_VALUE_BYTES = 16 * 1024 * 1024
+DEFAULT_MAX_TOTAL_BYTES = 256 * 1024 * 1024
+EVICT_INTERVAL_SECONDS = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_data (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS session_data_expires ON session_data (expires);
+CREATE INDEX IF NOT EXISTS session_data_updated ON session_data (updated);
+"""
+
+
+class SessionStore(ABC):
+    """Namespaced key/value store with expiry and size limits."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_value_bytes: int = DEFAULT_MAX_VALUE_BYTES,
+                 max_total_bytes: int = DEFAULT_MAX_TOTAL_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_value_bytes = max_value_bytes
+        self.max_total_bytes = max_total_bytes
+
+    @abstractmethod
+    def get(self, namespace: str, key: str, default=None):
+        """Return the stored value, or `default` if it is missing or expired."""
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value, ttl: float | None = None) -> None:
+        """Store a JSON-serializable value, replacing any previous one."""
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove a value if present."""
+
+    @abstractmethod
+    def evict(self) -> None:
+        """Drop expired entries, then the oldest ones until the caps are met."""
+
+    def _encode(self, value) -> str:
+        data = json.dumps(value, ensure_ascii=False)
+        if len(data.encode("utf-8")) > self.max_value_bytes:
+            raise ValueError(f"Session value is larger than {self.max_value_bytes} bytes")
+        return data
+
+
+class MemorySessionStore(SessionStore):
+    """Process-local store; data is lost on restart and not shared between workers."""
+
+    def __init__(self, **limits):
+        super().__init__(**limits)
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+        self.total_bytes = 0
+        self._last_evict = 0.0
+
+    def get(self, namespace: str, key: str, default=None):
+        with self.lock:
+            entry = self.entries.get((namespace, key))
+        if entry is None or entry[1] < time.time():
+            return default
+        return json.loads(entry[0])
+
+    def set(self, namespace: str, key: str, value, ttl: float | None = None) -> None:
+        data = self._encode(value)
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            self._pop((namespace, key))
+            self.entries[(namespace, key)] = (data, expires)
+            self.total_bytes += len(data.encode("utf-8"))
+            self._trim()
+        if time.time() - self._last_evict >= EVICT_INTERVAL_SECONDS:
+            self.evict()
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self.lock:
+            self._pop((namespace, key))
+
+    def evict(self) -> None:
+        with self.lock:
+            self._last_evict = time.time()
+            for entry_key in [k for k, (_, expires) in self.entries.items() if expires < self._last_evict]:
+                self._pop(entry_key)
+            self._trim()
+
+    def _trim(self) -> None:
+        # Entries are kept in write order, so the oldest is always first
+        while self.entries and (len(self.entries) > self.max_entries
+                                or self.total_bytes > self.max_total_bytes):
+            self._pop(next(iter(self.entries)))
+
+    def _pop(self, entry_key) -> None:
+        entry = self.entries.pop(entry_key, None)
+        if entry is not None:
+            self.total_bytes -= len(entry[0].encode("utf-8"))
+
+
+class SQLiteSessionStore(SessionStore):
+    """Store backed by one SQLite file, safe to share between processes."""
+
+    def __init__(self, path: Path | str, **limits):
+        super().__init__(**limits)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._last_evict = 0.0
+        with self.lock, self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection must not cross a fork, so each worker process opens its own
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, namespace: str, key: str, default=None):
+        with self.lock:
+            row = self._connect().execute(
+                "SELECT value FROM session_data WHERE namespace = ? AND key = ? AND expires >= ?",
+                (namespace, key, time.time()),
+            ).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value, ttl: float | None = None) -> None:
+        data = self._encode(value)
+        now = time.time()
+        with self.lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO session_data (namespace, key, value, size, expires, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, data, len(data.encode("utf-8")),
+                 now + (self.ttl if ttl is None else ttl), now),
+            )
+        if now - self._last_evict >= EVICT_INTERVAL_SECONDS:
+            self.evict()
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self.lock, self._connect() as conn:
+            conn.execute("DELETE FROM session_data WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def evict(self) -> None:
+        with self.lock, self._connect() as conn:
+            self._last_evict = time.time()
+            conn.execute("DELETE FROM session_data WHERE expires < ?", (self._last_evict,))
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM session_data").fetchone()
+            if count <= self.max_entries and total <= self.max_total_bytes:
+                return
+
+            # Walk from the oldest write until both caps are satisfied
+            excess_rows = max(0, count - self.max_entries)
+            excess_bytes = max(0, total - self.max_total_bytes)
+            cutoff = None
+            for updated, size in conn.execute("SELECT updated, size FROM session_data ORDER BY updated"):
+                if excess_rows <= 0 and excess_bytes <= 0:
+                    break
+                cutoff = updated
+                excess_rows -= 1
+                excess_bytes -= size
+            if cutoff is not None:
+                conn.execute("DELETE FROM session_data WHERE updated <= ?", (cutoff,))
+
+
+BACKENDS = {
+    "sqlite": SQLiteSessionStore,
+    "memory": MemorySessionStore,
+}
+
+
+def create_session_store(url: str, **limits) -> SessionStore:
+    """Build a store from a URL such as `sqlite:///path/to/sessions.sqlite3` or `memory://`."""
+    scheme, _, location = url.partition("://")
+    backend = BACKENDS.get(scheme)
+    if backend is None:
+        raise ValueError(f"Unknown session store {scheme!r}; expected one of {', '.join(BACKENDS)}")
+    if backend is MemorySessionStore:
+        return backend(**limits)
+    if not location:
+        raise ValueError(f"Session store URL {url!r} needs a path")
+    return backend(location, **limits)
@@ -21,7 +21,7 @@ print("PDF SIGNATURE SETUP - Dependency Check")
 print("=" * 60)
 
 try:
-    from pdf_signature import PDFSignature, check_dependencies
+    from pdf_signature import DEFAULT_BATCH_WORKERS, PDFSignature, check_dependencies
 except ImportError:
     print("\nERROR: pdf_signature.py not found!")
     print("Make sure you're running this from the correct directory.")
@@ -355,7 +355,15 @@ def main():
             print(f"Output directory: {output_path}")
             print()
 
-            results = signer.batch_sign_pdfs(input_path, output_path)
+            def show_progress(done, total, result):
+                status = "OK" if result['success'] else "FAIL"
+                print(f"  [{done}/{total}] {status} {os.path.basename(result['input_path'])}")
+
+            results = signer.batch_sign_pdfs(
+                input_path, output_path,
+                workers=DEFAULT_BATCH_WORKERS,
+                progress_callback=show_progress
+            )
 
             print()
             print("=" * 60)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Named signature presets with precomputed assets.
+
+A preset keeps a signature image and its placement settings under
+`~/.pdf_signature_presets/<name>/`, together with the processed RGBA image
+(opacity and rotation applied, used for previews) and every overlay PDF
+generated for it. Repeat jobs reuse those overlays instead of running
+ReportLab again, and `PresetStore.signer()` keeps warm `PDFSignature`
+instances per process so the web interface does not rebuild one per request.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+from pdf_signature import PDFSignature
+
+
+DEFAULT_PRESET_DIR = Path.home() / ".pdf_signature_presets"
+PRESET_FILE = "preset.json"
+IMAGE_FILE = "signature.png"
+PROCESSED_FILE = "processed.png"
+OVERLAY_DIR = "overlays"
+MAX_CACHED_SIGNERS = 32
+
+PRESET_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9 _.-]{0,63}$")
+
+
+@dataclass
+class SignaturePreset:
+    name: str
+    position: str = "bottom-left"
+    scale: float = 0.3
+    x_offset: float = 0.5
+    y_offset: float = 0.5
+    opacity: float = 1.0
+    rotation: int = 0
+
+    @property
+    def settings(self) -> dict:
+        """Keyword arguments for PDFSignature."""
+        return {field.name: getattr(self, field.name) for field in fields(self) if field.name != "name"}
+
+
+class PresetStore:
+    """Directory of signature presets."""
+
+    def __init__(self, directory: Path | str = DEFAULT_PRESET_DIR):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._signers: OrderedDict[tuple, PDFSignature] = OrderedDict()
+
+    def _preset_dir(self, name: str) -> Path:
+        if not PRESET_NAME_RE.match(name or "") or name.strip(". ") != name:
+            raise ValueError(
+                "Preset names use letters, digits, spaces, '.', '_' or '-' (up to 64 characters)"
+            )
+        return self.directory / name
+
+    def names(self) -> list[str]:
+        return sorted(path.parent.name for path in self.directory.glob(f"*/{PRESET_FILE}"))
+
+    def load(self, name: str) -> SignaturePreset:
+        path = self._preset_dir(name) / PRESET_FILE
+        if not path.exists():
+            raise KeyError(f"No signature preset named {name!r}")
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        known = {field.name for field in fields(SignaturePreset)}
+        return SignaturePreset(**{key: value for key, value in data.items() if key in known})
+
+    def presets(self) -> list[SignaturePreset]:
+        return [self.load(name) for name in self.names()]
+
+    def image_path(self, name: str) -> Path:
+        return self._preset_dir(name) / IMAGE_FILE
+
+    def processed_image_path(self, name: str) -> Path:
+        return self._preset_dir(name) / PROCESSED_FILE
+
+    def save(self, name: str, signature_image_path: Path | str, **settings) -> SignaturePreset:
+        """Create or replace a preset; settings are PDFSignature placement arguments."""
+        preset_dir = self._preset_dir(name)
+        preset = SignaturePreset(name=name, **settings)
+
+        # Validates the image and every setting before anything is written
+        signer = PDFSignature(str(signature_image_path), **preset.settings)
+        processed, _, _ = signer._get_processed_signature_bytes()
+
+        staging = self.directory / f".{name}.saving"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        shutil.copyfile(signature_image_path, staging / IMAGE_FILE)
+        (staging / PROCESSED_FILE).write_bytes(processed)
+        with open(staging / PRESET_FILE, "w", encoding="utf-8") as handle:
+            json.dump(asdict(preset), handle, indent=2)
+
+        # Old overlays were drawn with the old settings, so they go too
+        self._forget(name)
+        shutil.rmtree(preset_dir, ignore_errors=True)
+        os.replace(staging, preset_dir)
+        return preset
+
+    def delete(self, name: str) -> None:
+        preset_dir = self._preset_dir(name)
+        if not (preset_dir / PRESET_FILE).exists():
+            raise KeyError(f"No signature preset named {name!r}")
+        self._forget(name)
+        shutil.rmtree(preset_dir)
+
+    def signer(self, name: str, pages: str = "all", skip_pages: str = "", save_mode: str = "full") -> PDFSignature:
+        """Return a ready PDFSignature for a preset, reusing one built earlier in this process."""
+        preset_dir = self._preset_dir(name)
+        preset_file = preset_dir / PRESET_FILE
+        if not preset_file.exists():
+            raise KeyError(f"No signature preset named {name!r}")
+
+        key = (name, preset_file.stat().st_mtime_ns, pages, skip_pages, save_mode)
+        signer = self._signers.get(key)
+        if signer is not None:
+            self._signers.move_to_end(key)
+            return signer
+
+        preset = self.load(name)
+        signer = PDFSignature(
+            str(preset_dir / IMAGE_FILE),
+            pages=pages,
+            skip_pages=skip_pages,
+            save_mode=save_mode,
+            overlay_cache_dir=str(preset_dir / OVERLAY_DIR),
+            **preset.settings,
+        )
+        self._signers[key] = signer
+        while len(self._signers) > MAX_CACHED_SIGNERS:
+            self._signers.popitem(last=False)
+        return signer
+
+    def _forget(self, name: str) -> None:
+        for key in [key for key in self._signers if key[0] == name]:
+            del self._signers[key]
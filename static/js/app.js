@@ -13,6 +13,24 @@ function initializeApp() {
     setupFileInput();
     loadSettings();
     updateAPIKeyLink();
+    restoreAnalysis();
+}
+
+async function restoreAnalysis() {
+    // Pick up an unfinished review after a reload or server restart
+    try {
+        const response = await fetch('/api/analyze/results');
+        if (!response.ok) return;
+
+        const data = await response.json();
+        if (data.results.length > 0 && analysisResults.length === 0) {
+            analysisResults = data.results;
+            showResults();
+            showToast(`Restored ${analysisResults.length} analyzed file(s)`, 'info');
+        }
+    } catch (error) {
+        // Nothing to restore
+    }
 }
 
 // Drag & Drop Setup
@@ -154,12 +172,22 @@ async function analyzeFiles() {
 
         const data = await response.json();
 
-        if (data.success) {
-            analysisResults = data.results;
+        if (!data.success) {
+            showToast(data.error || 'Analysis failed', 'error');
+            return;
+        }
+
+        showJobProgress(data.job_id, 'Analyzing PDFs...');
+        const job = await followJob(data.job_id, { onProgress: updateJobProgress });
+
+        if (job.status === 'done') {
+            analysisResults = job.output.results;
             showResults();
             showToast('Analysis complete!', 'success');
+        } else if (job.status === 'cancelled') {
+            showToast('Analysis cancelled', 'warning');
         } else {
-            showToast(data.error || 'Analysis failed', 'error');
+            showToast(job.error || 'Analysis failed', 'error');
         }
     } catch (error) {
         showToast('Analysis error: ' + error.message, 'error');
@@ -263,20 +291,40 @@ async function organizeApproved() {
 
         const data = await response.json();
 
-        if (data.success) {
-            showToast(`Organized ${data.organized.length} file(s)!`, 'success');
+        if (!data.success) {
+            showToast(data.error || 'Organization failed', 'error');
+            return;
+        }
 
-            if (data.failed.length > 0) {
-                showToast(`${data.failed.length} file(s) failed`, 'error');
-            }
+        showJobProgress(data.job_id, 'Organizing PDFs...');
+        const job = await followJob(data.job_id, { onProgress: updateJobProgress });
 
-            // Reset
-            uploadedFiles = [];
-            analysisResults = [];
-            showUpload();
-        } else {
-            showToast(data.error || 'Organization failed', 'error');
+        if (job.status === 'failed') {
+            showToast(job.error || 'Organization failed', 'error');
+            return;
+        }
+
+        const organized = job.output.organized;
+
+        if (job.output.failed.length > 0) {
+            showToast(`${job.output.failed.length} file(s) failed`, 'error');
         }
+
+        if (job.status === 'cancelled') {
+            // Keep the files that were not moved so they can be organized later
+            showToast(`Cancelled after organizing ${organized.length} file(s)`, 'warning');
+            analysisResults = analysisResults.filter(r => !organized.includes(r.filename));
+            uploadedFiles = uploadedFiles.filter(f => !organized.includes(f.filename));
+            showResults();
+            return;
+        }
+
+        showToast(`Organized ${organized.length} file(s)!`, 'success');
+
+        // Reset
+        uploadedFiles = [];
+        analysisResults = [];
+        showUpload();
     } catch (error) {
         showToast('Organization error: ' + error.message, 'error');
     } finally {
@@ -379,7 +427,7 @@ async function showBrowser() {
         const data = await response.json();
 
         if (data.success) {
-            renderLibraryTree(data.tree, data.stats);
+            renderLibraryTree(data);
         } else {
             showToast(data.error || 'Failed to load library', 'error');
         }
@@ -397,9 +445,19 @@ async function showStats() {
     showProgress('Loading statistics...', '');
 
     try {
-        const response = await fetch('/api/stats');
+        const params = new URLSearchParams();
+        const since = document.getElementById('statsSince').value;
+        const until = document.getElementById('statsUntil').value;
+        if (since) params.set('since', since);
+        if (until) params.set('until', until);
+
+        const response = await fetch(`/api/stats?${params}`);
         const stats = await response.json();
 
+        if (stats.error) {
+            showToast(stats.error, 'error');
+            return;
+        }
         renderStats(stats);
     } catch (error) {
         showToast('Error loading stats: ' + error.message, 'error');
@@ -415,7 +473,8 @@ function hideAllSections() {
 }
 
 // Render Functions
-function renderLibraryTree(tree, stats) {
+function renderLibraryTree(data) {
+    const stats = data.stats;
     const statsBar = document.getElementById('libraryStats');
     statsBar.innerHTML = `
         <div><strong>Total PDFs:</strong> ${stats.total_pdfs}</div>
@@ -424,39 +483,93 @@ function renderLibraryTree(tree, stats) {
     `;
 
     const treeContainer = document.getElementById('libraryTree');
-    treeContainer.innerHTML = renderTreeItems(tree);
+    treeContainer.innerHTML = data.items.length === 0 ? '<p>No files found</p>' : '';
+    appendTreeItems(treeContainer, data);
 }
 
-function renderTreeItems(items) {
-    if (!items || items.length === 0) return '<p>No files found</p>';
+function appendTreeItems(container, data) {
+    // Folders load their contents on first click; long folders load a page at a time
+    container.querySelectorAll(':scope > .tree-load-more').forEach(button => button.remove());
+
+    data.items.forEach(item => {
+        const element = document.createElement('div');
 
-    return items.map(item => {
         if (item.type === 'folder') {
-            return `
-                <div class="folder-item">
-                    📁 ${item.name} (${item.pdf_count} PDFs)
-                    <div class="folder-children">
-                        ${renderTreeItems(item.children)}
-                    </div>
-                </div>
+            element.className = 'folder-item';
+            element.innerHTML = `
+                <div class="folder-label">📁 ${item.name} (${item.pdf_count} PDFs)</div>
+                <div class="folder-children" style="display: none;"></div>
             `;
+            if (item.has_children) {
+                element.querySelector('.folder-label').addEventListener('click', () => {
+                    toggleFolder(element, item.path);
+                });
+            }
         } else {
-            return `
-                <div class="file-item-tree">
-                    📄 ${item.name} (${formatBytes(item.size)})
-                </div>
-            `;
+            element.className = 'file-item-tree';
+            element.textContent = `📄 ${item.name} (${formatBytes(item.size)})`;
         }
-    }).join('');
+
+        container.appendChild(element);
+    });
+
+    const loaded = data.offset + data.items.length;
+    if (loaded < data.total_items) {
+        const more = document.createElement('button');
+        more.className = 'btn btn-secondary tree-load-more';
+        more.textContent = `Load more (${data.total_items - loaded} remaining)`;
+        more.addEventListener('click', () => loadFolderPage(container, data.path, loaded));
+        container.appendChild(more);
+    }
 }
 
-function renderStats(stats) {
-    const container = document.getElementById('statsContent');
+async function toggleFolder(element, path) {
+    const children = element.querySelector('.folder-children');
+    const opening = children.style.display === 'none';
+    children.style.display = opening ? 'block' : 'none';
 
-    const categoryList = Object.entries(stats.categories || {})
+    if (opening && !children.dataset.loaded) {
+        children.dataset.loaded = 'true';
+        await loadFolderPage(children, path, 0);
+    }
+}
+
+async function loadFolderPage(container, path, offset) {
+    try {
+        const params = new URLSearchParams({ path: path, offset: offset });
+        const response = await fetch(`/api/browse?${params}`);
+        const data = await response.json();
+
+        if (data.success) {
+            appendTreeItems(container, data);
+        } else {
+            showToast(data.error || 'Failed to load folder', 'error');
+        }
+    } catch (error) {
+        showToast('Error loading folder: ' + error.message, 'error');
+    }
+}
+
+function renderBreakdown(counts, unit = 'PDFs') {
+    const rows = Object.entries(counts || {})
         .sort((a, b) => b[1] - a[1])
-        .map(([cat, count]) => `<div><strong>${cat}:</strong> ${count} PDFs</div>`)
+        .map(([name, count]) => `<div><strong>${name}:</strong> ${count} ${unit}</div>`)
         .join('');
+    return rows || '<p>No data yet</p>';
+}
+
+function renderStats(stats) {
+    const container = document.getElementById('statsContent');
+
+    const days = Object.entries(stats.days || {});
+    const busiest = Math.max(1, ...days.map(([, count]) => count));
+    const dayList = days.slice(-31).map(([day, count]) => `
+        <div class="stats-day">
+            <span>${day}</span>
+            <progress max="${busiest}" value="${count}"></progress>
+            <span>${count}</span>
+        </div>
+    `).join('');
 
     container.innerHTML = `
         <div class="stat-card">
@@ -473,7 +586,17 @@ function renderStats(stats) {
         </div>
         <div class="section">
             <h3>Category Breakdown</h3>
-            ${categoryList || '<p>No data yet</p>'}
+            ${renderBreakdown(stats.categories)}
+        </div>
+        <div class="section">
+            <h3>By Provider</h3>
+            ${renderBreakdown(stats.providers)}
+            <h3>By Confidence</h3>
+            ${renderBreakdown(stats.confidence)}
+        </div>
+        <div class="section">
+            <h3>Per Day</h3>
+            ${dayList || '<p>No dated entries yet</p>'}
         </div>
     `;
 }
@@ -487,6 +610,50 @@ function showProgress(message, detail) {
 
 function hideProgress() {
     document.getElementById('progressOverlay').style.display = 'none';
+    document.getElementById('progressCancel').style.display = 'none';
+}
+
+// Background jobs
+function followJob(jobId, handlers = {}) {
+    // Resolves with the job's final summary; progress arrives over Server-Sent Events
+    return new Promise((resolve, reject) => {
+        const events = new EventSource(`/api/jobs/${jobId}/events`);
+
+        events.addEventListener('progress', (event) => {
+            const data = JSON.parse(event.data);
+            if (handlers.onProgress) handlers.onProgress(data);
+        });
+
+        events.addEventListener('done', (event) => {
+            events.close();
+            resolve(JSON.parse(event.data));
+        });
+
+        events.onerror = () => {
+            // EventSource reconnects by itself unless the server refused the stream
+            if (events.readyState === EventSource.CLOSED) {
+                reject(new Error('Lost connection to background job'));
+            }
+        };
+    });
+}
+
+function showJobProgress(jobId, message) {
+    showProgress(message, 'Starting...');
+    const cancelButton = document.getElementById('progressCancel');
+    cancelButton.style.display = 'inline-block';
+    cancelButton.disabled = false;
+    cancelButton.onclick = async () => {
+        cancelButton.disabled = true;
+        document.getElementById('progressDetail').textContent = 'Cancelling...';
+        await fetch(`/api/jobs/${jobId}/cancel`, { method: 'POST' });
+    };
+}
+
+function updateJobProgress(data) {
+    const detail = data.result ? data.result.filename : data.message;
+    document.getElementById('progressDetail').textContent =
+        `${data.completed} / ${data.total}${detail ? ' - ' + detail : ''}`;
 }
 
 function showToast(message, type = 'info') {
@@ -526,13 +693,17 @@ let signatureConfig = {
     yOffset: 0.5,
     opacity: 1.0,
     rotation: 0,
+    preset: null,
     pdfs: []
 };
 
+let signaturePresets = [];
+
 function showSignature() {
     hideAllSections();
     document.getElementById('signatureSection').style.display = 'block';
     setupSignatureDragDrop();
+    loadSignaturePresets();
 }
 
 function setupSignatureDragDrop() {
@@ -657,6 +828,105 @@ async function uploadSignatureImage(file) {
     }
 }
 
+async function loadSignaturePresets() {
+    try {
+        const response = await fetch('/api/signature/presets');
+        const result = await response.json();
+        signaturePresets = result.presets || [];
+
+        const select = document.getElementById('presetSelect');
+        select.innerHTML = '<option value="">Choose a preset...</option>' +
+            signaturePresets.map(preset => `<option value="${preset.name}">${preset.name}</option>`).join('');
+        document.getElementById('signaturePresetGroup').style.display =
+            signaturePresets.length > 0 ? 'block' : 'none';
+    } catch (error) {
+        console.error('Failed to load presets:', error);
+    }
+}
+
+function selectPreset(name) {
+    const preset = signaturePresets.find(p => p.name === name);
+    const preview = document.getElementById('presetPreview');
+    signatureConfig.preset = null;
+
+    if (!preset) {
+        preview.style.display = 'none';
+        return;
+    }
+
+    selectPosition(preset.position);
+    document.getElementById('scaleSlider').value = Math.round(preset.scale * 100);
+    document.getElementById('xOffsetSlider').value = preset.xOffset;
+    document.getElementById('yOffsetSlider').value = preset.yOffset;
+    document.getElementById('opacitySlider').value = Math.round(preset.opacity * 100);
+    document.getElementById('rotationSlider').value = preset.rotation;
+    updateScale(Math.round(preset.scale * 100));
+    updateXOffset(preset.xOffset);
+    updateYOffset(preset.yOffset);
+    updateOpacity(Math.round(preset.opacity * 100));
+    updateRotation(preset.rotation);
+
+    signatureConfig.preset = preset;
+    preview.src = preset.preview;
+    preview.style.display = 'block';
+
+    document.getElementById('signatureConfigStep').style.display = 'block';
+    document.getElementById('signaturePdfStep').style.display = 'block';
+    renderPreviewCanvas();
+}
+
+function presetMatchesConfig() {
+    const preset = signatureConfig.preset;
+    return Boolean(preset) &&
+        preset.position === signatureConfig.position &&
+        Math.abs(preset.scale - signatureConfig.scale) < 0.001 &&
+        Math.abs(preset.xOffset - signatureConfig.xOffset) < 0.001 &&
+        Math.abs(preset.yOffset - signatureConfig.yOffset) < 0.001 &&
+        Math.abs(preset.opacity - signatureConfig.opacity) < 0.001 &&
+        preset.rotation === signatureConfig.rotation;
+}
+
+async function saveSignaturePreset() {
+    if (!signatureConfig.signatureImageName) {
+        showToast('Upload a signature image to save it as a preset', 'warning');
+        return;
+    }
+
+    const name = prompt('Preset name:');
+    if (!name) return;
+
+    try {
+        const response = await fetch('/api/signature/presets', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                name: name.trim(),
+                config: {
+                    position: signatureConfig.position,
+                    scale: signatureConfig.scale,
+                    xOffset: signatureConfig.xOffset,
+                    yOffset: signatureConfig.yOffset,
+                    opacity: signatureConfig.opacity,
+                    rotation: signatureConfig.rotation
+                }
+            })
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            await loadSignaturePresets();
+            showToast(`Preset "${result.preset.name}" saved`, 'success');
+        } else {
+            showToast('Error: ' + result.error, 'error');
+        }
+    } catch (error) {
+        showToast('Saving preset failed: ' + error.message, 'error');
+    }
+}
+
 async function uploadPdfsForSigning(files) {
     const formData = new FormData();
     files.forEach(file => formData.append('files', file));
@@ -838,7 +1108,8 @@ function renderPreviewCanvas() {
 }
 
 async function processSignature() {
-    if (!signatureConfig.signatureImageName) {
+    const usePreset = presetMatchesConfig();
+    if (!usePreset && !signatureConfig.signatureImageName) {
         showToast('Please upload a signature image first', 'warning');
         return;
     }
@@ -849,15 +1120,14 @@ async function processSignature() {
     }
 
     try {
-        showProgress('Signing PDFs...', `Processing ${signatureConfig.pdfs.length} files`);
-
-        const response = await fetch('/api/signature/process', {
+        const response = await fetch('/api/signature/jobs', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
             },
             body: JSON.stringify({
                 files: signatureConfig.pdfs,
+                preset: usePreset ? signatureConfig.preset.name : null,
                 config: {
                     pages: signatureConfig.pages,
                     skipPages: signatureConfig.skipPages,
@@ -874,55 +1144,95 @@ async function processSignature() {
         const result = await response.json();
 
         if (result.success) {
-            // Show results
-            const resultsDiv = document.getElementById('signatureResults');
-            const filesList = document.getElementById('signedFilesList');
-
-            filesList.innerHTML = `
-                <div class="result-summary">
-                    <p><strong>Successfully signed: ${result.signed.length} PDFs</strong></p>
-                    ${result.failed.length > 0 ? `<p class="error">Failed: ${result.failed.length} PDFs</p>` : ''}
-                </div>
-                <div class="signed-files">
-                    ${result.signed.map(file => `
-                        <div class="file-card">
-                            <div class="file-info">
-                                <strong>${file.filename}</strong>
-                                <small>Pages signed: ${file.pages_signed} / ${file.total_pages}</small>
-                            </div>
-                            <a href="/api/signature/download/${file.filename}" class="btn btn-sm btn-primary" download>
-                                Download
-                            </a>
-                        </div>
-                    `).join('')}
-                    ${result.failed.length > 0 ? `
-                        <div class="failed-files">
-                            <h4>Failed Files:</h4>
-                            ${result.failed.map(file => `
-                                <div class="file-card error">
-                                    <strong>${file.filename}</strong>
-                                    <small>${file.error}</small>
-                                </div>
-                            `).join('')}
-                        </div>
-                    ` : ''}
-                </div>
-            `;
-
-            resultsDiv.style.display = 'block';
-            document.getElementById('signaturePdfStep').style.display = 'none';
-
-            showToast(`Successfully signed ${result.signed.length} PDFs`, 'success');
+            followSignatureJob(result.job_id, result.total);
         } else {
             showToast('Error: ' + result.error, 'error');
         }
     } catch (error) {
         showToast('Processing failed: ' + error.message, 'error');
-    } finally {
-        hideProgress();
     }
 }
 
+function followSignatureJob(jobId, total) {
+    // Results are listed as each file finishes, so downloads can start early
+    const jobUrl = `/api/signature/jobs/${jobId}`;
+    const resultsDiv = document.getElementById('signatureResults');
+    const filesList = document.getElementById('signedFilesList');
+    const started = Date.now();
+    let signed = 0;
+    let failed = 0;
+
+    filesList.innerHTML = `
+        <div class="result-summary">
+            <p><strong id="signJobStatus">Signing 0 / ${total} PDFs...</strong></p>
+            <p><small id="signJobRate"></small></p>
+            <a href="${jobUrl}/zip" class="btn btn-sm btn-primary" download>Download all (zip)</a>
+        </div>
+        <div class="signed-files" id="signedFileCards"></div>
+        <div class="failed-files" id="failedFileCards" style="display: none;">
+            <h4>Failed Files:</h4>
+        </div>
+    `;
+    resultsDiv.style.display = 'block';
+    document.getElementById('signaturePdfStep').style.display = 'none';
+
+    const events = new EventSource(`${jobUrl}/events`);
+
+    events.addEventListener('progress', (event) => {
+        const data = JSON.parse(event.data);
+        const file = data.result;
+        const card = document.createElement('div');
+
+        if (file.success) {
+            signed++;
+            card.className = 'file-card';
+            card.innerHTML = `
+                <div class="file-info">
+                    <strong>${file.filename}</strong>
+                    <small>Pages signed: ${file.pages_signed} / ${file.total_pages}</small>
+                </div>
+                <a href="${jobUrl}/files/${encodeURIComponent(file.filename)}" class="btn btn-sm btn-primary" download>
+                    Download
+                </a>
+            `;
+            document.getElementById('signedFileCards').appendChild(card);
+        } else {
+            failed++;
+            card.className = 'file-card error';
+            card.innerHTML = `<strong>${file.filename}</strong><small>${file.error}</small>`;
+            const failedDiv = document.getElementById('failedFileCards');
+            failedDiv.appendChild(card);
+            failedDiv.style.display = 'block';
+        }
+
+        const seconds = (Date.now() - started) / 1000;
+        document.getElementById('signJobStatus').textContent =
+            `Signing ${data.completed} / ${data.total} PDFs...`;
+        document.getElementById('signJobRate').textContent =
+            `${(data.completed / Math.max(seconds, 0.001)).toFixed(1)} files/s`;
+    });
+
+    events.addEventListener('done', (event) => {
+        events.close();
+        const summary = JSON.parse(event.data);
+        if (summary.status === 'failed') {
+            document.getElementById('signJobStatus').textContent = `Signing stopped: ${summary.error}`;
+            showToast('Error: ' + summary.error, 'error');
+            return;
+        }
+        document.getElementById('signJobStatus').textContent =
+            `Successfully signed: ${signed} PDFs` + (failed > 0 ? ` (failed: ${failed})` : '');
+        showToast(`Successfully signed ${signed} PDFs`, 'success');
+    });
+
+    events.onerror = () => {
+        // EventSource reconnects by itself and resumes from the last event ID
+        if (events.readyState === EventSource.CLOSED) {
+            showToast('Lost connection to signing job', 'error');
+        }
+    };
+}
+
 function clearSignPdfs() {
     signatureConfig.pdfs = [];
     document.getElementById('signPdfList').style.display = 'none';
@@ -941,10 +1251,13 @@ function resetSignature() {
         yOffset: 0.5,
         opacity: 1.0,
         rotation: 0,
+        preset: null,
         pdfs: []
     };
 
     document.getElementById('signaturePreviewArea').style.display = 'none';
+    document.getElementById('presetSelect').value = '';
+    document.getElementById('presetPreview').style.display = 'none';
     document.getElementById('signatureConfigStep').style.display = 'none';
     document.getElementById('signaturePdfStep').style.display = 'none';
     document.getElementById('signatureResults').style.display = 'none';
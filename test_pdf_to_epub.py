@@ -4,14 +4,35 @@ Smoke tests for the PDF to Markdown converter.
 Run with: python test_pdf_to_epub.py
 """
 
+import json
 import sys
 import tempfile
 from pathlib import Path
 
+from PIL import Image, ImageDraw, ImageFont
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject, NumberObject
 from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
-from pdf_to_epub import PdfToMarkdownConverter
+from pdf_to_epub import (
+    EXTRACTION_BACKENDS,
+    FontTable,
+    PdfToMarkdownConverter,
+    TableStage,
+    get_backend,
+    render_markdown,
+)
+from pdf_ocr import PdfOcr, page_content_hash, tesseract_available
+from rag_chunks import ChunkUnit, chunk_units
+
+try:
+    import fitz
+except ImportError:
+    fitz = None
 
 
 def create_sample_pdf(target: Path) -> Path:
@@ -30,11 +51,180 @@ def create_sample_pdf(target: Path) -> Path:
     return target
 
 
+def create_code_pdf(target: Path) -> Path:
+    pdf = canvas.Canvas(str(target), pagesize=letter)
+    pdf.setTitle("Code Samples")
+    for page in range(1, 3):
+        pdf.setFont("Helvetica-Bold", 16)
+        pdf.drawString(72, 720, f"Chapter {page} Overview")
+        pdf.setFont("Helvetica", 11)
+        pdf.drawString(72, 696, "Plain body text introduces the listing below.")
+        pdf.setFont("Courier", 10)
+        pdf.drawString(96, 672, "def main():")
+        pdf.drawString(96, 660, "    return 0")
+        pdf.setFont("Helvetica", 11)
+        pdf.drawString(72, 636, "- A bulleted note after the code")
+        pdf.drawString(300, 40, str(page))
+        pdf.showPage()
+    pdf.save()
+    return target
+
+
+SECTION_NAMES = ["First", "Second", "Third", "Fourth"]
+
+
+def create_report_pdf(target: Path, pages: int = 4) -> Path:
+    pdf = canvas.Canvas(str(target), pagesize=letter)
+    for page in range(1, pages + 1):
+        pdf.setFont("Helvetica", 9)
+        pdf.drawString(72, 760, "ACME Annual Report")
+        pdf.drawString(72, 30, f"Confidential - Page {page} of {pages}")
+        pdf.setFont("Helvetica", 12)
+        pdf.drawString(72, 700, f"{SECTION_NAMES[page - 1]} results stay in the output.")
+        pdf.drawString(72, 684, f"Revenue notes for the {SECTION_NAMES[page - 1].lower()} quarter.")
+        pdf.showPage()
+    pdf.save()
+    return target
+
+
+def create_chapter_pdf(target: Path, pages: int = 4) -> Path:
+    pdf = canvas.Canvas(str(target), pagesize=letter)
+    for page in range(1, pages + 1):
+        pdf.setFont("Helvetica-Bold", 16)
+        pdf.drawString(72, 740, f"Chapter {page} Summary")
+        pdf.setFont("Helvetica", 12)
+        pdf.drawString(72, 700, f"Body text of chapter {page}.")
+        pdf.setFont("Helvetica", 9)
+        pdf.drawString(300, 30, f"- {page} -")
+        pdf.showPage()
+    pdf.save()
+    return target
+
+
+def create_two_column_pdf(target: Path) -> Path:
+    pdf = canvas.Canvas(str(target), pagesize=letter)
+    pdf.setFont("Helvetica-Bold", 18)
+    pdf.drawString(150, 720, "A Study Of Column Layouts In Papers")
+    pdf.setFont("Helvetica", 10)
+    for row in range(8):
+        y = 680 - row * 14
+        pdf.drawString(72, y, f"left column words {row} continue here")
+        pdf.drawString(320, y, f"right column words {row} continue here")
+    pdf.save()
+    return target
+
+
+def create_hanging_list_pdf(target: Path) -> Path:
+    # Vera ships with reportlab and has a real bullet glyph
+    pdfmetrics.registerFont(TTFont("Vera", "Vera.ttf"))
+    pdf = canvas.Canvas(str(target), pagesize=letter)
+    pdf.setFont("Vera", 11)
+    pdf.drawString(72, 720, "The steps below describe the whole procedure in order.")
+    for index in range(6):
+        y = 690 - index * 16
+        pdf.drawString(72, y, f"{index + 1}.")
+        pdf.drawString(96, y, f"Numbered step {index + 1} explains one part of the work")
+    pdf.showPage()
+    pdf.setFont("Vera", 11)
+    pdf.drawString(72, 720, "Bulleted notes follow after this sentence.")
+    for index in range(6):
+        y = 690 - index * 16
+        pdf.drawString(90, y, "\u2022")
+        pdf.drawString(108, y, f"Bullet note {index + 1} adds a detail to the list")
+    pdf.save()
+    return target
+
+
+def create_table_pdf(target: Path) -> Path:
+    pdf = canvas.Canvas(str(target), pagesize=letter)
+    pdf.setFont("Helvetica", 12)
+    pdf.drawString(72, 720, "Quarterly figures are listed below.")
+    rows = [("Region", "Sales"), ("North", "120"), ("South", "95")]
+    xs = [72, 222, 372]
+    ys = [700, 680, 660, 640]
+    for y in ys:
+        pdf.line(xs[0], y, xs[-1], y)
+    for x in xs:
+        pdf.line(x, ys[0], x, ys[-1])
+    for row_index, row in enumerate(rows):
+        for col_index, value in enumerate(row):
+            pdf.drawString(xs[col_index] + 6, ys[row_index] - 14, value)
+    pdf.drawString(72, 600, "Text after the table stays a paragraph.")
+    pdf.showPage()
+    pdf.drawString(72, 720, "A second page without any ruling lines.")
+    pdf.save()
+    return target
+
+
+def create_boxed_pdf(target: Path) -> Path:
+    pdf = canvas.Canvas(str(target), pagesize=letter)
+    # Page background and a single framed callout: no table
+    pdf.setFillColorRGB(0.95, 0.95, 0.9)
+    pdf.rect(0, 0, 612, 792, stroke=0, fill=1)
+    pdf.setFillColorRGB(0, 0, 0)
+    pdf.rect(72, 600, 300, 80)
+    pdf.drawString(84, 650, "Remember to save your work.")
+    pdf.showPage()
+    # A table drawn as one box per cell
+    for row in range(3):
+        for column in range(2):
+            pdf.rect(72 + column * 150, 700 - row * 20, 150, 20)
+            pdf.drawString(78 + column * 150, 706 - row * 20, f"Cell {row}.{column}")
+    pdf.showPage()
+    pdf.save()
+    return target
+
+
+def create_scanned_pdf(target: Path) -> Path:
+    image = Image.new("RGB", (1275, 400), "white")
+    ImageDraw.Draw(image).text((60, 150), "Scanned page text for OCR", fill="black", font=ImageFont.load_default(48))
+    pdf = canvas.Canvas(str(target), pagesize=letter)
+    pdf.setFont("Helvetica", 12)
+    pdf.drawString(72, 720, "This first page has a normal text layer.")
+    pdf.showPage()
+    pdf.drawImage(ImageReader(image), 0, 600, width=612, height=192)
+    pdf.showPage()
+    pdf.save()
+    return target
+
+
 def assert_contains(text: str, expected: str):
     if expected not in text:
         raise AssertionError(f"Expected to find {expected!r}")
 
 
+def create_form_page(pixel: bytes):
+    """A page whose only image sits inside a Form XObject."""
+    page = PdfWriter().add_blank_page(width=100, height=100)
+
+    image = DecodedStreamObject()
+    image.set_data(pixel)
+    image.update({
+        NameObject("/Type"): NameObject("/XObject"),
+        NameObject("/Subtype"): NameObject("/Image"),
+        NameObject("/Width"): NumberObject(1),
+        NameObject("/Height"): NumberObject(1),
+        NameObject("/ColorSpace"): NameObject("/DeviceRGB"),
+        NameObject("/BitsPerComponent"): NumberObject(8),
+    })
+    form = DecodedStreamObject()
+    form.set_data(b"q 100 0 0 100 0 0 cm /Im0 Do Q")
+    form.update({
+        NameObject("/Type"): NameObject("/XObject"),
+        NameObject("/Subtype"): NameObject("/Form"),
+        NameObject("/Resources"): DictionaryObject({
+            NameObject("/XObject"): DictionaryObject({NameObject("/Im0"): image}),
+        }),
+    })
+    content = DecodedStreamObject()
+    content.set_data(b"/Fm0 Do")
+    page[NameObject("/Contents")] = content
+    page[NameObject("/Resources")] = DictionaryObject({
+        NameObject("/XObject"): DictionaryObject({NameObject("/Fm0"): form}),
+    })
+    return page
+
+
 def test_single_file_conversion():
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_path = Path(temp_dir)
@@ -58,8 +248,279 @@ def test_single_file_conversion():
         assert_contains(content, "1. First numbered item")
 
 
+def test_metadata_title_fallback():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        pdf_path = temp_path / "plain.pdf"
+        pdf = canvas.Canvas(str(pdf_path), pagesize=letter)
+        pdf.setTitle("Metadata Only Title")
+        pdf.setFont("Helvetica", 12)
+        pdf.drawString(72, 720, "Every line on this page uses the same font size.")
+        pdf.drawString(72, 704, "So the title has to come from the document info.")
+        pdf.save()
+
+        title, blocks = PdfToMarkdownConverter().extract_blocks(pdf_path)
+        if title != "Metadata Only Title":
+            raise AssertionError(f"Expected metadata title, got {title!r}")
+        if not blocks:
+            raise AssertionError("Expected body text blocks")
+
+
+def test_running_headers_removed():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = create_report_pdf(Path(temp_dir) / "report.pdf")
+        title, blocks = PdfToMarkdownConverter().extract_blocks(pdf_path)
+        content = render_markdown(title, blocks)
+
+        for name in SECTION_NAMES:
+            assert_contains(content, f"{name} results stay in the output.")
+        body = content.split("\n", 1)[1]
+        if "ACME Annual Report" in body or "Confidential" in body:
+            raise AssertionError("Running header/footer should be removed from the body")
+
+
+def test_repeated_chapter_titles_kept():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = create_chapter_pdf(Path(temp_dir) / "chapters.pdf")
+        title, blocks = PdfToMarkdownConverter().extract_blocks(pdf_path)
+        content = render_markdown(title, blocks)
+
+        for page in range(1, 5):
+            assert_contains(content, f"Chapter {page} Summary")
+        if "- 2 -" in content:
+            raise AssertionError("Page number footer should be removed")
+
+
+def test_two_column_order():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = create_two_column_pdf(Path(temp_dir) / "paper.pdf")
+        title, blocks = PdfToMarkdownConverter().extract_blocks(pdf_path)
+        content = render_markdown(title, blocks)
+
+        assert_contains(content, "# A Study Of Column Layouts In Papers")
+        assert_contains(content, "left column words 0 continue here left column words 1 continue here")
+        if content.index("left column words 7") > content.index("right column words 0"):
+            raise AssertionError("Left column should be read before the right column")
+
+
+def test_hanging_indent_lists():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = create_hanging_list_pdf(Path(temp_dir) / "steps.pdf")
+        content = render_markdown(*PdfToMarkdownConverter().extract_blocks(pdf_path))
+
+        assert_contains(content, "1. Numbered step 1 explains one part of the work\n1. Numbered step 2")
+        assert_contains(content, "  - Bullet note 1 adds a detail to the list\n  - Bullet note 2")
+        if "1. 2. 3." in content:
+            raise AssertionError("List markers should not be read as a separate column")
+
+
+def test_table_extraction():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = create_table_pdf(Path(temp_dir) / "table.pdf")
+        converter = PdfToMarkdownConverter(tables=True)
+        title, blocks = converter.extract_blocks(pdf_path)
+        content = render_markdown(title, blocks)
+
+        assert_contains(content, "| Region | Sales |\n| --- | --- |\n| North | 120 |\n| South | 95 |")
+        if "North 120" in content:
+            raise AssertionError("Table cells should not be repeated as paragraph text")
+        if not content.index("Quarterly figures") < content.index("| Region") < content.index("Text after the table"):
+            raise AssertionError("Table should stay between the surrounding paragraphs")
+        if sorted(converter.last_table_timings) != [1, 2]:
+            raise AssertionError(f"Expected per-page timings, got {converter.last_table_timings}")
+
+        second_path = create_table_pdf(Path(temp_dir) / "table2.pdf")
+        converter.extract_blocks(second_path)
+        expected = sorted((str(path), page) for path in (pdf_path, second_path) for page in (1, 2))
+        if sorted(converter.table_timings) != expected:
+            raise AssertionError(f"Expected timings for both files, got {sorted(converter.table_timings)}")
+        assert_contains(converter.table_timing_summary(), "over 4 page(s)")
+
+        # Worker processes hand their timings back to the parent converter
+        batch_dir = Path(temp_dir) / "batch"
+        batch_dir.mkdir()
+        create_table_pdf(batch_dir / "a.pdf")
+        create_table_pdf(batch_dir / "b.pdf")
+        parallel = PdfToMarkdownConverter(tables=True, workers=2)
+        parallel.convert(batch_dir, Path(temp_dir) / "out")
+        expected = sorted((str(batch_dir / name), page) for name in ("a.pdf", "b.pdf") for page in (1, 2))
+        if sorted(parallel.table_timings) != expected:
+            raise AssertionError(f"Expected timings from the workers, got {sorted(parallel.table_timings)}")
+
+        import pdfplumber
+
+        with pdfplumber.open(create_boxed_pdf(Path(temp_dir) / "boxes.pdf")) as boxed:
+            stage = TableStage()
+            if stage.page_has_grid(boxed.pages[0]):
+                raise AssertionError("A page background and a single box are not a table grid")
+            if not stage.page_has_grid(boxed.pages[1]):
+                raise AssertionError("Cell boxes that line up should count as a table grid")
+
+
+def test_jsonl_chunks():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        pdf_path = create_report_pdf(temp_path / "report.pdf")
+        output_dir = temp_path / "out"
+
+        results = PdfToMarkdownConverter(output_format="both").convert(pdf_path, output_dir)
+        if results != [output_dir / "report.md"] or not results[0].exists():
+            raise AssertionError(f"Expected Markdown output alongside chunks, got {results}")
+
+        records = [json.loads(line) for line in (output_dir / "report.jsonl").read_text(encoding="utf-8").splitlines()]
+        if not records:
+            raise AssertionError("Expected at least one chunk")
+        pages = sorted({page for record in records for page in record["pages"]})
+        if pages != [1, 2, 3, 4]:
+            raise AssertionError(f"Expected chunks to cover pages 1-4, got {pages}")
+        if records[0]["heading_path"][0] != records[0]["title"]:
+            raise AssertionError("Heading path should start with the document title")
+
+        small = PdfToMarkdownConverter(output_format="jsonl", chunk_tokens=20, chunk_overlap=10)
+        small_result = small.convert(pdf_path, temp_path / "small")[0]
+        small_records = [json.loads(line) for line in small_result.read_text(encoding="utf-8").splitlines()]
+        if len(small_records) <= len(records):
+            raise AssertionError("A smaller chunk size should produce more chunks")
+
+    units = [ChunkUnit(text=f"Sentence number {index} here.", heading_path=("Doc", "Intro"), location=1) for index in range(6)]
+    units.append(ChunkUnit(text="Next section text.", heading_path=("Doc", "Next"), location=2))
+    chunks = list(chunk_units(units, target_tokens=20, overlap_tokens=8))
+    if [chunk.heading_path for chunk in chunks][-1] != ("Doc", "Next") or "Next section" in chunks[-2].text:
+        raise AssertionError("Chunks must not cross heading boundaries")
+    intro = [chunk for chunk in chunks if chunk.heading_path == ("Doc", "Intro")]
+    if len(intro) < 2 or intro[1].text.split("\n\n")[0] not in intro[0].text:
+        raise AssertionError("Chunks split for size should overlap")
+
+
+def test_font_table():
+    fonts = FontTable()
+    bold_id = fonts.font_id("ABCDEF+Helvetica-BoldOblique")
+    mono_id = fonts.font_id("Courier")
+    if fonts.font_id("ABCDEF+Helvetica-BoldOblique") != bold_id:
+        raise AssertionError("Repeated font names should reuse their ID")
+    if len(fonts.profiles) != 2:
+        raise AssertionError(f"Expected 2 profiles, got {len(fonts.profiles)}")
+
+    profile = fonts[bold_id]
+    if (profile.family, profile.bold, profile.italic, profile.monospace) != ("Helvetica", True, True, False):
+        raise AssertionError(f"Unexpected profile {profile}")
+    if not fonts[mono_id].monospace:
+        raise AssertionError("Courier should be classified as monospace")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = create_code_pdf(Path(temp_dir) / "code.pdf")
+        fonts = FontTable()
+        _, lines = get_backend("pdfplumber").extract(pdf_path, fonts)
+        code_lines = [line for line in lines if line.monospace]
+        if not code_lines or any(fonts[line.font_id].family != "Courier" for line in code_lines):
+            raise AssertionError("Code lines should carry the Courier font ID")
+
+
+def test_backend_conformance():
+    if fitz is None:
+        print("SKIP PyMuPDF not installed")
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        fixtures = [
+            create_sample_pdf(temp_path / "book.pdf"),
+            create_code_pdf(temp_path / "code.pdf"),
+            create_two_column_pdf(temp_path / "paper.pdf"),
+        ]
+
+        for fixture in fixtures:
+            results = {name: get_backend(name).extract(fixture) for name in EXTRACTION_BACKENDS}
+            ref_title, ref_lines = results["pdfplumber"]
+
+            for name, (title, lines) in results.items():
+                if title != ref_title:
+                    raise AssertionError(f"{fixture.name}/{name}: title {title!r} != {ref_title!r}")
+                if len(lines) != len(ref_lines):
+                    raise AssertionError(f"{fixture.name}/{name}: {len(lines)} lines, expected {len(ref_lines)}")
+
+                for line, ref in zip(lines, ref_lines):
+                    same = (
+                        line.text == ref.text
+                        and line.page_number == ref.page_number
+                        and line.bold == ref.bold
+                        and line.monospace == ref.monospace
+                        and abs(line.size - ref.size) < 0.5
+                        and abs(line.x0 - ref.x0) < 1.0
+                        and abs(line.top - ref.top) <= ref.size * 0.15 + 1
+                        and abs(line.bottom - ref.bottom) <= ref.size * 0.15 + 1
+                    )
+                    if not same:
+                        raise AssertionError(f"{fixture.name}/{name}: {line} differs from {ref}")
+
+            markdown = {
+                name: render_markdown(*PdfToMarkdownConverter(engine=name).extract_blocks(fixture))
+                for name in EXTRACTION_BACKENDS
+            }
+            if len(set(markdown.values())) != 1:
+                raise AssertionError(f"{fixture.name}: backends rendered different Markdown")
+
+
+class RecordingOcr:
+    def __init__(self):
+        self.requested = []
+
+    def page_words(self, pdf_path, page_numbers):
+        self.requested.extend(page_numbers)
+        word = {"text": "recognized", "x0": 72.0, "x1": 140.0, "top": 100.0, "bottom": 112.0, "size": 12.0, "fontname": "OCR"}
+        return {number: [word] for number in page_numbers}
+
+
+def test_ocr_fallback():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        pdf_path = create_scanned_pdf(temp_path / "scan.pdf")
+        copy_path = create_scanned_pdf(temp_path / "copy.pdf")
+
+        pages = PdfReader(str(pdf_path)).pages
+        copy_pages = PdfReader(str(copy_path)).pages
+        if page_content_hash(pages[1]) != page_content_hash(copy_pages[1]):
+            raise AssertionError("Identical pages should share an OCR cache key")
+        if page_content_hash(pages[0]) == page_content_hash(pages[1]):
+            raise AssertionError("Different pages should not share an OCR cache key")
+        if page_content_hash(create_form_page(b"\x00\x00\x00")) == page_content_hash(create_form_page(b"\xff\xff\xff")):
+            raise AssertionError("Images inside Form XObjects should be part of the OCR cache key")
+        if page_content_hash(None) is not None:
+            raise AssertionError("Unreadable pages should not get an OCR cache key")
+
+        ocr = RecordingOcr()
+        _, lines = get_backend("pdfplumber").extract(pdf_path, ocr=ocr)
+        if ocr.requested != [2]:
+            raise AssertionError(f"Only the image-only page should be OCRed, got {ocr.requested}")
+        if [line.page_number for line in lines] != [1, 2] or lines[1].text != "recognized":
+            raise AssertionError("OCR lines should be merged in page order")
+
+        if not tesseract_available():
+            print("SKIP Tesseract not installed")
+            return
+
+        converter = PdfToMarkdownConverter()
+        converter.ocr = PdfOcr(cache_dir=temp_path / "cache", workers=2)
+        content = render_markdown(*converter.extract_blocks(pdf_path))
+        assert_contains(content, "Scanned page text")
+        if not list((temp_path / "cache").glob("*.json")):
+            raise AssertionError("OCR results should be cached by page hash")
+
+
 def main():
-    tests = [("Single File Conversion", test_single_file_conversion)]
+    tests = [
+        ("Single File Conversion", test_single_file_conversion),
+        ("Metadata Title Fallback", test_metadata_title_fallback),
+        ("Running Headers Removed", test_running_headers_removed),
+        ("Repeated Chapter Titles Kept", test_repeated_chapter_titles_kept),
+        ("Two Column Order", test_two_column_order),
+        ("Hanging Indent Lists", test_hanging_indent_lists),
+        ("Table Extraction", test_table_extraction),
+        ("JSONL Chunks", test_jsonl_chunks),
+        ("Font Table", test_font_table),
+        ("Backend Conformance", test_backend_conformance),
+        ("OCR Fallback", test_ocr_fallback),
+    ]
     failures = 0
 
     for name, func in tests:
@@ -4,13 +4,21 @@ Smoke tests for the PowerPoint to Markdown converter.
 Run with: python test_pptx_to_epub.py
 """
 
+import json
+import os
 import sys
 import tempfile
 from pathlib import Path
 
+from PIL import Image
 from pptx import Presentation
+from pptx.util import Pt
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
 
-from pptx_to_epub import PowerPointToMarkdownConverter
+import convert_to_markdown
+
+from pptx_to_epub import EXTRACTION_ENGINES, PowerPointToMarkdownConverter, get_engine
 
 
 def create_sample_pptx(target: Path) -> Path:
@@ -34,6 +42,69 @@ def create_sample_pptx(target: Path) -> Path:
     return target
 
 
+def create_rich_pptx(target: Path) -> Path:
+    presentation = Presentation()
+
+    cover = presentation.slides.add_slide(presentation.slide_layouts[0])
+    cover.shapes.title.text = "Rich Deck"
+    cover.placeholders[1].text = "A Subtitle Line"
+
+    slide = presentation.slides.add_slide(presentation.slide_layouts[5])
+    slide.shapes.title.text = "Numbers"
+    table = slide.shapes.add_table(3, 2, 1000000, 1500000, 6000000, 1500000).table
+    for row_index, row in enumerate([("Region", "Sales"), ("North", "120"), ("South | East", "95")]):
+        for col_index, value in enumerate(row):
+            table.cell(row_index, col_index).text = value
+
+    group = slide.shapes.add_group_shape()
+    frame = group.shapes.add_textbox(1000000, 3500000, 6000000, 1000000).text_frame
+    heading = frame.paragraphs[0]
+    run = heading.add_run()
+    run.text = "Grouped Key Points"
+    run.font.bold = True
+    body = frame.add_paragraph()
+    small = body.add_run()
+    small.text = "Plain body text inside a group."
+    small.font.size = Pt(12)
+    big = frame.add_paragraph().add_run()
+    big.text = "Large Callout Text"
+    big.font.size = Pt(28)
+    nested = frame.add_paragraph()
+    nested.text = "Nested bullet"
+    nested.level = 2
+
+    image_path = target.with_suffix(".png")
+    Image.new("RGB", (40, 30), "navy").save(image_path)
+    picture = slide.shapes.add_picture(str(image_path), 7000000, 1500000)
+    picture._element.nvPicPr.cNvPr.set("descr", "Bar chart of sales by region")
+    notes = slide.notes_slide.notes_text_frame
+    notes.text = "Mention the South region first."
+    notes.add_paragraph().text = "Pause for questions."
+
+    presentation.save(target)
+    return target
+
+
+class CrashingConverter(PowerPointToMarkdownConverter):
+    """Kills its worker process the first time it sees crash.pptx."""
+
+    def build_outputs(self, pptx_path: Path, output_path: Path) -> Path:
+        marker = pptx_path.with_suffix(".crashed")
+        if pptx_path.name == "crash.pptx" and not marker.exists():
+            marker.touch()
+            os._exit(1)
+        return super().build_outputs(pptx_path, output_path)
+
+
+class PoisonConverter(PowerPointToMarkdownConverter):
+    """Kills its worker process every time it sees 0-poison.pptx, which sorts first."""
+
+    def build_outputs(self, pptx_path: Path, output_path: Path) -> Path:
+        if pptx_path.name == "0-poison.pptx":
+            os._exit(1)
+        return super().build_outputs(pptx_path, output_path)
+
+
 def assert_contains(text: str, expected: str):
     if expected not in text:
         raise AssertionError(f"Expected to find {expected!r}")
@@ -62,8 +133,203 @@ def test_single_file_conversion():
         assert_contains(content, "- First bullet")
 
 
+def test_jsonl_chunks():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        pptx_path = create_sample_pptx(temp_path / "deck.pptx")
+        output_dir = temp_path / "out"
+
+        results = PowerPointToMarkdownConverter(output_format="jsonl").convert(pptx_path, output_dir)
+        if results != [output_dir / "deck.jsonl"]:
+            raise AssertionError(f"Expected a JSONL file, got {results}")
+        if (output_dir / "deck.md").exists():
+            raise AssertionError("JSONL-only mode should not write Markdown")
+
+        records = [json.loads(line) for line in results[0].read_text(encoding="utf-8").splitlines()]
+        by_slide = {tuple(record["slides"]): record for record in records}
+        intro = by_slide.get((1,))
+        if intro is None or intro["heading_path"] != ["Introduction", "Introduction"]:
+            raise AssertionError(f"Unexpected first-slide chunk: {intro}")
+        assert_contains(intro["text"], "- First bullet")
+        if (2,) not in by_slide:
+            raise AssertionError("Slide 2 should be chunked separately")
+
+
+def test_title_fallback():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pptx_path = Path(temp_dir) / "quarterly_update.pptx"
+        presentation = Presentation()
+        slide = presentation.slides.add_slide(presentation.slide_layouts[6])
+        slide.shapes.add_textbox(1000000, 1000000, 4000000, 1000000).text_frame.text = "Slide 1 recap"
+        presentation.save(pptx_path)
+
+        title, slides = PowerPointToMarkdownConverter().extract_slides(pptx_path)
+        if title != "quarterly update":
+            raise AssertionError(f"Untitled decks should fall back to the file name, got {title!r}")
+        if not slides[0].untitled or slides[0].title != "Slide 1":
+            raise AssertionError(f"Unexpected slide title {slides[0].title!r}")
+
+
+def test_batch_conversion():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        source_dir = temp_path / "decks"
+        (source_dir / "nested").mkdir(parents=True)
+        create_sample_pptx(source_dir / "a.pptx")
+        create_sample_pptx(source_dir / "nested" / "b.pptx")
+        (source_dir / "broken.pptx").write_bytes(b"not a zip file")
+        output_dir = temp_path / "out"
+
+        converter = PowerPointToMarkdownConverter(workers=2, incremental=True)
+        results = converter.convert(source_dir, output_dir)
+        if results != [output_dir / "a.md", output_dir / "nested" / "b.md"]:
+            raise AssertionError(f"Unexpected results {results}")
+        if [issue.source.name for issue in converter.failures] != ["broken.pptx"]:
+            raise AssertionError("A broken deck should be reported without aborting the batch")
+
+        rerun = PowerPointToMarkdownConverter(incremental=True)
+        if rerun.convert(source_dir, output_dir) != results or len(rerun.unchanged) != 2:
+            raise AssertionError("Unchanged decks should be skipped on the next run")
+
+        create_sample_pptx(source_dir / "a.pptx")
+        rerun.convert(source_dir, output_dir)
+        if [path.name for path in rerun.unchanged] != ["b.pptx"]:
+            raise AssertionError("A rewritten deck should be converted again")
+
+
+def test_incremental_outputs():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        source_dir = temp_path / "decks"
+        source_dir.mkdir()
+        create_sample_pptx(source_dir / "a.pptx")
+        create_sample_pptx(source_dir / "b.pptx")
+        output_dir = temp_path / "out"
+
+        converter = PowerPointToMarkdownConverter(output_format="both", incremental=True)
+        converter.convert(source_dir, output_dir)
+        (output_dir / "a.jsonl").unlink()
+        converter.convert(source_dir, output_dir)
+        if [path.name for path in converter.unchanged] != ["b.pptx"] or not (output_dir / "a.jsonl").exists():
+            raise AssertionError("A missing JSONL companion should trigger a rebuild")
+
+        saved = []
+
+        def progress(current, total, source, output, message):
+            if message is None:
+                saved.append(len(json.loads((fresh_dir / ".markdown_conversion_manifest.json").read_text())))
+
+        fresh_dir = output_dir / "fresh"
+        PowerPointToMarkdownConverter(incremental=True).convert(source_dir, fresh_dir, progress)
+        if saved != [1, 2]:
+            raise AssertionError(f"The manifest should be saved after each file, got {saved}")
+
+        crash_dir = temp_path / "crash"
+        crash_dir.mkdir()
+        for name in ("crash.pptx", "ok-1.pptx", "ok-2.pptx"):
+            create_sample_pptx(crash_dir / name)
+        crashing = CrashingConverter(workers=2, retries=1)
+        results = crashing.convert(crash_dir, temp_path / "crash-out")
+        if len(results) != 3 or crashing.failures:
+            raise AssertionError(f"A dead worker should be replaced and its files retried: {crashing.failures}")
+
+
+def test_crash_isolation():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        names = ["0-poison.pptx"] + [f"ok-{index}.pptx" for index in range(8)]
+        for name in names:
+            create_sample_pptx(temp_path / name)
+
+        for retries in (0, 1):
+            converter = PoisonConverter(workers=2, retries=retries)
+            results = converter.convert(temp_path, temp_path / f"out-{retries}")
+            failed = [failure.source.name for failure in converter.failures]
+            if len(results) != 8 or failed != ["0-poison.pptx"]:
+                raise AssertionError(f"Only the crashing file should fail (retries={retries}): {len(results)} {failed}")
+
+
+def test_engine_conformance():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        for fixture in (create_sample_pptx(temp_path / "deck.pptx"), create_rich_pptx(temp_path / "rich.pptx")):
+            results = {name: get_engine(name).extract(fixture) for name in EXTRACTION_ENGINES}
+            reference = results["python-pptx"]
+            for name, result in results.items():
+                if result != reference:
+                    raise AssertionError(f"{fixture.name}: {name} engine differs from python-pptx\n{result}\n{reference}")
+
+            rich = {name: get_engine(name, True, True).extract(fixture) for name in EXTRACTION_ENGINES}
+            if any(result != rich["python-pptx"] for result in rich.values()):
+                raise AssertionError(f"{fixture.name}: engines disagree on notes and alt text")
+
+        title, slides = get_engine("xml").extract(temp_path / "rich.pptx")
+        kinds = [block.kind for block in slides[1].blocks]
+        if title != "Rich Deck" or kinds != ["table", "heading", "paragraph", "heading", "list"]:
+            raise AssertionError(f"Unexpected rich deck structure: {title!r} {kinds}")
+
+
+def test_notes_and_alt_text():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        pptx_path = create_rich_pptx(temp_path / "rich.pptx")
+        converter = PowerPointToMarkdownConverter(include_notes=True, include_alt_text=True)
+        content = converter.convert(pptx_path, temp_path / "out")[0].read_text(encoding="utf-8")
+
+        assert_contains(content, "_Image: Bar chart of sales by region_")
+        assert_contains(content, "### Speaker Notes\n\nMention the South region first.\n\nPause for questions.")
+        if content.index("_Image:") > content.index("### Speaker Notes"):
+            raise AssertionError("Notes should follow the slide content")
+
+        plain = PowerPointToMarkdownConverter().convert(pptx_path, temp_path / "plain")[0].read_text(encoding="utf-8")
+        if "Speaker Notes" in plain or "_Image:" in plain:
+            raise AssertionError("Notes and alt text should be opt-in")
+
+
+def test_mixed_directory():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        source_dir = temp_path / "library"
+        source_dir.mkdir()
+        create_sample_pptx(source_dir / "deck.pptx")
+        pdf = canvas.Canvas(str(source_dir / "notes.pdf"), pagesize=letter)
+        pdf.drawString(72, 720, "A short PDF next to the deck.")
+        pdf.save()
+        (source_dir / "readme.txt").write_text("ignored", encoding="utf-8")
+        output_dir = temp_path / "out"
+
+        argv = ["--input", str(source_dir), "--output-dir", str(output_dir), "--workers", "2", "--incremental"]
+        if convert_to_markdown.main(argv) != 0:
+            raise AssertionError("Mixed conversion should succeed")
+        assert_contains((output_dir / "deck.md").read_text(encoding="utf-8"), "## 01. Introduction")
+        assert_contains((output_dir / "notes.md").read_text(encoding="utf-8"), "A short PDF next to the deck.")
+
+        scheduler = convert_to_markdown.build_scheduler()
+        scheduler.incremental = True
+        scheduler.convert(source_dir, output_dir)
+        if len(scheduler.unchanged) != 2:
+            raise AssertionError("Both formats should share one manifest")
+
+        create_sample_pptx(source_dir / "notes.pptx")
+        results = scheduler.convert(source_dir, output_dir)
+        names = sorted(path.name for path in results)
+        if names != ["deck.md", "notes.pdf.md", "notes.pptx.md"]:
+            raise AssertionError(f"Sources sharing a name should get separate outputs, got {names}")
+        assert_contains((output_dir / "notes.pdf.md").read_text(encoding="utf-8"), "A short PDF next to the deck.")
+
+
 def main():
-    tests = [("Single File Conversion", test_single_file_conversion)]
+    tests = [
+        ("Single File Conversion", test_single_file_conversion),
+        ("JSONL Chunks", test_jsonl_chunks),
+        ("Title Fallback", test_title_fallback),
+        ("Batch Conversion", test_batch_conversion),
+        ("Incremental Outputs", test_incremental_outputs),
+        ("Crash Isolation", test_crash_isolation),
+        ("Engine Conformance", test_engine_conformance),
+        ("Notes And Alt Text", test_notes_and_alt_text),
+        ("Mixed Directory", test_mixed_directory),
+    ]
     failures = 0
 
     for name, func in tests:
@@ -4,9 +4,12 @@ Unit Tests for PDF Signature Tool
 Run with: python test_signature.py
 """
 
+import json
 import os
+import shutil
 import sys
 import tempfile
+import time
 from pathlib import Path
 
 # Fix Windows console encoding issues
@@ -169,7 +172,11 @@ def test_page_selection():
             ('last', 10, 10, [10]),
             ('odd', None, 10, [1, 3, 5, 7, 9]),
             ('even', None, 10, [2, 4, 6, 8, 10]),
-            ('1-3,7,9-10', None, 10, [1, 2, 3, 7, 9, 10])
+            ('1-3,7,9-10', None, 10, [1, 2, 3, 7, 9, 10]),
+            ('8-', None, 10, [8, 9, 10]),
+            ('-1', None, 10, [10]),
+            ('1,-3--1', None, 10, [1, 8, 9, 10]),
+            ('2-4,3-6,50-', None, 10, [2, 3, 4, 5, 6])
         ]
 
         signers = []
@@ -185,6 +192,23 @@ def test_page_selection():
                 print(f"  FAIL {pages_param}: Expected {expected}, got {result}")
                 return False
 
+        skipped = PDFSignature(sig_path, pages='all', skip_pages='-2-')
+        signers.append(skipped)
+        result = list(skipped._selected_pages(10))
+        if result != list(range(1, 9)):
+            print(f"  FAIL skip '-2-': Expected pages 1-8, got {result}")
+            return False
+        print(f"  OK skip '-2-': {result}")
+
+        for bad in ('5-2', '0', '1-x', 'abc', '-1--3'):
+            try:
+                PDFSignature(sig_path, pages=bad).signature_image.close()
+            except ValueError:
+                print(f"  OK '{bad}' rejected at construction")
+            else:
+                print(f"  FAIL '{bad}' should be rejected")
+                return False
+
         # Close all images
         for signer in signers:
             signer.signature_image.close()
@@ -505,6 +529,69 @@ def test_rotated_page_signature_placement():
                 pass
 
 
+def test_overlay_reuse():
+    """Test that pages with the same geometry share one overlay and one image"""
+    print("\n" + "=" * 60)
+    print("TEST: Overlay Reuse")
+    print("=" * 60)
+
+    sig_path = create_test_signature()
+    pdf_path = create_test_pdf(num_pages=12)
+    output_path = pdf_path.replace('.pdf', '_signed.pdf')
+
+    try:
+        reader = PdfReader(pdf_path)
+        writer = PdfWriter()
+        for index, page in enumerate(reader.pages):
+            if index % 3 == 0:
+                page.rotate(90)
+            writer.add_page(page)
+        with open(pdf_path, 'wb') as handle:
+            writer.write(handle)
+
+        signer = PDFSignature(sig_path)
+        result = signer.add_signature_to_pdf(pdf_path, output_path)
+        if not result['success'] or result['pages_signed'] != 12:
+            print(f"  FAIL Signing failed: {result['error']}")
+            return False
+
+        geometries = list(signer._overlay_cache)
+        if len(geometries) != 1 or len(geometries[0]) != 2:
+            print(f"  FAIL Expected one overlay with 2 geometries, got {geometries}")
+            return False
+
+        def collect_images(resources, found):
+            xobjects = resources.get('/XObject') if resources else None
+            if xobjects is None:
+                return
+            xobjects = xobjects.get_object()
+            for name in xobjects:
+                ref = xobjects.raw_get(name)
+                xobject = ref.get_object()
+                if xobject.get('/Subtype') == '/Image':
+                    found.add(ref.idnum)
+                elif xobject.get('/Subtype') == '/Form' and '/Resources' in xobject:
+                    collect_images(xobject['/Resources'].get_object(), found)
+
+        images = set()
+        for page in PdfReader(output_path).pages:
+            collect_images(page['/Resources'].get_object(), images)
+
+        if len(images) != 1:
+            print(f"  FAIL Expected one shared signature image, found {len(images)}")
+            return False
+
+        print(f"  OK 12 pages signed from {len(next(iter(signer._overlay_cache)))} overlay pages and 1 image")
+        return True
+
+    finally:
+        for path in (sig_path, pdf_path, output_path):
+            try:
+                os.unlink(path)
+            except (PermissionError, FileNotFoundError):
+                pass
+
+
 def test_batch_processing():
     """Test batch processing multiple PDFs"""
     print("\n" + "=" * 60)
@@ -542,6 +629,303 @@ def test_batch_processing():
         os.unlink(sig_path)
 
 
+def test_save_modes():
+    """Test incremental and compact saving with both engines"""
+    print("\n" + "=" * 60)
+    print("TEST: Save Modes")
+    print("=" * 60)
+
+    import pdf_signature
+
+    sig_path = create_test_signature()
+    pdf_path = create_test_pdf(num_pages=20)
+    outputs = []
+
+    with open(pdf_path, 'rb') as handle:
+        original = handle.read()
+
+    engines = [('pypdf', None)]
+    if pdf_signature.fitz is not None:
+        engines.insert(0, ('pymupdf', pdf_signature.fitz))
+    saved_fitz = pdf_signature.fitz
+
+    try:
+        for engine, module in engines:
+            pdf_signature.fitz = module
+            sizes = {}
+            for mode in PDFSignature.VALID_SAVE_MODES:
+                output_path = pdf_path.replace('.pdf', f'_{engine}_{mode}.pdf')
+                outputs.append(output_path)
+                result = PDFSignature(sig_path, pages='first', save_mode=mode).add_signature_to_pdf(
+                    pdf_path, output_path)
+                if not result['success'] or result['pages_signed'] != 1:
+                    print(f"  FAIL {engine} {mode}: {result['error']}")
+                    return False
+                signed_reader = PdfReader(output_path)
+                if len(signed_reader.pages) != 20:
+                    print(f"  FAIL {engine} {mode}: output does not reopen with 20 pages")
+                    return False
+                stamped = [bool(page['/Resources'].get('/XObject')) for page in signed_reader.pages[:2]]
+                if stamped != [True, False]:
+                    print(f"  FAIL {engine} {mode}: expected only page 1 stamped, got {stamped}")
+                    return False
+                with open(output_path, 'rb') as handle:
+                    data = handle.read()
+                sizes[mode] = len(data)
+                if mode == 'incremental' and not data.startswith(original):
+                    print(f"  FAIL {engine} incremental output should start with the original bytes")
+                    return False
+            print(f"  OK {engine}: " + ", ".join(f"{mode} {size} bytes" for mode, size in sizes.items()))
+
+            # Signing a file onto itself must append to it, not truncate it
+            in_place = pdf_path.replace('.pdf', f'_{engine}_in_place.pdf')
+            outputs.append(in_place)
+            shutil.copyfile(pdf_path, in_place)
+            result = PDFSignature(sig_path, pages='first', save_mode='incremental').add_signature_to_pdf(
+                in_place, in_place)
+            with open(in_place, 'rb') as handle:
+                data = handle.read()
+            if not result['success'] or not data.startswith(original) or len(PdfReader(in_place).pages) != 20:
+                print(f"  FAIL {engine} in-place incremental save damaged the file: {result['error']}")
+                return False
+            print(f"  OK {engine}: in-place incremental save appended {len(data) - len(original)} bytes")
+
+        try:
+            PDFSignature(sig_path, save_mode='append')
+            print("  FAIL Invalid save mode should raise error")
+            return False
+        except ValueError:
+            print("  OK Invalid save mode rejected")
+        return True
+
+    finally:
+        pdf_signature.fitz = saved_fitz
+        for path in [sig_path, pdf_path] + outputs:
+            try:
+                os.unlink(path)
+            except (PermissionError, FileNotFoundError):
+                pass
+
+
+def test_signature_presets():
+    """Test saved presets, warm signers and the on-disk overlay cache"""
+    print("\n" + "=" * 60)
+    print("TEST: Signature Presets")
+    print("=" * 60)
+
+    import shutil
+    from signature_presets import PresetStore
+
+    sig_path = create_test_signature()
+    pdf_path = create_test_pdf(num_pages=3)
+    output_path = pdf_path.replace('.pdf', '_preset.pdf')
+    preset_dir = tempfile.mkdtemp()
+
+    try:
+        store = PresetStore(preset_dir)
+        store.save('Company Seal', sig_path, position='top-right', scale=0.2, opacity=0.5)
+        if store.names() != ['Company Seal'] or store.load('Company Seal').opacity != 0.5:
+            print(f"  FAIL Preset not saved: {store.names()}")
+            return False
+
+        with Image.open(store.processed_image_path('Company Seal')) as processed:
+            alpha = processed.getchannel('A').getpixel((100, 50))
+        if alpha != 100:
+            print(f"  FAIL Processed image should carry 50% opacity, alpha is {alpha}")
+            return False
+        print("  OK Preset saved with processed image")
+
+        signer = store.signer('Company Seal', pages='first')
+        if store.signer('Company Seal', pages='first') is not signer:
+            print("  FAIL Repeat lookups should reuse the warm signer")
+            return False
+        result = signer.add_signature_to_pdf(pdf_path, output_path)
+        if not result['success'] or result['pages_signed'] != 1:
+            print(f"  FAIL Preset signing failed: {result['error']}")
+            return False
+
+        # A fresh store (new process) reads the overlay from disk, skipping ReportLab
+        cold = PresetStore(preset_dir).signer('Company Seal', pages='all')
+        result = cold.add_signature_to_pdf(pdf_path, output_path)
+        if not result['success'] or cold._image_reader is not None:
+            print("  FAIL Cached overlay should be reused from disk")
+            return False
+        print("  OK Warm signer reused and overlay served from disk cache")
+
+        for bad_name in ('../escape', ''):
+            try:
+                store.save(bad_name, sig_path)
+                print(f"  FAIL Preset name {bad_name!r} should be rejected")
+                return False
+            except ValueError:
+                pass
+        try:
+            store.save('Bad Scale', sig_path, scale=5)
+            print("  FAIL Invalid preset settings should be rejected")
+            return False
+        except ValueError:
+            pass
+
+        store.delete('Company Seal')
+        if store.names():
+            print("  FAIL Preset should be deleted")
+            return False
+        print("  OK Invalid presets rejected and delete works")
+        return True
+
+    finally:
+        shutil.rmtree(preset_dir, ignore_errors=True)
+        for path in (sig_path, pdf_path, output_path):
+            try:
+                os.unlink(path)
+            except (PermissionError, FileNotFoundError):
+                pass
+
+
+class SlowSigner(PDFSignature):
+    """Signer that hangs on files named *slow* and dies on *crash*, for timeout tests"""
+
+    def add_signature_to_pdf(self, input_pdf_path, output_pdf_path=None):
+        if 'slow' in os.path.basename(input_pdf_path):
+            time.sleep(30)
+        if 'crash' in os.path.basename(input_pdf_path):
+            os._exit(1)
+        return super().add_signature_to_pdf(input_pdf_path, output_pdf_path)
+
+
+def test_parallel_batch():
+    """Test parallel batch signing: ordering, failures, progress and timeouts"""
+    print("\n" + "=" * 60)
+    print("TEST: Parallel Batch")
+    print("=" * 60)
+
+    sig_path = create_test_signature()
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        os.makedirs(os.path.join(temp_dir, 'nested'))
+        names = ['a.pdf', 'b.pdf', 'broken.pdf', 'crash.pdf', os.path.join('nested', 'c.pdf'), 'slow.pdf']
+        for name in names:
+            if name == 'broken.pdf':
+                with open(os.path.join(temp_dir, name), 'wb') as f:
+                    f.write(b'not a pdf')
+            else:
+                os.rename(create_test_pdf(num_pages=3), os.path.join(temp_dir, name))
+
+        progress = []
+        signer = SlowSigner(sig_path, pages='-1')
+        results = signer.batch_sign_pdfs(temp_dir, workers=2, timeout=3,
+                                         progress_callback=lambda *args: progress.append(args))
+
+        inputs = [os.path.relpath(r['input_path'], temp_dir) for r in results['files']]
+        if inputs != sorted(names):
+            print(f"  FAIL Results out of order: {inputs}")
+            return False
+        by_name = dict(zip(inputs, results['files']))
+        if results['successful'] != 3 or by_name['a.pdf']['pages_signed'] != 1:
+            print(f"  FAIL Expected 3 signed files, got {results['successful']}")
+            return False
+        if 'Timed out' not in (by_name['slow.pdf']['error'] or '') or by_name['broken.pdf']['success']:
+            print(f"  FAIL Slow and broken files should fail: {results['files']}")
+            return False
+        if 'died' not in (by_name['crash.pdf']['error'] or ''):
+            print(f"  FAIL A dead worker should fail only its own file: {by_name['crash.pdf']}")
+            return False
+        if [done for done, _, _ in progress] != [1, 2, 3, 4, 5, 6] or progress[-1][1] != 6:
+            print(f"  FAIL Unexpected progress calls: {progress}")
+            return False
+        print(f"  OK {results['successful']}/{results['total_pdfs']} signed in order, timeout, crash and error isolated")
+
+        rerun = PDFSignature(sig_path).batch_sign_pdfs(os.path.join(temp_dir, 'nested'))
+        if rerun['total_pdfs'] != 1:
+            print("  FAIL Re-running should skip the signed/ output folder")
+            return False
+        print("  OK Output folder excluded from input scan")
+        return True
+
+    finally:
+        import shutil
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        os.unlink(sig_path)
+
+
+def test_audit_log():
+    """Test the append-only audit log and its query helper"""
+    print("\n" + "=" * 60)
+    print("TEST: Audit Log")
+    print("=" * 60)
+
+    from pdf_signature import AUDIT_LOG_NAME, LEGACY_LOG_NAME, file_sha256, query_audit_log
+
+    sig_path = create_test_signature()
+    temp_dir = tempfile.mkdtemp()
+    output_dir = os.path.join(temp_dir, 'out')
+
+    try:
+        for name in ('a.pdf', 'b.pdf'):
+            os.rename(create_test_pdf(num_pages=2), os.path.join(temp_dir, name))
+        with open(os.path.join(temp_dir, 'broken.pdf'), 'wb') as f:
+            f.write(b'not a pdf')
+
+        # History from the old whole-file log is carried over by the first run
+        os.makedirs(output_dir)
+        legacy_path = os.path.join(output_dir, LEGACY_LOG_NAME)
+        with open(legacy_path, 'w', encoding='utf-8') as f:
+            json.dump({'signed_files': [{
+                'timestamp': '2025-06-01T09:00:00', 'input_path': '/old/a.pdf',
+                'output_path': '/old/signed/a.pdf', 'pages_signed': 1, 'success': True,
+            }]}, f)
+
+        signer = PDFSignature(sig_path, pages='first')
+        first = signer.batch_sign_pdfs(temp_dir, output_dir, workers=2)
+        signer.batch_sign_pdfs(temp_dir, output_dir)
+
+        log_path = os.path.join(output_dir, AUDIT_LOG_NAME)
+        if first['log_path'] != log_path:
+            print(f"  FAIL Unexpected log path {first['log_path']}")
+            return False
+
+        # A torn line from an interrupted writer must not break readers
+        with open(log_path, 'a', encoding='utf-8') as f:
+            f.write('{"timestamp": "2026-')
+
+        entries = list(query_audit_log(log_path))
+        if len(entries) != 7:
+            print(f"  FAIL Expected 6 entries from two runs and 1 legacy entry, got {len(entries)}")
+            return False
+        if os.path.exists(legacy_path) or not os.path.exists(legacy_path + '.migrated'):
+            print("  FAIL Legacy log should be renamed once migrated")
+            return False
+        if [entry['timestamp'] for entry in query_audit_log(log_path, input_path='/old/a.pdf')] != ['2025-06-01T09:00:00']:
+            print("  FAIL Legacy entry not migrated exactly once")
+            return False
+
+        output_a = os.path.join(output_dir, 'a.pdf')
+        by_hash = list(query_audit_log(log_path, sha256=file_sha256(output_a)))
+        if [entry['output_path'] for entry in by_hash] != [os.path.abspath(output_a)] * 2:
+            print(f"  FAIL Hash query returned {by_hash}")
+            return False
+        if by_hash[0]['input_sha256'] != file_sha256(os.path.join(temp_dir, 'a.pdf')):
+            print("  FAIL Input hash not recorded")
+            return False
+
+        failed = list(query_audit_log(log_path, success=False))
+        if len(failed) != 2 or not all(entry['error'] for entry in failed):
+            print(f"  FAIL Expected 2 failed entries with errors, got {failed}")
+            return False
+        if list(query_audit_log(log_path, since='2999-01-01T00:00:00')):
+            print("  FAIL Time filter should exclude every entry")
+            return False
+
+        print(f"  OK {len(entries)} entries appended across runs and migrated, queries by hash and status work")
+        return True
+
+    finally:
+        import shutil
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        os.unlink(sig_path)
+
+
 def test_error_handling():
     """Test error handling for invalid inputs"""
     print("\n" + "=" * 60)
@@ -607,7 +991,12 @@ def main():
         ("Skip Pages", test_skip_pages),
         ("Opacity & Rotation", test_opacity_and_rotation),
         ("Rotated Page Placement", test_rotated_page_signature_placement),
+        ("Overlay Reuse", test_overlay_reuse),
+        ("Save Modes", test_save_modes),
+        ("Signature Presets", test_signature_presets),
         ("Batch Processing", test_batch_processing),
+        ("Parallel Batch", test_parallel_batch),
+        ("Audit Log", test_audit_log),
         ("Error Handling", test_error_handling)
     ]
 
@@ -5,29 +5,64 @@ Modern web UI for PDF organization with drag & drop
 """
 
 import os
-import json
 import shutil
 import webbrowser
 import threading
+import zipfile
 from pathlib import Path
 from datetime import datetime
 from io import BytesIO
-from flask import Flask, render_template, request, jsonify, send_from_directory, session
+from flask import (Flask, Response, render_template, request, jsonify, send_from_directory, session,
+                   stream_with_context)
 from werkzeug.utils import secure_filename
+from library_index import DEFAULT_PAGE_SIZE, get_library_index
 from organize_batch import BatchPDFOrganizer
+from organization_stats import load_stats
+from session_store import create_session_store
 from pdf_content_analyzer import PDFContentAnalyzer
-from pdf_signature import PDFSignature
+from pdf_signature import DEFAULT_BATCH_WORKERS, PDFSignature
+from signature_presets import PresetStore
+from web_jobs import JobManager, sse_stream
+
+
+def load_secret_key(path):
+    """Read the cookie signing key, creating it once so every worker process shares it"""
+    path = Path(path)
+    if not path.exists():
+        staging = path.with_name(f'{path.name}.{os.getpid()}')
+        staging.write_bytes(os.urandom(24))
+        os.chmod(staging, 0o600)
+        try:
+            os.link(staging, path)  # atomic; loses cleanly to a concurrent worker
+        except FileExistsError:
+            pass
+        finally:
+            staging.unlink()
+    return path.read_bytes()
+
 
 app = Flask(__name__)
-app.secret_key = os.urandom(24)
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max file size
 app.config['UPLOAD_FOLDER'] = Path.home() / 'pdf_organizer_uploads'
 app.config['UPLOAD_FOLDER'].mkdir(exist_ok=True)
+app.secret_key = os.environ.get('PDF_LIBRARIAN_SECRET_KEY') or load_secret_key(
+    app.config['UPLOAD_FOLDER'] / '.secret_key')
+
+# Per-session data lives outside the process so it is bounded and survives
+# restarts; set PDF_LIBRARIAN_SESSION_STORE=memory:// to opt out
+session_data = create_session_store(
+    os.environ.get('PDF_LIBRARIAN_SESSION_STORE')
+    or f"sqlite://{app.config['UPLOAD_FOLDER'] / 'sessions.sqlite3'}"
+)
+preset_store = PresetStore()
 
-# In-memory storage for session data (use Redis in production)
-pending_pdfs = {}
-analysis_results = {}
-signature_uploads = {}  # Store uploaded signatures by session
+
+def remove_job_files(job_id):
+    """Delete the signed PDFs of a job that has expired"""
+    shutil.rmtree(app.config['UPLOAD_FOLDER'] / 'signed' / job_id, ignore_errors=True)
+
+
+jobs = JobManager(db_path=app.config['UPLOAD_FOLDER'] / 'jobs.sqlite3', on_expire=remove_job_files)
 
 
 @app.route('/')
@@ -87,11 +122,17 @@ def upload_pdf():
     })
 
 
+def current_session_id():
+    session_id = session.get('session_id', str(datetime.now().timestamp()))
+    session['session_id'] = session_id
+    return session_id
+
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze_pdfs():
-    """Analyze uploaded PDFs and suggest categorization"""
+    """Start analyzing uploaded PDFs and suggesting categories in a background job"""
     data = request.json
-    file_paths = data.get('files', [])
+    file_paths = [info for info in data.get('files', []) if Path(info['path']).exists()]
 
     if not session.get('api_key'):
         return jsonify({'error': 'API key not configured'}), 400
@@ -99,214 +140,235 @@ def analyze_pdfs():
     if not session.get('ebooks_folder'):
         return jsonify({'error': 'Ebooks folder not configured'}), 400
 
-    try:
-        # Create temporary organizer
+    session_id = current_session_id()
+    settings = {
+        'ebooks_folder': session.get('ebooks_folder'),
+        'api_key': session.get('api_key'),
+        'provider': session.get('provider', 'gemini')
+    }
+
+    def work(job):
         organizer = BatchPDFOrganizer(
             downloads_folder=app.config['UPLOAD_FOLDER'],
-            ebooks_folder=session.get('ebooks_folder'),
-            api_key=session.get('api_key'),
-            provider=session.get('provider', 'gemini'),
+            ebooks_folder=settings['ebooks_folder'],
+            api_key=settings['api_key'],
+            provider=settings['provider'],
             use_content_analysis=True
         )
-
-        # Get PDF info
-        pdf_list = []
-        for file_info in file_paths:
-            pdf_path = Path(file_info['path'])
-            if pdf_path.exists():
-                info = organizer.get_pdf_info(pdf_path)
+        try:
+            # Get PDF info
+            pdf_list = []
+            for file_info in file_paths:
+                job.check_cancelled()
+                info = organizer.get_pdf_info(Path(file_info['path']))
                 info['id'] = file_info['id']
                 pdf_list.append(info)
+                job.progress(len(pdf_list), f"Read {info['filename']}")
+
+            # Load categories
+            categories = organizer.load_or_analyze_categories()
+
+            # Categorize in chunks so a cancel takes effect between AI requests
+            categorization_map = {}
+            for start in range(0, len(pdf_list), organizer.chunk_size):
+                job.check_cancelled()
+                chunk = pdf_list[start:start + organizer.chunk_size]
+                for item in organizer.batch_categorize_all(chunk, categories):
+                    categorization_map[item['number'] + start] = item
+                job.progress(len(pdf_list) + start // organizer.chunk_size + 1,
+                             f"Categorized {min(start + len(chunk), len(pdf_list))} of {len(pdf_list)} PDFs")
+
+            # Match results
+            results = []
+            for i, pdf_info in enumerate(pdf_list, 1):
+                cat_result = categorization_map.get(i, {
+                    'category': 'Uncategorized',
+                    'confidence': 'low',
+                    'rename': None
+                })
 
-        # Load categories
-        categories = organizer.load_or_analyze_categories()
-
-        # Batch categorize
-        categorizations = organizer.batch_categorize_all(pdf_list, categories)
-
-        # Match results
-        results = []
-        categorization_map = {cat['number']: cat for cat in categorizations}
-
-        for i, pdf_info in enumerate(pdf_list, 1):
-            cat_result = categorization_map.get(i, {
-                'category': 'Uncategorized',
-                'confidence': 'low',
-                'rename': None
-            })
-
-            results.append({
-                'id': pdf_info['id'],
-                'filename': pdf_info['filename'],
-                'path': pdf_info['path'],
-                'category': cat_result.get('category', 'Uncategorized'),
-                'confidence': cat_result.get('confidence', 'low'),
-                'rename': cat_result.get('rename'),
-                'is_gibberish': pdf_info.get('is_gibberish', False),
-                'has_content': pdf_info.get('has_content', False),
-                'approved': False  # User needs to approve
-            })
+                results.append({
+                    'id': pdf_info['id'],
+                    'filename': pdf_info['filename'],
+                    'path': pdf_info['path'],
+                    'category': cat_result.get('category', 'Uncategorized'),
+                    'confidence': cat_result.get('confidence', 'low'),
+                    'rename': cat_result.get('rename'),
+                    'is_gibberish': pdf_info.get('is_gibberish', False),
+                    'has_content': pdf_info.get('has_content', False),
+                    'approved': False  # User needs to approve
+                })
 
-        # Store results for later use
-        session_id = session.get('session_id', str(datetime.now().timestamp()))
-        session['session_id'] = session_id
-        analysis_results[session_id] = results
+            # Store results for later use
+            session_data.set('analysis_results', session_id, results)
+            job.output = {'results': results, 'session_id': session_id}
+        finally:
+            organizer.cleanup()
 
-        organizer.cleanup()
+    chunks = -(-len(file_paths) // BatchPDFOrganizer.DEFAULT_CHUNK_SIZE)
+    job = jobs.submit('analyze', len(file_paths) + chunks, work, owner=session_id)
+    return jsonify({'success': True, 'job_id': job.id, 'total': job.total}), 202
 
-        return jsonify({
-            'success': True,
-            'results': results,
-            'session_id': session_id
-        })
 
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+@app.route('/api/analyze/results')
+def latest_analysis():
+    """Return this session's most recent analysis, e.g. after a page reload or server restart"""
+    results = session_data.get('analysis_results', session.get('session_id', ''))
+    if results is None:
+        return jsonify({'error': 'No analysis results for this session'}), 404
+    return jsonify({'success': True, 'results': results})
 
 
 @app.route('/api/organize', methods=['POST'])
 def organize_pdfs():
-    """Organize approved PDFs"""
+    """Start moving approved PDFs into the library in a background job"""
     data = request.json
     approved_files = data.get('files', [])
 
     if not session.get('api_key'):
         return jsonify({'error': 'API key not configured'}), 400
 
-    try:
+    session_id = current_session_id()
+    settings = {
+        'ebooks_folder': session.get('ebooks_folder'),
+        'api_key': session.get('api_key'),
+        'provider': session.get('provider', 'gemini')
+    }
+
+    def work(job):
         organizer = BatchPDFOrganizer(
             downloads_folder=app.config['UPLOAD_FOLDER'],
-            ebooks_folder=session.get('ebooks_folder'),
-            api_key=session.get('api_key'),
-            provider=session.get('provider', 'gemini')
+            ebooks_folder=settings['ebooks_folder'],
+            api_key=settings['api_key'],
+            provider=settings['provider']
         )
+        try:
+            for file_info in approved_files:
+                job.check_cancelled()
+                try:
+                    result = {
+                        'source': file_info['path'],
+                        'filename': file_info['filename'],
+                        'category': file_info['category'],
+                        'confidence': file_info.get('confidence'),
+                        'rename_to': file_info.get('rename')
+                    }
+
+                    organizer.move_pdf(result)
+                    job.add_result({'filename': file_info['filename'], 'success': True})
+
+                    # Clean up upload
+                    Path(file_info['path']).unlink(missing_ok=True)
+
+                except Exception as e:
+                    job.add_result({'filename': file_info['filename'], 'success': False, 'error': str(e)})
+        finally:
+            # Files moved before a cancel stay moved, so they are logged and reported
+            organizer.save_log()
+            organizer.cleanup()
+            job.output = {
+                'organized': [r['filename'] for r in job.results if r['success']],
+                'failed': [r for r in job.results if not r['success']]
+            }
 
-        organized = []
-        failed = []
+            # Files that were moved no longer belong to the pending analysis
+            pending = session_data.get('analysis_results', session_id)
+            if pending is not None:
+                organized = set(job.output['organized'])
+                session_data.set('analysis_results', session_id,
+                                 [r for r in pending if r['filename'] not in organized])
 
-        for file_info in approved_files:
-            try:
-                result = {
-                    'source': file_info['path'],
-                    'filename': file_info['filename'],
-                    'category': file_info['category'],
-                    'rename_to': file_info.get('rename')
-                }
+    job = jobs.submit('organize', len(approved_files), work, owner=session_id)
+    return jsonify({'success': True, 'job_id': job.id, 'total': job.total}), 202
 
-                organizer.move_pdf(result)
-                organized.append(file_info['filename'])
 
-                # Clean up upload
-                Path(file_info['path']).unlink(missing_ok=True)
+def owned_job(job_id):
+    return jobs.get(job_id, owner=session.get('session_id'))
 
-            except Exception as e:
-                failed.append({
-                    'filename': file_info['filename'],
-                    'error': str(e)
-                })
 
-        organizer.save_log()
-        organizer.cleanup()
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """Poll a background job; pass ?wait=<seconds>&since=<event> to long-poll for new events"""
+    job = owned_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
 
-        return jsonify({
-            'success': True,
-            'organized': organized,
-            'failed': failed
-        })
+    since = request.args.get('since', type=int)
+    if since is not None:
+        job.wait_events(since, min(request.args.get('wait', 0, type=float), 30))
 
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    status = job.summary()
+    status['results'] = list(job.results)
+    status['output'] = job.output
+    status['events'] = len(job.events)
+    return jsonify(status)
+
+
+@app.route('/api/jobs/<job_id>/events')
+@app.route('/api/signature/jobs/<job_id>/events')
+def job_events(job_id):
+    """Stream a background job's progress as Server-Sent Events"""
+    job = owned_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    start = int(request.headers.get('Last-Event-ID') or request.args.get('since') or 0)
+    return Response(
+        stream_with_context(sse_stream(job, start)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Ask a background job to stop after the file it is working on"""
+    job = jobs.cancel(job_id, owner=session.get('session_id'))
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'status': job.status})
 
 
 @app.route('/api/browse')
 def browse_library():
-    """Browse organized PDF library"""
+    """Browse organized PDF library one folder page at a time"""
     ebooks_folder = session.get('ebooks_folder')
 
     if not ebooks_folder or not Path(ebooks_folder).exists():
         return jsonify({'error': 'Ebooks folder not configured or does not exist'}), 400
 
-    ebooks_path = Path(ebooks_folder)
-
-    # Build file tree
-    def build_tree(path, max_depth=3, current_depth=0):
-        if current_depth >= max_depth:
-            return None
-
-        items = []
-        try:
-            for item in sorted(path.iterdir()):
-                if item.is_dir():
-                    children = build_tree(item, max_depth, current_depth + 1)
-                    pdf_count = len(list(item.rglob('*.pdf')))
-                    items.append({
-                        'name': item.name,
-                        'type': 'folder',
-                        'path': str(item.relative_to(ebooks_path)),
-                        'pdf_count': pdf_count,
-                        'children': children or []
-                    })
-                elif item.suffix.lower() == '.pdf':
-                    items.append({
-                        'name': item.name,
-                        'type': 'file',
-                        'path': str(item.relative_to(ebooks_path)),
-                        'size': item.stat().st_size
-                    })
-        except PermissionError:
-            pass
-
-        return items
-
-    tree = build_tree(ebooks_path)
+    index = get_library_index(ebooks_folder)
+    if request.args.get('refresh'):
+        index.refresh(force=True)
 
-    # Get statistics
-    total_pdfs = len(list(ebooks_path.rglob('*.pdf')))
-    total_folders = len([d for d in ebooks_path.rglob('*') if d.is_dir()])
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = min(max(1, request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)), 1000)
+    listing = index.children(request.args.get('path', ''), offset, limit)
+    if listing is None:
+        return jsonify({'error': 'Folder not found'}), 404
 
-    return jsonify({
-        'success': True,
-        'tree': tree,
-        'stats': {
-            'total_pdfs': total_pdfs,
-            'total_folders': total_folders,
-            'ebooks_folder': str(ebooks_path)
-        }
-    })
+    return jsonify(dict(
+        listing,
+        success=True,
+        stats=dict(index.stats(), ebooks_folder=str(Path(ebooks_folder)))
+    ))
 
 
 @app.route('/api/stats')
 def get_stats():
-    """Get organization statistics"""
+    """Get organization statistics, optionally for ?since=YYYY-MM-DD&until=YYYY-MM-DD"""
     ebooks_folder = session.get('ebooks_folder')
 
     if not ebooks_folder:
         return jsonify({'error': 'Ebooks folder not configured'}), 400
 
-    ebooks_path = Path(ebooks_folder)
-    log_file = ebooks_path / 'organization_log.json'
-
-    if not log_file.exists():
-        return jsonify({
-            'total_organized': 0,
-            'last_run': None,
-            'categories': {}
-        })
-
-    with open(log_file, 'r', encoding='utf-8') as f:
-        log = json.load(f)
-
-    # Count by category
-    category_counts = {}
-    for item in log.get('organized_files', []):
-        cat = item.get('category', 'Uncategorized')
-        category_counts[cat] = category_counts.get(cat, 0) + 1
-
-    return jsonify({
-        'total_organized': len(log.get('organized_files', [])),
-        'last_run': log.get('last_run'),
-        'categories': category_counts
-    })
+    try:
+        return jsonify(load_stats(ebooks_folder).query(
+            since=request.args.get('since'),
+            until=request.args.get('until')
+        ))
+    except ValueError:
+        return jsonify({'error': 'Dates must be in YYYY-MM-DD format'}), 400
 
 
 @app.route('/api/categories')
@@ -426,44 +488,140 @@ def upload_pdfs_for_signing():
     })
 
 
-@app.route('/api/signature/process', methods=['POST'])
-def process_signature():
-    """Sign PDFs with configured signature"""
-    data = request.json
-
+def signature_placement(config):
+    """Map the web signature config onto PDFSignature placement arguments"""
+    return {
+        'position': config.get('position', 'bottom-right'),
+        'scale': config.get('scale', 0.25),
+        'x_offset': config.get('xOffset', 0.5),
+        'y_offset': config.get('yOffset', 0.5),
+        'opacity': config.get('opacity', 1.0),
+        'rotation': config.get('rotation', 0)
+    }
+
+
+def preset_info(preset):
+    return {
+        'name': preset.name,
+        'position': preset.position,
+        'scale': preset.scale,
+        'xOffset': preset.x_offset,
+        'yOffset': preset.y_offset,
+        'opacity': preset.opacity,
+        'rotation': preset.rotation,
+        'preview': f'/api/signature/presets/{preset.name}/preview'
+    }
+
+
+@app.route('/api/signature/presets', methods=['GET', 'POST'])
+def signature_presets():
+    """List saved signature presets or save the current signature as one"""
+    if request.method == 'GET':
+        return jsonify({'presets': [preset_info(preset) for preset in preset_store.presets()]})
+
+    data = request.json or {}
     signature_path = session.get('signature_path')
     if not signature_path or not Path(signature_path).exists():
         return jsonify({'error': 'Signature image not uploaded'}), 400
 
-    pdf_files = data.get('files', [])
-    if not pdf_files:
-        return jsonify({'error': 'No PDF files to sign'}), 400
+    try:
+        preset = preset_store.save(data.get('name', '').strip(), signature_path,
+                                   **signature_placement(data.get('config', {})))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({'success': True, 'preset': preset_info(preset)})
+
+
+@app.route('/api/signature/presets/<name>', methods=['DELETE'])
+def delete_signature_preset(name):
+    """Delete a saved signature preset"""
+    try:
+        preset_store.delete(name)
+    except (KeyError, ValueError) as e:
+        return jsonify({'error': str(e)}), 404
+    return jsonify({'success': True})
+
+
+@app.route('/api/signature/presets/<name>/preview')
+def signature_preset_preview(name):
+    """Processed signature image of a preset, with opacity and rotation applied"""
+    try:
+        path = preset_store.processed_image_path(name)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    if not path.exists():
+        return jsonify({'error': 'Preset not found'}), 404
+    return send_from_directory(path.parent, path.name, mimetype='image/png')
+
+
+def build_signer(data):
+    """
+    Create the PDFSignature for a signing request.
+
+    Returns (signer, None) or (None, (error response, status)).
+    """
+    preset_name = data.get('preset')
+    signature_path = session.get('signature_path')
+    if not preset_name and (not signature_path or not Path(signature_path).exists()):
+        return None, (jsonify({'error': 'Signature image not uploaded'}), 400)
 
-    # Get configuration
     config = data.get('config', {})
-    position = config.get('position', 'bottom-right')
-    scale = config.get('scale', 0.25)
-    x_offset = config.get('xOffset', 0.5)
-    y_offset = config.get('yOffset', 0.5)
-    opacity = config.get('opacity', 1.0)
-    rotation = config.get('rotation', 0)
     pages = config.get('pages', 'all')
     skip_pages = config.get('skipPages', '')
+    save_mode = config.get('saveMode', 'full')
 
     try:
-        # Create signer
-        signer = PDFSignature(
+        # Presets reuse a warm signer and their cached overlays
+        if preset_name:
+            return preset_store.signer(preset_name, pages=pages, skip_pages=skip_pages,
+                                       save_mode=save_mode), None
+        return PDFSignature(
             signature_image_path=signature_path,
-            position=position,
-            scale=scale,
-            x_offset=x_offset,
-            y_offset=y_offset,
-            opacity=opacity,
-            rotation=rotation,
             pages=pages,
-            skip_pages=skip_pages
-        )
+            skip_pages=skip_pages,
+            save_mode=save_mode,
+            **signature_placement(config)
+        ), None
+    except KeyError as e:
+        return None, (jsonify({'error': str(e)}), 404)
+    except ValueError as e:
+        return None, (jsonify({'error': str(e)}), 400)
+
+
+def signed_file_info(pdf_info, result):
+    """Web-facing summary of one add_signature_to_pdf result"""
+    if result['success']:
+        return {
+            'filename': Path(result['output_path']).name,
+            'source': pdf_info['filename'],
+            'path': result['output_path'],
+            'success': True,
+            'total_pages': result['total_pages'],
+            'pages_signed': result['pages_signed']
+        }
+    return {
+        'filename': pdf_info['filename'],
+        'source': pdf_info['filename'],
+        'success': False,
+        'error': result['error']
+    }
+
 
+@app.route('/api/signature/process', methods=['POST'])
+def process_signature():
+    """Sign PDFs with configured signature"""
+    data = request.json
+
+    pdf_files = data.get('files', [])
+    if not pdf_files:
+        return jsonify({'error': 'No PDF files to sign'}), 400
+
+    signer, error = build_signer(data)
+    if error:
+        return error
+
+    try:
         # Create output folder
         signed_folder = app.config['UPLOAD_FOLDER'] / 'signed'
         signed_folder.mkdir(exist_ok=True)
@@ -518,6 +676,125 @@ def process_signature():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/signature/jobs', methods=['POST'])
+def submit_signature_job():
+    """Start signing PDFs in the background and return a job ID"""
+    data = request.json or {}
+
+    pdf_files = [info for info in data.get('files', []) if info.get('path')]
+    if not pdf_files:
+        return jsonify({'error': 'No PDF files to sign'}), 400
+
+    try:
+        workers = int(data.get('workers') or DEFAULT_BATCH_WORKERS)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'workers must be a whole number'}), 400
+    if workers < 1:
+        return jsonify({'error': 'workers must be at least 1'}), 400
+    # Each worker is a process, so never start more than the machine has CPUs
+    workers = min(workers, os.cpu_count() or 1, len(pdf_files))
+
+    signer, error = build_signer(data)
+    if error:
+        return error
+
+    session_id = current_session_id()
+
+    def work(job):
+        # One signer per job; worker processes receive it once and keep its overlays
+        output_folder = app.config['UPLOAD_FOLDER'] / 'signed' / job.id
+        output_folder.mkdir(parents=True, exist_ok=True)
+        pairs = [
+            (info['path'], str(output_folder / f"{Path(info['filename']).stem}_signed.pdf"))
+            for info in pdf_files
+        ]
+        by_input = {info['path']: info for info in pdf_files}
+        signer.sign_files(
+            pairs,
+            workers=workers,
+            progress_callback=lambda done, total, result: job.add_result(
+                signed_file_info(by_input[result['input_path']], result)
+            )
+        )
+
+    job = jobs.submit('signature', len(pdf_files), work, owner=session_id)
+    return jsonify({'success': True, 'job_id': job.id, 'total': job.total}), 202
+
+
+@app.route('/api/signature/jobs/<job_id>')
+def signature_job_status(job_id):
+    """Poll a signing job"""
+    job = owned_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    status = job.summary()
+    status['signed'] = [r for r in job.results if r['success']]
+    status['failed'] = [r for r in job.results if not r['success']]
+    return jsonify(status)
+
+
+@app.route('/api/signature/jobs/<job_id>/files/<filename>')
+def download_job_file(job_id, filename):
+    """Download one signed PDF as soon as its job has finished it"""
+    job = owned_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if not any(r['success'] and r['filename'] == filename for r in list(job.results)):
+        return jsonify({'error': 'File not signed yet'}), 404
+
+    return send_from_directory(app.config['UPLOAD_FOLDER'] / 'signed' / job.id, filename,
+                               as_attachment=True)
+
+
+class _ZipChunks:
+    """Write-only sink that lets zipfile stream into a response generator"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+@app.route('/api/signature/jobs/<job_id>/zip')
+def download_job_zip(job_id):
+    """Stream a zip of a job's signed PDFs, adding each file as it completes"""
+    job = owned_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    def generate():
+        sink = _ZipChunks()
+        with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as archive:
+            for result in job.iter_results():
+                if not result['success']:
+                    continue
+                info = zipfile.ZipInfo(result['filename'], date_time=datetime.now().timetuple()[:6])
+                with archive.open(info, 'w', force_zip64=True) as entry, \
+                        open(result['path'], 'rb') as source:
+                    for block in iter(lambda: source.read(1024 * 1024), b''):
+                        entry.write(block)
+                        yield sink.take()
+                yield sink.take()
+        yield sink.take()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename=signed_{job.id[:8]}.zip'}
+    )
+
+
 @app.route('/api/signature/download/<filename>')
 def download_signed_pdf(filename):
     """Download signed PDF"""
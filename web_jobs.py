@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Background jobs for the web interface.
+
+Long-running work (analyzing, organizing or signing a batch of PDFs) runs
+on a small thread pool instead of inside the HTTP request. Each job records
+an ordered list of progress events, so clients can poll its status, follow
+it over Server-Sent Events, or replay events they missed after reconnecting.
+
+When a database path is given, job state and per-file results are also kept
+in SQLite, so finished jobs can still be queried after a restart and jobs
+that were cut short by one are reported as interrupted instead of vanishing.
+Processes sharing the database see each other's jobs: a job run by another
+process is followed by polling the database, and cancelling it sets a flag
+there that the owning process picks up. Cancellation is cooperative: work
+functions call `job.check_cancelled()` between files and stop at the next
+boundary.
+
+Jobs only run in the process that accepted them. The queue itself is not
+persisted, so queued and running jobs of a process that stops are reported
+as interrupted rather than resumed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+JOB_RETENTION_SECONDS = 60 * 60
+SSE_HEARTBEAT_SECONDS = 15
+STORE_POLL_SECONDS = 1.0
+
+FINISHED_STATUSES = ("done", "failed", "cancelled")
+INTERRUPTED_ERROR = "Interrupted by a server restart"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    owner TEXT,
+    status TEXT NOT NULL,
+    completed INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    message TEXT,
+    error TEXT,
+    output TEXT,
+    pid INTEGER,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    finished REAL
+);
+CREATE TABLE IF NOT EXISTS job_results (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+"""
+
+
+class JobCancelled(Exception):
+    """Raised by Job.check_cancelled() to unwind cancelled work."""
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    total: int
+    owner: str | None = None
+    status: str = "queued"  # queued, running, done, failed, cancelled
+    completed: int = 0
+    message: str = ""
+    results: list = field(default_factory=list)
+    output: dict | None = None
+    error: str | None = None
+    created: float = field(default_factory=time.time)
+    finished: float | None = None
+    events: list = field(default_factory=list)
+    condition: threading.Condition = field(default_factory=threading.Condition, repr=False)
+    cancel_requested: threading.Event = field(default_factory=threading.Event, repr=False)
+    store: JobStore | None = field(default=None, repr=False)
+    local: bool = field(default=True, repr=False)  # False for a snapshot of another process's job
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def emit(self, event: str, data: dict) -> None:
+        with self.condition:
+            self.events.append((event, data))
+            self.condition.notify_all()
+
+    def progress(self, completed: int, message: str = "", total: int | None = None) -> None:
+        """Report progress that is not tied to a finished file."""
+        with self.condition:
+            self.completed = completed
+            self.message = message
+            if total is not None:
+                self.total = total
+        self._save()
+        self.emit("progress", {"completed": self.completed, "total": self.total, "message": message})
+
+    def add_result(self, result: dict) -> None:
+        with self.condition:
+            self.results.append(result)
+            self.completed += 1
+            seq = len(self.results)
+        if self.store:
+            self.store.add_result(self.id, seq, result)
+        self._save()
+        self.emit("progress", {"completed": self.completed, "total": self.total, "result": result})
+
+    def cancel(self) -> None:
+        self.cancel_requested.set()
+        if self.store:
+            self.store.request_cancel(self.id)
+
+    def check_cancelled(self) -> None:
+        # A cancel sent to another process only reaches this one through the store
+        if not self.cancel_requested.is_set() and self.store and self.store.cancel_requested(self.id):
+            self.cancel_requested.set()
+        if self.cancel_requested.is_set():
+            raise JobCancelled()
+
+    def finish(self, error: str | None = None, cancelled: bool = False) -> None:
+        with self.condition:
+            self.status = "cancelled" if cancelled else "failed" if error else "done"
+            self.error = error
+            self.finished = time.time()
+        self._save()
+        self.emit("done", dict(self.summary(), output=self.output))
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "completed": self.completed,
+            "total": self.total,
+            "message": self.message,
+            "error": self.error,
+        }
+
+    def iter_results(self, heartbeat: float = SSE_HEARTBEAT_SECONDS):
+        """Yield results as they are recorded, returning once the job has finished."""
+        index = 0
+        while True:
+            self._wait_for(lambda: index < len(self.results) or self.done, heartbeat)
+            with self.condition:
+                pending = self.results[index:]
+                finished = self.done
+            index += len(pending)
+            yield from pending
+            if finished and index >= len(self.results):
+                return
+
+    def wait_events(self, start: int, timeout: float) -> list:
+        """Return events from index `start`, waiting up to `timeout` for new ones."""
+        self._wait_for(lambda: len(self.events) > start or self.done, timeout)
+        with self.condition:
+            return self.events[start:]
+
+    def refresh(self) -> None:
+        """Catch a snapshot of another process's job up with the store."""
+        if self.local or self.store is None or self.done:
+            return
+        latest = self.store.load(self.id)
+        with self.condition:
+            if latest is None:  # expired between polls
+                self.status, self.error, self.finished = "failed", "Job no longer exists", time.time()
+                self.events.append(("done", dict(self.summary(), output=self.output)))
+            else:
+                for name in ("status", "completed", "total", "message", "results", "output",
+                             "error", "finished", "events"):
+                    setattr(self, name, getattr(latest, name))
+            self.condition.notify_all()
+
+    def _wait_for(self, ready, timeout: float) -> None:
+        if self.local:
+            with self.condition:
+                self.condition.wait_for(ready, timeout)
+            return
+        deadline = time.monotonic() + timeout
+        while True:
+            self.refresh()
+            remaining = deadline - time.monotonic()
+            if ready() or remaining <= 0:
+                return
+            time.sleep(min(STORE_POLL_SECONDS, remaining))
+
+    def _save(self) -> None:
+        if self.store:
+            self.store.save(self)
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process with this ID is still running; unknown counts as gone."""
+    if pid <= 0:
+        return False
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    if sys.platform == "win32":
+        # os.kill(pid, 0) would send CTRL_C_EVENT on Windows, so ask the kernel instead
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            return bool(kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))) and exit_code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except PermissionError:
+        return True  # exists, but belongs to another user
+    except OSError:
+        return False
+    return True
+
+
+class JobStore:
+    """SQLite record of jobs and their per-file results."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+            if "cancel_requested" not in columns:
+                try:
+                    self.conn.execute("ALTER TABLE jobs ADD COLUMN cancel_requested INTEGER NOT NULL DEFAULT 0")
+                except sqlite3.OperationalError:
+                    pass  # another process added it first
+
+    def save(self, job: Job) -> None:
+        # Upsert, so a cancel requested by another process is not overwritten
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO jobs "
+                "(id, kind, owner, status, completed, total, message, error, output, pid, created, finished) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET status = excluded.status, completed = excluded.completed, "
+                "total = excluded.total, message = excluded.message, error = excluded.error, "
+                "output = excluded.output, pid = excluded.pid, finished = excluded.finished",
+                (
+                    job.id, job.kind, job.owner, job.status, job.completed, job.total, job.message,
+                    job.error, json.dumps(job.output) if job.output is not None else None,
+                    os.getpid(), job.created, job.finished,
+                ),
+            )
+
+    def request_cancel(self, job_id: str) -> None:
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+
+    def cancel_requested(self, job_id: str) -> bool:
+        with self.lock:
+            row = self.conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def add_result(self, job_id: str, seq: int, result: dict) -> None:
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO job_results (job_id, seq, data) VALUES (?, ?, ?)",
+                (job_id, seq, json.dumps(result)),
+            )
+
+    def load(self, job_id: str) -> Job | None:
+        """Rebuild a job, and its event history, from the database.
+
+        The result is a snapshot that follows the store (see Job.refresh);
+        an unfinished job whose process is gone is reported as interrupted.
+        """
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT id, kind, owner, status, completed, total, message, error, output, created, finished, pid "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            row = list(row)
+            pid = row.pop()
+            if row[3] not in FINISHED_STATUSES and pid != os.getpid() and (pid is None or not _process_alive(pid)):
+                row[3], row[7], row[10] = "failed", INTERRUPTED_ERROR, time.time()
+                self.conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished = ? WHERE id = ?",
+                    (row[3], row[7], row[10], job_id),
+                )
+            results = [
+                json.loads(data)
+                for (data,) in self.conn.execute(
+                    "SELECT data FROM job_results WHERE job_id = ? ORDER BY seq", (job_id,)
+                )
+            ]
+        job = Job(
+            id=row[0], kind=row[1], owner=row[2], status=row[3], completed=row[4], total=row[5],
+            message=row[6] or "", error=row[7], output=json.loads(row[8]) if row[8] else None,
+            created=row[9], finished=row[10], results=results, store=self, local=False,
+        )
+        job.events.append(("status", job.summary()))
+        for index, result in enumerate(results, 1):
+            job.events.append(("progress", {"completed": index, "total": job.total, "result": result}))
+        if job.done:
+            job.events.append(("done", dict(job.summary(), output=job.output)))
+        return job
+
+    def mark_interrupted(self) -> None:
+        """Fail unfinished jobs whose server process is gone."""
+        with self.lock, self.conn:
+            rows = self.conn.execute(
+                "SELECT id, pid FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchall()
+            for job_id, pid in rows:
+                if pid is None or not _process_alive(pid) or pid == os.getpid():
+                    self.conn.execute(
+                        "UPDATE jobs SET status = 'failed', error = ?, finished = ? WHERE id = ?",
+                        (INTERRUPTED_ERROR, time.time(), job_id),
+                    )
+
+    def expire(self, cutoff: float) -> list[str]:
+        """Delete jobs that finished before `cutoff` and return their IDs."""
+        with self.lock, self.conn:
+            expired = [
+                job_id for (job_id,) in self.conn.execute(
+                    "SELECT id FROM jobs WHERE finished IS NOT NULL AND finished < ?", (cutoff,)
+                )
+            ]
+            self.conn.executemany("DELETE FROM job_results WHERE job_id = ?", [(job_id,) for job_id in expired])
+            self.conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in expired])
+        return expired
+
+
+class JobManager:
+    """Runs jobs on worker threads and keeps them for a retention window.
+
+    `on_expire(job_id)` is called for every job dropped after the window,
+    so callers can delete files the job left behind.
+    """
+
+    def __init__(self, max_workers: int = 2, retention: float = JOB_RETENTION_SECONDS,
+                 db_path: Path | str | None = None, on_expire=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="web-job")
+        self.retention = retention
+        self.on_expire = on_expire
+        self.jobs: dict[str, Job] = {}
+        self.lock = threading.Lock()
+        self.store = JobStore(db_path) if db_path else None
+        if self.store:
+            self.store.mark_interrupted()
+
+    def submit(self, kind: str, total: int, work, owner: str | None = None) -> Job:
+        """Queue `work(job)`; it reports through job.progress()/add_result() and may set job.output."""
+        job = Job(id=uuid.uuid4().hex, kind=kind, total=total, owner=owner, store=self.store)
+        with self.lock:
+            expired = self._expire()
+            self.jobs[job.id] = job
+        if self.on_expire:
+            for job_id in expired:
+                self.on_expire(job_id)
+        job._save()
+        self.executor.submit(self._run, job, work)
+        return job
+
+    def get(self, job_id: str, owner: str | None = None) -> Job | None:
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is None and self.store:
+            job = self.store.load(job_id)
+        if job is None or (job.owner is not None and job.owner != owner):
+            return None
+        return job
+
+    def cancel(self, job_id: str, owner: str | None = None) -> Job | None:
+        job = self.get(job_id, owner)
+        if job is not None and not job.done:
+            job.cancel()
+        return job
+
+    def _run(self, job: Job, work) -> None:
+        try:
+            job.check_cancelled()
+        except JobCancelled:
+            job.finish(cancelled=True)
+            return
+        job.status = "running"
+        job._save()
+        job.emit("status", job.summary())
+        try:
+            work(job)
+        except JobCancelled:
+            job.finish(cancelled=True)
+        except Exception as exc:
+            job.finish(str(exc))
+        else:
+            job.finish()
+
+    def _expire(self) -> set[str]:
+        cutoff = time.time() - self.retention
+        expired = {job_id for job_id, job in self.jobs.items() if job.finished and job.finished < cutoff}
+        for job_id in expired:
+            del self.jobs[job_id]
+        if self.store:
+            expired.update(self.store.expire(cutoff))
+        return expired
+
+
+def sse_stream(job: Job, start: int = 0):
+    """Yield a job's events as Server-Sent Events until it finishes."""
+    index = start
+    while True:
+        events = job.wait_events(index, SSE_HEARTBEAT_SECONDS)
+        if not events:
+            yield ": keep-alive\n\n"
+            continue
+        for event, data in events:
+            index += 1
+            yield f"id: {index}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+            if event == "done":
+                return